@@ -1,7 +1,28 @@
+from typing import Tuple
+
 from django import forms
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
 from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+from agrobusiness.search import CUSTOMER_SEARCH_FIELDS, FARM_SEARCH_FIELDS, search_queryset
+
+
+class SearchAdminMixin:
+    """Mixin class for the ModelAdmin pages, whose search_fields are matched as the API search filter does,
+    ignoring accents, through the trigram indexes"""
+
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet, search_term: str) -> Tuple[QuerySet, bool]:
+        """Function responsible to filter the changelist rows by the search of the admin.
+        Args:
+            request (HttpRequest): Receives the django request.
+            queryset (QuerySet): Receives the changelist queryset.
+            search_term (str): Receives the search text.
+        Returns:
+            Tuple[QuerySet, bool]: Return the filtered queryset, and False since it has no duplicated rows.
+        """
+        return search_queryset(queryset, self.search_fields, search_term), False
 
 
 class FarmPropertyrForm(forms.ModelForm):
@@ -37,23 +58,23 @@ class StateAdmin(admin.ModelAdmin):
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(SearchAdminMixin, admin.ModelAdmin):
     """Customer ModelAdmin to configured page on Django Admin section"""
 
     form = CustomerForm
     list_per_page = 25
     date_hierarchy = "created_at"
-    search_fields = ["personal_document", "name"]
+    search_fields = CUSTOMER_SEARCH_FIELDS
     readonly_fields = ["created_at", "id"]
 
 
 @admin.register(FarmProperty)
-class FarmPropertyrAdmin(admin.ModelAdmin):
+class FarmPropertyrAdmin(SearchAdminMixin, admin.ModelAdmin):
     """FarmProperty ModelAdmin to configured page on Django Admin section"""
 
     list_per_page = 25
     date_hierarchy = "created_at"
-    search_fields = ["name", "city", "customer__name"]
+    search_fields = FARM_SEARCH_FIELDS
     readonly_fields = ["created_at", "id"]
     form = FarmPropertyrForm
 
@@ -66,5 +87,6 @@ class PlantingTypeAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
     search_fields = ["plant_name", "farm__name"]
     readonly_fields = ["created_at", "id"]
+    list_select_related = ["farm"]
     list_filter = ["plant_name"]
     list_filter = ["plant_name"]
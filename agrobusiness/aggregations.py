@@ -0,0 +1,247 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Count, DecimalField, F, OuterRef, QuerySet, Subquery, Sum, Value, Window
+from django.db.models.functions import Coalesce
+
+from agrobusiness.models import FarmProperty, PlantingType, State
+
+AREA_OUTPUT = DecimalField(max_digits=12, decimal_places=2)
+OTHERS_LABEL = "others"
+
+
+def area_sum(field_name: str) -> Coalesce:
+    """Function responsible to build a SUM aggregate over an area field, returning zero instead of NULL.
+    Args:
+        field_name (str): Receives the lookup path of the area field to be summed.
+    Returns:
+        Coalesce: Return the aggregate expression, ready to be used on annotate or aggregate.
+    """
+    return Coalesce(Sum(field_name), Value(Decimal("0.00")), output_field=AREA_OUTPUT)
+
+
+def add_percentage(rows: List[Dict[str, Any]], field_name: str, percentage_name: str) -> List[Dict[str, Any]]:
+    """Function responsible to add, on each row, its share of the sum of a field over every row.
+    Args:
+        rows (List[Dict[str, Any]]): Receives the rows already read.
+        field_name (str): Receives the name of the summed field.
+        percentage_name (str): Receives the name of the share field added on each row.
+    Returns:
+        List[Dict[str, Any]]: Return the same rows, with the share field.
+    """
+    total = sum(row[field_name] for row in rows)
+    for row in rows:
+        percentage = 0
+        if row[field_name] and total:
+            percentage = row[field_name] / total
+        row[percentage_name] = percentage
+    return rows
+
+
+def _farm_area_aggregates() -> Dict[str, Coalesce]:
+    """Private function created to build the area aggregates of the farms.
+    Returns:
+        Dict[str, Coalesce]: Return the total, farming and vegetation area aggregates, by name.
+    """
+    return {
+        "area_total": area_sum("area"),
+        "farming_area_total": area_sum("farming_area"),
+        "plant_area_total": area_sum("plant_area"),
+    }
+
+
+def state_farm_stats(queryset: Optional[QuerySet[State]] = None) -> List[Dict[str, Any]]:
+    """Function responsible to compute, in a single grouped query, the farm statistics of each state.
+    Args:
+        queryset (QuerySet[State], optional): Receives the states to be grouped. Defaults to every state.
+    Returns:
+        List[Dict[str, Any]]: Return one row per state, with the farm count, the farm percentage and the
+        total, farming and vegetation hectares.
+    """
+    if queryset is None:
+        queryset = State.objects.all()
+    rows = list(
+        queryset.annotate(
+            farms_total=Count("state_farms"),
+            area_total=area_sum("state_farms__area"),
+            farming_area_total=area_sum("state_farms__farming_area"),
+            plant_area_total=area_sum("state_farms__plant_area"),
+        )
+        .values("acronym", "farms_total", "area_total", "farming_area_total", "plant_area_total")
+        .order_by("acronym")
+    )
+    return add_percentage(rows, "farms_total", "farm_percentage")
+
+
+def farm_area_totals(queryset: Optional[QuerySet[FarmProperty]] = None) -> Dict[str, Decimal]:
+    """Function responsible to compute, in a single aggregate query, the area totals of the farms.
+    Args:
+        queryset (QuerySet[FarmProperty], optional): Receives the farms to be summed. Defaults to every farm.
+    Returns:
+        Dict[str, Decimal]: Return the total, farming and vegetation hectares of the farms.
+    """
+    if queryset is None:
+        queryset = FarmProperty.objects.all()
+    return queryset.aggregate(**_farm_area_aggregates())
+
+
+async def afarm_area_totals(queryset: Optional[QuerySet[FarmProperty]] = None) -> Dict[str, Decimal]:
+    """Function responsible to compute, by the async ORM, the same area totals as farm_area_totals.
+    Args:
+        queryset (QuerySet[FarmProperty], optional): Receives the farms to be summed. Defaults to every farm.
+    Returns:
+        Dict[str, Decimal]: Return the total, farming and vegetation hectares of the farms.
+    """
+    if queryset is None:
+        queryset = FarmProperty.objects.all()
+    return await queryset.aaggregate(**_farm_area_aggregates())
+
+
+def _agricultural_land_queryset(queryset: Optional[QuerySet[FarmProperty]], top: Optional[int]) -> QuerySet[Any]:
+    """Private function created to build the query of the agricultural land of each farm. The grand total comes
+    from a window function, so the rows and the total are read in one pass.
+    Args:
+        queryset (QuerySet[FarmProperty], optional): Receives the farms to be used, or None for every farm.
+        top (int, optional): Receives the number of farms to be returned, or None for every farm.
+    Returns:
+        QuerySet: Return the values queryset, with one extra row when top is given, to tell if others exist.
+    """
+    if queryset is None:
+        queryset = FarmProperty.objects.all()
+    agricultural_land = F("farming_area") + F("plant_area")
+    queryset = (
+        queryset.annotate(
+            agricultural_land=agricultural_land,
+            land_total=Window(Sum(agricultural_land), output_field=AREA_OUTPUT),
+        )
+        .values("name", "agricultural_land", "land_total")
+        .order_by("-agricultural_land", "id")
+    )
+    return queryset if top is None else queryset[: top + 1]
+
+
+def _agricultural_land_result(rows: List[Dict[str, Any]], top: Optional[int]) -> List[Dict[str, Any]]:
+    """Private function created to fold the farms after the top into an "others" row and compute the shares.
+    Args:
+        rows (List[Dict[str, Any]]): Receives the rows read by the agricultural land query.
+        top (int, optional): Receives the number of farms to be returned, or None for every farm.
+    Returns:
+        List[Dict[str, Any]]: Return one row per farm, with its name, agricultural land and percentage.
+    """
+    total_land_used = rows[0]["land_total"] if rows else 0
+    result = []
+    for row in rows[:top]:
+        result.append({"farm_name": row["name"], "agricultural_land": row["agricultural_land"]})
+    if top is not None and len(rows) > top:
+        used_land = sum(item["agricultural_land"] for item in result)
+        result.append({"farm_name": OTHERS_LABEL, "agricultural_land": total_land_used - used_land})
+    for item in result:
+        percentage = 0
+        if item["agricultural_land"] and total_land_used:
+            percentage = item["agricultural_land"] / total_land_used
+        item["agricultural_land_percentage"] = percentage
+    return result
+
+
+def agricultural_land_stats(
+    queryset: Optional[QuerySet[FarmProperty]] = None, top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Function responsible to compute, in a single query, the agricultural land share of each farm.
+    Args:
+        queryset (QuerySet[FarmProperty], optional): Receives the farms to be used. Defaults to every farm.
+        top (int, optional): Receives the number of farms to be returned, the remaining ones are folded into
+        an "others" row. Defaults to every farm.
+    Returns:
+        List[Dict[str, Any]]: Return one row per farm, with its name, agricultural land and percentage.
+    """
+    return _agricultural_land_result(list(_agricultural_land_queryset(queryset, top)), top)
+
+
+async def aagricultural_land_stats(
+    queryset: Optional[QuerySet[FarmProperty]] = None, top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Function responsible to compute, by the async ORM, the same shares as agricultural_land_stats.
+    Args:
+        queryset (QuerySet[FarmProperty], optional): Receives the farms to be used. Defaults to every farm.
+        top (int, optional): Receives the number of farms to be returned. Defaults to every farm.
+    Returns:
+        List[Dict[str, Any]]: Return one row per farm, with its name, agricultural land and percentage.
+    """
+    rows = [row async for row in _agricultural_land_queryset(queryset, top)]
+    return _agricultural_land_result(rows, top)
+
+
+def _distinct_farming_area(queryset: QuerySet[PlantingType]) -> Coalesce:
+    """Private function created to build the farming hectares of the farms which grow each plant name, summing
+    every farm once, even when it has more than one cultivation row of that plant name. The farms come from the
+    same cultivations being grouped, so the filters of the queryset are kept.
+    Args:
+        queryset (QuerySet[PlantingType]): Receives the cultivations being grouped by plant name.
+    Returns:
+        Coalesce: Return the subquery expression, ready to be used on annotate.
+    """
+    farms = queryset.order_by().filter(plant_name=OuterRef(OuterRef("plant_name"))).values("farm")
+    farming_area = (
+        FarmProperty.objects.filter(id__in=farms)
+        .order_by()
+        .values(grouped=Value(1))
+        .annotate(total=Sum("farming_area"))
+        .values("total")
+    )
+    return Coalesce(Subquery(farming_area), Value(Decimal("0.00")), output_field=AREA_OUTPUT)
+
+
+def _planting_type_queryset(
+    queryset: Optional[QuerySet[PlantingType]], with_farms: bool, with_area: bool
+) -> QuerySet[Any]:
+    """Private function created to build the grouped query of the cultivations of each plant name.
+    Args:
+        queryset (QuerySet[PlantingType], optional): Receives the cultivations to be grouped, or None for every
+        cultivation.
+        with_farms (bool): Receives if the distinct farm count of each plant name must be computed.
+        with_area (bool): Receives if the farming hectares of the farms of each plant name must be computed.
+    Returns:
+        QuerySet: Return the values queryset, one row per plant name.
+    """
+    if queryset is None:
+        queryset = PlantingType.objects.all()
+    annotations: Dict[str, Any] = {"cultivation_total": Count("id")}
+    if with_farms:
+        annotations["farms_total"] = Count("farm", distinct=True)
+    if with_area:
+        annotations["farming_area_total"] = _distinct_farming_area(queryset)
+    return queryset.values("plant_name").annotate(**annotations).order_by("-cultivation_total", "plant_name")
+
+
+def planting_type_stats(
+    queryset: Optional[QuerySet[PlantingType]] = None, with_farms: bool = False, with_area: bool = False
+) -> List[Dict[str, Any]]:
+    """Function responsible to compute, in a single grouped query, the cultivation statistics of each plant name.
+    Args:
+        queryset (QuerySet[PlantingType], optional): Receives the cultivations to be grouped. Defaults to every
+        cultivation.
+        with_farms (bool, optional): Receives if the distinct farm count of each plant name must be computed.
+        with_area (bool, optional): Receives if the farming hectares of the farms of each plant name must be
+        computed.
+    Returns:
+        List[Dict[str, Any]]: Return one row per plant name, with the cultivation count and percentage.
+    """
+    rows = list(_planting_type_queryset(queryset, with_farms, with_area))
+    return add_percentage(rows, "cultivation_total", "cultivation_percentage")
+
+
+async def aplanting_type_stats(
+    queryset: Optional[QuerySet[PlantingType]] = None, with_farms: bool = False, with_area: bool = False
+) -> List[Dict[str, Any]]:
+    """Function responsible to compute, by the async ORM, the same statistics as planting_type_stats.
+    Args:
+        queryset (QuerySet[PlantingType], optional): Receives the cultivations to be grouped. Defaults to every
+        cultivation.
+        with_farms (bool, optional): Receives if the distinct farm count of each plant name must be computed.
+        with_area (bool, optional): Receives if the farming hectares of the farms of each plant name must be
+        computed.
+    Returns:
+        List[Dict[str, Any]]: Return one row per plant name, with the cultivation count and percentage.
+    """
+    rows = [row async for row in _planting_type_queryset(queryset, with_farms, with_area)]
+    return add_percentage(rows, "cultivation_total", "cultivation_percentage")
@@ -6,3 +6,11 @@ class AgrobusinessConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "agrobusiness"
+
+    def ready(self) -> None:
+        """Function responsible to connect the app signal receivers and install the rotating token backend, once
+        the app registry is ready."""
+        from agrobusiness import signals  # noqa: F401
+        from agrobusiness.authentication import install_token_backend
+
+        install_token_backend()
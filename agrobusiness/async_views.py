@@ -0,0 +1,405 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from asgiref.sync import sync_to_async
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.views import View
+from django_filters import rest_framework as filters
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, ValidationError
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from agrobusiness.aggregations import aagricultural_land_stats, afarm_area_totals, aplanting_type_stats
+from agrobusiness.authentication import CachedJWTAuthentication, token_cache
+from agrobusiness.cache import CACHE_HEADER, acached_stats_data
+from agrobusiness.conditional import build_validators
+from agrobusiness.dashboard import farm_areas_data, state_farms_data
+from agrobusiness.expand import EXPAND_PARAM
+from agrobusiness.filters import CustomerFilter, FarmPropertyFilter, PlantingTypeFilter, filter_rows, has_filters
+from agrobusiness.instrumentation import RequestMetrics, current_metrics
+from agrobusiness.pagination import CreatedAtCursorPagination
+from agrobusiness.readers import RowMapper
+from agrobusiness.renderers import FastJSONRenderer
+from agrobusiness.rollups import afarm_rollup_totals, aplanting_rollup_stats, astate_rollup_stats
+from agrobusiness.serializers import (
+    Customer,
+    CustomerSerializer,
+    FarmProperty,
+    FarmPropertySerializer,
+    PlantingType,
+    PlantingTypeSerializer,
+    State,
+)
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """Async JWT authentication class, validating the token as JWTAuthentication does and loading its user by the
+    async ORM, through the verified token cache"""
+
+    async def aauthenticate(self, request: HttpRequest) -> Any:
+        """Function responsible to authenticate the request by its Bearer token.
+        Args:
+            request (HttpRequest): Receives the django request.
+        Raises:
+            NotAuthenticated: Raised when the request has no token.
+            AuthenticationFailed: Raised when the token or its user is not valid.
+        Returns:
+            Any: Return the authenticated user.
+        """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            raise NotAuthenticated()
+        cached = token_cache.get(raw_token)
+        if cached is not None:
+            return cached[0]
+        validated_token = self.get_validated_token(raw_token)
+        user = await self.aget_user(validated_token)
+        token_cache.add(raw_token, validated_token, user)
+        return user
+
+    async def aget_user(self, validated_token: Any) -> Any:
+        """Function responsible to load the user of a validated token, with the same checks of get_user.
+        Args:
+            validated_token (Token): Receives the validated token.
+        Raises:
+            AuthenticationFailed: Raised when the user does not exist, is inactive or changed the password.
+        Returns:
+            Any: Return the user.
+        """
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        user = await self.user_model.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return user
+
+
+class AsyncAPIView(View, ABC):
+    """Async API view class, answering GET requests on the event loop of an ASGI server. It authenticates the
+    Bearer token, answers 304 when the ETag of the client copy still matches, as the viewsets do, and otherwise
+    runs get_data and renders the data with FastJSONRenderer. API errors are answered with the same body as the
+    DRF views. The timings are reported to the request metrics as the instrumented viewsets do"""
+
+    authentication = AsyncJWTAuthentication()
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Function responsible to authenticate the request and render its data, or to answer 304 when the client
+        copy is still valid.
+        Args:
+            request (HttpRequest): Receives the django request.
+        Returns:
+            HttpResponseBase: Return the JSON response, the 304 or 412 response, or the error response.
+        """
+        metrics = current_metrics() or RequestMetrics(0)
+        metrics.view = f"{type(self).__name__}.get"
+        self.headers: Dict[str, str] = {}
+        started = time.perf_counter()
+        try:
+            request.user = await self.authentication.aauthenticate(request)
+            metrics.auth_ms = (time.perf_counter() - started) * 1000
+            sql_ms, started = metrics.sql_ms, time.perf_counter()
+            drf_request = Request(request)
+            querysets, window = await sync_to_async(self.get_conditional_querysets)(drf_request)
+            _, etag = await sync_to_async(build_validators)(drf_request, querysets, window)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                data = await self.get_data(drf_request)
+            metrics.view_ms = (time.perf_counter() - started) * 1000 - (metrics.sql_ms - sql_ms)
+        except APIException as exc:
+            return self.error_response(request, exc)
+        if response is None:
+            started = time.perf_counter()
+            response = self.render(data, status.HTTP_200_OK)
+            metrics.render_ms = (time.perf_counter() - started) * 1000
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+        return response
+
+    @abstractmethod
+    def get_conditional_querysets(self, request: Request) -> Tuple[List[QuerySet[Any]], Optional[QuerySet[Any]]]:
+        """Function responsible to return the querysets which the response depends on, the same ones validated by
+        the viewset of the endpoint. It validates the query params with database queries, so it runs on a thread.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Tuple[List[QuerySet], Optional[QuerySet]]: Return the querysets, and the rows of the list page, if any.
+        """
+
+    @abstractmethod
+    async def get_data(self, request: Request) -> Any:
+        """Function responsible to build the data of the response.
+        Args:
+            request (Request): Receives the DRF request, used for its query params.
+        Returns:
+            Any: Return the data to be rendered.
+        """
+
+    def render(self, data: Any, status_code: int) -> HttpResponse:
+        """Function responsible to render the data as a JSON response, with the headers set by get_data.
+        Args:
+            data (Any): Receives the data.
+            status_code (int): Receives the response status.
+        Returns:
+            HttpResponse: Return the response.
+        """
+        renderer = FastJSONRenderer()
+        response = HttpResponse(renderer.render(data), content_type=renderer.media_type, status=status_code)
+        for header, value in self.headers.items():
+            response[header] = value
+        return response
+
+    def error_response(self, request: HttpRequest, exc: APIException) -> HttpResponse:
+        """Function responsible to answer an API error with the body of the DRF exception handler.
+        Args:
+            request (HttpRequest): Receives the django request.
+            exc (APIException): Receives the error.
+        Returns:
+            HttpResponse: Return the error response.
+        """
+        self.headers = {}
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            self.headers["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        return self.render(data, exc.status_code)
+
+
+class AsyncListView(AsyncAPIView):
+    """Async list view class, answering the same cursor pages as the fast list path of the viewsets, from
+    values() rows read by async iteration. The ?fields= param is accepted, and ?expand= is left to the viewsets"""
+
+    queryset: QuerySet[Any]
+    serializer_class: Type[serializers.ModelSerializer]
+    filterset_class: Optional[Type[filters.FilterSet]] = None
+    rows_queryset: Tuple[QuerySet[Any], RowMapper]
+
+    def get_rows_queryset(self, request: Request) -> Tuple[QuerySet[Any], RowMapper]:
+        """Function responsible to build the filtered values() queryset of the list, which validates the filters
+        with database queries, so it runs on a thread.
+        Args:
+            request (Request): Receives the DRF request.
+        Raises:
+            ValidationError: Raised when ?expand= is sent, or the fields or filters are invalid.
+        Returns:
+            Tuple[QuerySet, RowMapper]: Return the queryset, not evaluated, and the mapper of its rows.
+        """
+        if request.query_params.get(EXPAND_PARAM):
+            raise ValidationError({EXPAND_PARAM: ["Nested fields are only expanded by the sync endpoints."]})
+        mapper: RowMapper = RowMapper.for_serializer(  # type: ignore[assignment]
+            self.serializer_class(context={"request": request})
+        )
+        queryset = self.queryset.all()
+        if self.filterset_class is not None:
+            queryset = filter_rows(self.filterset_class, request, queryset)
+        return queryset.values(*mapper.values_lookups), mapper
+
+    def get_conditional_querysets(self, request: Request) -> Tuple[List[QuerySet[Any]], Optional[QuerySet[Any]]]:
+        """Function responsible to return the rows of the page asked by the cursor, which the ETag is built from,
+        keeping the filtered queryset for get_data.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Tuple[List[QuerySet], Optional[QuerySet]]: Return no other queryset, and the rows of the page.
+        """
+        self.rows_queryset = self.get_rows_queryset(request)
+        return [], CreatedAtCursorPagination().page_window(self.rows_queryset[0], request)
+
+    async def get_data(self, request: Request) -> Any:
+        """Function responsible to read the page asked by the cursor.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return the rows of the page with the navigation links.
+        """
+        queryset, mapper = self.rows_queryset
+        paginator = CreatedAtCursorPagination()
+        rows = await paginator.apaginate_queryset(queryset, request)
+        return paginator.get_paginated_response(mapper.map_rows(rows)).data
+
+
+class AsyncCustomerListView(AsyncListView):
+    """Async Customer list view class"""
+
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    filterset_class = CustomerFilter
+
+
+class AsyncFarmPropertyListView(AsyncListView):
+    """Async FarmProperty list view class"""
+
+    queryset = FarmProperty.objects.all()
+    serializer_class = FarmPropertySerializer
+    filterset_class = FarmPropertyFilter
+
+
+class AsyncPlantingTypeListView(AsyncListView):
+    """Async PlantingType list view class"""
+
+    queryset = PlantingType.objects.all()
+    serializer_class = PlantingTypeSerializer
+    filterset_class = PlantingTypeFilter
+
+
+class AsyncStatsView(AsyncAPIView):
+    """Async stats view class, answering a stats endpoint through the stats cache. The cache entries are shared
+    with the viewset action of the same name, and the cache usage is reported on the X-Cache header"""
+
+    cache_name: str
+    cache_models: List[Type[Model]]
+    filterset_class: Optional[Type[filters.FilterSet]] = None
+
+    def get_filtered_queryset(self, request: Request, force: bool = False) -> Optional[QuerySet[Any]]:
+        """Function responsible to apply the filters of the request, which validates them with database queries,
+        so it runs on a thread.
+        Args:
+            request (Request): Receives the DRF request.
+            force (bool, optional): Receives if the queryset is needed even without filters. Defaults to False.
+        Returns:
+            Optional[QuerySet]: Return the filtered queryset, or None when the request has no filter.
+        """
+        if not force and not has_filters(self.filterset_class, request):  # type: ignore[arg-type]
+            return None
+        model = self.filterset_class._meta.model  # type: ignore[union-attr]
+        return filter_rows(self.filterset_class, request, model._default_manager.all())  # type: ignore[arg-type]
+
+    def get_conditional_querysets(self, request: Request) -> Tuple[List[QuerySet[Any]], Optional[QuerySet[Any]]]:
+        """Function responsible to return the whole table of each cache model, as the conditional decorator of the
+        viewset action does.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Tuple[List[QuerySet], Optional[QuerySet]]: Return the querysets of the cache models, and no page.
+        """
+        return [model._default_manager.all() for model in self.cache_models], None
+
+    async def get_data(self, request: Request) -> Any:
+        """Function responsible to return the cached stats, computing them on a miss.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return the stats.
+        """
+        data, self.headers[CACHE_HEADER] = await acached_stats_data(
+            self.cache_name, self.cache_models, request, lambda: self.compute(request)
+        )
+        return data
+
+    @abstractmethod
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to compute the stats.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return the stats.
+        """
+
+
+class AsyncStateFarmsView(AsyncStatsView):
+    """Async view class of the pie chart of farms in each state"""
+
+    cache_name = "farms_by_state"
+    cache_models = [State, FarmProperty]
+
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to return the farm statistics of each state, from the rollup table.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return one row per state.
+        """
+        return state_farms_data(await astate_rollup_stats())
+
+
+class AsyncTotalFarmsView(AsyncStatsView):
+    """Async view class of the total number of registered properties"""
+
+    cache_name = "total_farms"
+    cache_models = [FarmProperty]
+
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to return the farm count, from the rollup table.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return the farm count.
+        """
+        return {"farms_total": (await afarm_rollup_totals())["farms_total"]}
+
+
+class AsyncTotalAreasView(AsyncStatsView):
+    """Async view class of the total, farming and vegetation areas of the properties"""
+
+    cache_name = "total_farm_areas"
+    cache_models = [FarmProperty, State, Customer]
+    filterset_class = FarmPropertyFilter
+
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to return the area totals, from the rollup table when no filter is sent.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return the area totals.
+        """
+        queryset = await sync_to_async(self.get_filtered_queryset)(request)
+        totals = await (afarm_rollup_totals() if queryset is None else afarm_area_totals(queryset))
+        return farm_areas_data(totals)
+
+
+class AsyncAgriculturalLandView(AsyncStatsView):
+    """Async view class of the pie chart of agricultural land use"""
+
+    cache_name = "farms_agricultural_land"
+    cache_models = [FarmProperty, State, Customer]
+    filterset_class = FarmPropertyFilter
+
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to return the agricultural land share of each farm, limited to the top farms when
+        the top query param is given.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return one row per farm.
+        """
+        top = request.query_params.get("top")
+        if top is not None:
+            top = serializers.IntegerField(min_value=1).run_validation(top)
+        queryset = await sync_to_async(self.get_filtered_queryset)(request, force=True)
+        return await aagricultural_land_stats(queryset, top=top)
+
+
+class AsyncCultivationByNameView(AsyncStatsView):
+    """Async view class of the pie chart of cultivation plant types by quantities"""
+
+    cache_name = "planting_type_by_name"
+    cache_models = [PlantingType, FarmProperty, State]
+    filterset_class = PlantingTypeFilter
+
+    async def compute(self, request: Request) -> Any:
+        """Function responsible to return the cultivation statistics of each plant name, from the rollup table
+        when no filter or include is sent.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Any: Return one row per plant name.
+        """
+        include = [item for item in request.query_params.get("include", "").split(",") if item]
+        include = serializers.MultipleChoiceField(choices=["farms", "area"]).run_validation(include)
+        queryset = await sync_to_async(self.get_filtered_queryset)(request, force=bool(include))
+        if queryset is None:
+            return await aplanting_rollup_stats()
+        return await aplanting_type_stats(queryset, with_farms="farms" in include, with_area="area" in include)
@@ -0,0 +1,319 @@
+import copy
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from jwt.exceptions import InvalidAlgorithmError, InvalidSignatureError, InvalidTokenError
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import Token
+
+
+class RotatingTokenBackend(TokenBackend):
+    """Token backend class which signs with the first key of JWT_SIGNING_KEYS and verifies with any of them, so a
+    new key can be added in front of the previous ones and the tokens signed before the rotation stay valid until
+    the previous key is removed"""
+
+    def __init__(self, *args: Any, verifying_keys: Sequence[str] = (), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.verifying_keys = [key for key in verifying_keys if key] or [self.signing_key]
+
+    def decode(self, token: Token, verify: bool = True) -> Dict[str, Any]:
+        """Function responsible to validate the token with each verifying key, in order, and return its payload.
+        Args:
+            token (Token): Receives the encoded token.
+            verify (bool, optional): Receives if the signature is verified. Defaults to True.
+        Raises:
+            TokenBackendError: Raised when the token is malformed, expired or signed by none of the keys.
+        Returns:
+            Dict[str, Any]: Return the token payload.
+        """
+        if not verify or not self.algorithm.startswith("HS"):
+            return super().decode(token, verify=verify)
+        for key in self.verifying_keys:
+            try:
+                return jwt.decode(
+                    token,
+                    key,
+                    algorithms=[self.algorithm],
+                    audience=self.audience,
+                    issuer=self.issuer,
+                    leeway=self.get_leeway(),
+                    options={"verify_aud": self.audience is not None},
+                )
+            except InvalidSignatureError:
+                continue
+            except InvalidAlgorithmError as exc:
+                raise TokenBackendError("Invalid algorithm specified") from exc
+            except InvalidTokenError as exc:
+                raise TokenBackendError("Token is invalid or expired") from exc
+        raise TokenBackendError("Token is invalid or expired")
+
+
+def build_token_backend(keys: Optional[List[str]] = None) -> RotatingTokenBackend:
+    """Function responsible to build the token backend of the SIMPLE_JWT settings with the rotation keys.
+    Args:
+        keys (List[str], optional): Receives the keys, the first one signing. Defaults to JWT_SIGNING_KEYS.
+    Returns:
+        RotatingTokenBackend: Return the token backend.
+    """
+    keys = keys or settings.JWT_SIGNING_KEYS
+    return RotatingTokenBackend(
+        jwt_settings.ALGORITHM,
+        keys[0] if jwt_settings.ALGORITHM.startswith("HS") else jwt_settings.SIGNING_KEY,
+        jwt_settings.VERIFYING_KEY,
+        jwt_settings.AUDIENCE,
+        jwt_settings.ISSUER,
+        jwt_settings.JWK_URL,
+        jwt_settings.LEEWAY,
+        jwt_settings.JSON_ENCODER,
+        verifying_keys=keys,
+    )
+
+
+def install_token_backend() -> None:
+    """Function responsible to replace the token backend of simplejwt, which every token class resolves from
+    rest_framework_simplejwt.state.token_backend, since the TOKEN_BACKEND_CLASS setting was removed."""
+    from rest_framework_simplejwt import state
+
+    state.token_backend = build_token_backend()
+
+
+class VerifiedToken(NamedTuple):
+    """Verified token class, keeping the encoded token, its validated wrapper, its user and until when it may be
+    reused"""
+
+    raw_token: bytes
+    validated_token: Token
+    user: Any
+    expires_at: float
+
+
+class VerifiedTokenCache:
+    """Verified token cache class, an in-process LRU of the access tokens already verified, keyed by their JTI.
+    An entry is reused only for the same encoded token and until the token expires or JWT_TOKEN_CACHE_TTL
+    seconds pass, so a deactivated user or a changed password is seen by the other processes in that time"""
+
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[str, VerifiedToken]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _token_id(raw_token: bytes) -> Optional[str]:
+        """Private function created to read the JTI of an encoded token, without verifying it.
+        Args:
+            raw_token (bytes): Receives the encoded token.
+        Returns:
+            str, optional: Return the JTI, or None when the token is malformed or has no JTI.
+        """
+        try:
+            payload = jwt.decode(raw_token, options={"verify_signature": False})
+        except InvalidTokenError:
+            return None
+        token_id = payload.get(jwt_settings.JTI_CLAIM) if isinstance(payload, dict) else None
+        return str(token_id) if token_id is not None else None
+
+    def get(self, raw_token: bytes) -> Optional[Tuple[Any, Token]]:
+        """Function responsible to return the user and validated token of an encoded token verified before.
+        Args:
+            raw_token (bytes): Receives the encoded token.
+        Returns:
+            Tuple[Any, Token], optional: Return a copy of the user and the validated token, or None on a miss.
+        """
+        if settings.JWT_TOKEN_CACHE_SIZE <= 0:
+            return None
+        token_id = self._token_id(raw_token)
+        if token_id is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(token_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self.entries[token_id]
+                return None
+            if not hmac.compare_digest(entry.raw_token, raw_token):
+                return None
+            self.entries.move_to_end(token_id)
+        return copy.copy(entry.user), entry.validated_token
+
+    def add(self, raw_token: bytes, validated_token: Token, user: Any) -> None:
+        """Function responsible to store a verified token, evicting the least recently used ones above
+        JWT_TOKEN_CACHE_SIZE.
+        Args:
+            raw_token (bytes): Receives the encoded token.
+            validated_token (Token): Receives the validated token.
+            user (Any): Receives the user of the token.
+        """
+        token_id = validated_token.get(jwt_settings.JTI_CLAIM)
+        expires_at = validated_token.get("exp")
+        if settings.JWT_TOKEN_CACHE_SIZE <= 0 or token_id is None or expires_at is None:
+            return
+        expires_at = min(float(expires_at), time.time() + settings.JWT_TOKEN_CACHE_TTL)
+        with self.lock:
+            self.entries[str(token_id)] = VerifiedToken(raw_token, validated_token, copy.copy(user), expires_at)
+            self.entries.move_to_end(str(token_id))
+            while len(self.entries) > settings.JWT_TOKEN_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Function responsible to drop the tokens of a user, after the user changed or was deleted.
+        Args:
+            user_id (Any): Receives the primary key of the user.
+        """
+        with self.lock:
+            for token_id in [key for key, entry in self.entries.items() if entry.user.pk == user_id]:
+                del self.entries[token_id]
+
+    def clear(self) -> None:
+        """Function responsible to drop every token."""
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = VerifiedTokenCache()
+
+
+class PermissionCache:
+    """Permission cache class, an in-process cache of the permission sets of each user, by source (user or group),
+    kept for PERMISSION_CACHE_TTL seconds, up to PERMISSION_CACHE_SIZE sets. The signals drop the sets of a changed
+    user, and every set when a group or a permission changes, in the same process; the other processes see the
+    change within the TTL"""
+
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[Tuple[Any, str], Tuple[Set[str], float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id: Any, source: str) -> Optional[Set[str]]:
+        """Function responsible to return the cached permissions of a user from a source.
+        Args:
+            user_id (Any): Receives the primary key of the user.
+            source (str): Receives the source of the permissions, user or group.
+        Returns:
+            Set[str], optional: Return a copy of the permission names, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get((user_id, source))
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self.entries[(user_id, source)]
+                return None
+            self.entries.move_to_end((user_id, source))
+        return set(entry[0])
+
+    def set(self, user_id: Any, source: str, permissions: Set[str]) -> None:
+        """Function responsible to store the permissions of a user from a source, evicting the least recently used
+        ones above PERMISSION_CACHE_SIZE.
+        Args:
+            user_id (Any): Receives the primary key of the user.
+            source (str): Receives the source of the permissions, user or group.
+            permissions (Set[str]): Receives the permission names.
+        """
+        if settings.PERMISSION_CACHE_TTL <= 0 or settings.PERMISSION_CACHE_SIZE <= 0:
+            return
+        with self.lock:
+            self.entries[(user_id, source)] = (set(permissions), time.monotonic() + settings.PERMISSION_CACHE_TTL)
+            self.entries.move_to_end((user_id, source))
+            while len(self.entries) > settings.PERMISSION_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Function responsible to drop the permissions of a user.
+        Args:
+            user_id (Any): Receives the primary key of the user.
+        """
+        with self.lock:
+            for source in ("user", "group"):
+                self.entries.pop((user_id, source), None)
+
+    def clear(self) -> None:
+        """Function responsible to drop the permissions of every user."""
+        with self.lock:
+            self.entries.clear()
+
+
+permission_cache = PermissionCache()
+
+
+class CachedModelBackend(ModelBackend):
+    """Cached model backend class, which resolves the permissions as ModelBackend does but keeps the permission
+    sets of each user on the permission cache, so the model permission checks of the next requests of the same
+    user run no query"""
+
+    def _cached_permissions(
+        self, user_obj: Any, obj: Any, source: str, resolve: Callable[[Any, Any], Set[str]]
+    ) -> Set[str]:
+        """Private function created to read the permissions of a source from the permission cache, resolving and
+        storing them on a miss.
+        Args:
+            user_obj (Any): Receives the user.
+            obj (Any): Receives the object of an object permission check, which ModelBackend does not support.
+            source (str): Receives the source of the permissions, user or group.
+            resolve (Callable): Receives the ModelBackend function which resolves the permissions.
+        Returns:
+            Set[str]: Return the permission names.
+        """
+        perm_cache_name = f"_{source}_perm_cache"
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None or hasattr(user_obj, perm_cache_name):
+            return resolve(user_obj, obj)
+        permissions = permission_cache.get(user_obj.pk, source)
+        if permissions is None:
+            permissions = resolve(user_obj, obj)
+            permission_cache.set(user_obj.pk, source, permissions)
+        setattr(user_obj, perm_cache_name, permissions)
+        return permissions
+
+    def get_user_permissions(self, user_obj: Any, obj: Any = None) -> Set[str]:
+        """Function responsible to return the permission names the user has from its user_permissions.
+        Args:
+            user_obj (Any): Receives the user.
+            obj (Any, optional): Receives the object of an object permission check. Defaults to None.
+        Returns:
+            Set[str]: Return the permission names.
+        """
+        return self._cached_permissions(user_obj, obj, "user", super().get_user_permissions)
+
+    def get_group_permissions(self, user_obj: Any, obj: Any = None) -> Set[str]:
+        """Function responsible to return the permission names the user has from its groups.
+        Args:
+            user_obj (Any): Receives the user.
+            obj (Any, optional): Receives the object of an object permission check. Defaults to None.
+        Returns:
+            Set[str]: Return the permission names.
+        """
+        return self._cached_permissions(user_obj, obj, "group", super().get_group_permissions)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Cached JWT authentication class, which authenticates as JWTAuthentication does but reuses the user of an
+    access token verified before, skipping the signature check and the user query on repeated requests"""
+
+    def authenticate(self, request: Request) -> Optional[Tuple[Any, Token]]:
+        """Function responsible to authenticate the request by its Bearer token, through the verified token cache.
+        Args:
+            request (Request): Receives the DRF request.
+        Raises:
+            AuthenticationFailed: Raised when the token or its user is not valid.
+        Returns:
+            Tuple[Any, Token], optional: Return the user and the validated token, or None without a token.
+        """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        cached = token_cache.get(raw_token)
+        if cached is not None:
+            return cached
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        token_cache.add(raw_token, validated_token, user)
+        return user, validated_token
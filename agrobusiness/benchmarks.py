@@ -0,0 +1,178 @@
+import math
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from agrobusiness.cache import get_stats_cache
+from agrobusiness.models import Customer, FarmProperty, PlantingType
+
+BENCHMARK_ENDPOINTS = {
+    "states-list": "/api/states",
+    "customer-list": "/api/customer",
+    "customer-detail": "/api/customer/{customer}",
+    "farm-list": "/api/farm",
+    "farm-detail": "/api/farm/{farm}",
+    "planting-list": "/api/planting",
+    "planting-detail": "/api/planting/{planting}",
+    "stats-state-farms": "/api/states/stats/chart/state-farms",
+    "stats-total-farms": "/api/farm/stats/total-farms",
+    "stats-total-areas": "/api/farm/stats/total-areas",
+    "stats-agricultural-land": "/api/farm/stats/chart/agricultural-land",
+    "stats-cultivation-by-name": "/api/planting/stats/chart/cultivation-by-name",
+}
+COMPARED_METRICS = ["p50_ms", "p95_ms", "queries", "peak_memory_kb"]
+READ_PATH_ENDPOINTS = ["customer-list", "farm-list", "planting-list"]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Function responsible to return a percentile of the measured values, by the nearest-rank method.
+    Args:
+        values (List[float]): Receives the measured values.
+        percent (float): Receives the percentile, from 0 to 100.
+    Returns:
+        float: Return the percentile value.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def benchmark_urls() -> Dict[str, str]:
+    """Function responsible to build the url of every benchmarked endpoint. The detail endpoints use the first row
+    of each model, and are left out when the model has no rows.
+    Returns:
+        Dict[str, str]: Return the urls by endpoint name.
+    """
+    ids = {
+        "customer": Customer.objects.values_list("id", flat=True).first(),
+        "farm": FarmProperty.objects.values_list("id", flat=True).first(),
+        "planting": PlantingType.objects.values_list("id", flat=True).first(),
+    }
+    return {
+        name: url.format(**ids)
+        for name, url in BENCHMARK_ENDPOINTS.items()
+        if not name.endswith("-detail") or ids[name.split("-")[0]]
+    }
+
+
+def measure_endpoint(client: APIClient, url: str, iterations: int, warmup: int, cold: bool) -> Dict[str, Any]:
+    """Function responsible to time the GET requests of one endpoint, count their queries and measure the peak
+    memory of one extra request, traced apart so tracemalloc does not slow the timed ones.
+    Args:
+        client (APIClient): Receives the authenticated client.
+        url (str): Receives the endpoint url.
+        iterations (int): Receives the number of timed requests.
+        warmup (int): Receives the number of requests sent before the timed ones.
+        cold (bool): Receives if the stats cache is cleared before every request.
+    Returns:
+        Dict[str, Any]: Return the status, latency percentiles, query count and peak memory of the endpoint.
+    """
+    cache = get_stats_cache()
+    for _ in range(warmup):
+        client.get(url)
+    timings, queries, status = [], 0, 0
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries, status = max(queries, len(context.captured_queries)), response.status_code
+    if cold:
+        cache.clear()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    client.get(url)
+    peak = tracemalloc.get_traced_memory()[1]
+    if not tracing:
+        tracemalloc.stop()
+    return {
+        "status": status,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": queries,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(client: APIClient, iterations: int, warmup: int = 1, cold: bool = False) -> Dict[str, Any]:
+    """Function responsible to benchmark every list, detail and stats endpoint.
+    Args:
+        client (APIClient): Receives the authenticated client.
+        iterations (int): Receives the number of timed requests per endpoint.
+        warmup (int, optional): Receives the number of requests sent before the timed ones. Defaults to 1.
+        cold (bool, optional): Receives if the stats cache is cleared before every request. Defaults to False.
+    Returns:
+        Dict[str, Any]: Return the run settings, the number of rows by model and the metrics by endpoint.
+    """
+    return {
+        "meta": {
+            "database": connection.vendor,
+            "iterations": iterations,
+            "cold_cache": cold,
+            "rows": {
+                "customers": Customer.objects.count(),
+                "farms": FarmProperty.objects.count(),
+                "plantings": PlantingType.objects.count(),
+            },
+        },
+        "endpoints": {
+            name: measure_endpoint(client, url, iterations, warmup, cold) for name, url in benchmark_urls().items()
+        },
+    }
+
+
+def compare_read_paths(client: APIClient, iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Function responsible to time the list endpoints through the serializers and through the fast list path.
+    Args:
+        client (APIClient): Receives the authenticated client.
+        iterations (int): Receives the number of timed requests per endpoint and path.
+        warmup (int, optional): Receives the number of requests sent before the timed ones. Defaults to 1.
+    Returns:
+        Dict[str, Any]: Return the p50 latency of both paths and the speedup, by endpoint.
+    """
+    result = {}
+    for name in READ_PATH_ENDPOINTS:
+        url = f"{BENCHMARK_ENDPOINTS[name]}?page_size=500"
+        timings = {}
+        for enabled in (False, True):
+            with override_settings(FAST_READ_ENABLED=enabled):
+                timings[enabled] = measure_endpoint(client, url, iterations, warmup, cold=False)["p50_ms"]
+        result[name] = {
+            "serializer_p50_ms": timings[False],
+            "fast_p50_ms": timings[True],
+            "speedup": round(timings[False] / timings[True], 2) if timings[True] else None,
+        }
+    return result
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Function responsible to compare a benchmark run against a stored baseline. A latency or memory metric
+    regresses when it grows more than the threshold, and the query count regresses when it grows at all.
+    Args:
+        results (Dict[str, Any]): Receives the current run.
+        baseline (Dict[str, Any]): Receives the stored run.
+        threshold (float): Receives the tolerated growth, such as 0.2 for 20%.
+    Returns:
+        List[str]: Return one message per regressed metric, empty when there is none.
+    """
+    regressions = []
+    for name, metrics in results["endpoints"].items():
+        previous: Optional[Dict[str, Any]] = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in previous:
+                continue
+            limit = previous[metric] if metric == "queries" else previous[metric] * (1 + threshold)
+            if metrics[metric] > limit:
+                regressions.append(f"{name} {metric}: {previous[metric]} -> {metrics[metric]}")
+    return regressions
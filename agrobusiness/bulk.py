@@ -0,0 +1,257 @@
+import uuid
+from typing import Any, Dict, List, Set, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from agrobusiness.cache import invalidate_stats
+from agrobusiness.models import (
+    Customer,
+    FarmProperty,
+    PlantingType,
+    State,
+    validate_farm_areas,
+    validate_personal_document,
+)
+from agrobusiness.rollups import refresh_planting_rollups, refresh_state_rollups
+
+CUSTOMER_VALUE_FIELDS = ["personal_document", "name"]
+CUSTOMER_UPDATE_FIELDS = [*CUSTOMER_VALUE_FIELDS, "updated_at"]
+FARM_VALUE_FIELDS = ["name", "city", "area", "farming_area", "plant_area"]
+FARM_UPDATE_FIELDS = ["customer", "state", *FARM_VALUE_FIELDS, "updated_at"]
+PLANTING_VALUE_FIELDS = ["plant_name"]
+PLANTING_UPDATE_FIELDS = ["farm", *PLANTING_VALUE_FIELDS, "updated_at"]
+REQUIRED_MESSAGE = "This field is required."
+
+
+def _clean_row(
+    model: Type[Model], row: Any, fields: List[str], uuid_fields: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Private function created to clean the plain fields of a bulk row, with the model field validators and
+    without building a model instance.
+    Args:
+        model (Type[Model]): Receives the model of the row.
+        row (Any): Receives the row sent by the client.
+        fields (List[str]): Receives the required plain fields.
+        uuid_fields (List[str]): Receives the required UUID fields. The optional id field is always cleaned.
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: Return the cleaned values and the errors by field.
+    """
+    if not isinstance(row, dict):
+        return {}, {"non_field_errors": ["Invalid data. Expected a dictionary."]}
+    values: Dict[str, Any] = {}
+    errors: Dict[str, Any] = {}
+    for field_name in fields:
+        if row.get(field_name) in (None, ""):
+            errors[field_name] = [REQUIRED_MESSAGE]
+            continue
+        try:
+            values[field_name] = model._meta.get_field(field_name).clean(row[field_name], None)
+        except ValidationError as error:
+            errors[field_name] = error.messages
+    for field_name in ["id", *uuid_fields]:
+        if row.get(field_name) in (None, ""):
+            if field_name != "id":
+                errors[field_name] = [REQUIRED_MESSAGE]
+            continue
+        try:
+            values[field_name] = uuid.UUID(str(row[field_name]))
+        except ValueError:
+            errors[field_name] = ["Must be a valid UUID."]
+    return values, errors
+
+
+def _check_duplicated_id(values: Dict[str, Any], errors: Dict[str, Any], seen_ids: Set[Any]) -> None:
+    """Private function created to reject a row whose id was already sent, since one upsert statement can not
+    touch the same row twice.
+    Args:
+        values (Dict[str, Any]): Receives the cleaned values of the row.
+        errors (Dict[str, Any]): Receives the errors of the row, updated in place.
+        seen_ids (Set[Any]): Receives the ids of the previous rows, updated in place.
+    """
+    if "id" not in values:
+        return
+    if values["id"] in seen_ids:
+        errors["id"] = ["Duplicated id in the request."]
+    seen_ids.add(values["id"])
+
+
+def validate_customer_rows(rows: List[Any]) -> Tuple[List[Customer], List[Dict[str, Any]]]:
+    """Function responsible to validate every customer bulk row in one pass, with the CPF/CNPJ rule.
+    Args:
+        rows (List[Any]): Receives the rows sent by the client.
+    Returns:
+        Tuple[List[Customer], List[Dict[str, Any]]]: Return the unsaved customers and the errors of each invalid
+        row, identified by its position.
+    """
+    customers, errors, seen_ids = [], [], set()
+    for position, row in enumerate(rows):
+        values, row_errors = _clean_row(Customer, row, CUSTOMER_VALUE_FIELDS, [])
+        _check_duplicated_id(values, row_errors, seen_ids)
+        if "personal_document" in values:
+            try:
+                validate_personal_document(values["personal_document"])
+            except ValidationError as error:
+                row_errors["personal_document"] = error.messages
+        if row_errors:
+            errors.append({"row": position, "errors": row_errors})
+            continue
+        values.setdefault("id", uuid.uuid4())
+        customers.append(Customer(**values))
+    return customers, errors
+
+
+def validate_farm_rows(rows: List[Any]) -> Tuple[List[FarmProperty], List[Dict[str, Any]]]:
+    """Function responsible to validate every farm bulk row in one pass. The state acronyms and the customer ids
+    are resolved with one query each, and the area rule runs on the cleaned values.
+    Args:
+        rows (List[Any]): Receives the rows sent by the client.
+    Returns:
+        Tuple[List[FarmProperty], List[Dict[str, Any]]]: Return the unsaved farms and the errors of each invalid
+        row, identified by its position.
+    """
+    cleaned = []
+    for row in rows:
+        values, row_errors = _clean_row(FarmProperty, row, FARM_VALUE_FIELDS, ["customer"])
+        if isinstance(row, dict):
+            if row.get("state") in (None, ""):
+                row_errors["state"] = [REQUIRED_MESSAGE]
+            else:
+                values["state"] = str(row["state"])
+        cleaned.append((values, row_errors))
+    acronyms = {values["state"] for values, _ in cleaned if "state" in values}
+    customer_ids = {values["customer"] for values, _ in cleaned if "customer" in values}
+    states = dict(State.objects.filter(acronym__in=acronyms).values_list("acronym", "id"))
+    customers = set(Customer.objects.filter(id__in=customer_ids).values_list("id", flat=True))
+    farms, errors, seen_ids = [], [], set()
+    for position, (values, row_errors) in enumerate(cleaned):
+        _check_duplicated_id(values, row_errors, seen_ids)
+        if "state" in values and values["state"] not in states:
+            row_errors["state"] = [f"Object with acronym={values['state']} does not exist."]
+        if "customer" in values and values["customer"] not in customers:
+            row_errors["customer"] = [f'Invalid pk "{values["customer"]}" - object does not exist.']
+        if not row_errors:
+            try:
+                validate_farm_areas(values["area"], values["farming_area"], values["plant_area"])
+            except ValidationError as error:
+                row_errors["non_field_errors"] = error.messages
+        if row_errors:
+            errors.append({"row": position, "errors": row_errors})
+            continue
+        values.setdefault("id", uuid.uuid4())
+        values.update(state_id=states[values.pop("state")], customer_id=values.pop("customer"))
+        farms.append(FarmProperty(**values))
+    return farms, errors
+
+
+def validate_planting_rows(rows: List[Any]) -> Tuple[List[PlantingType], List[Dict[str, Any]]]:
+    """Function responsible to validate every planting bulk row in one pass, resolving the farm ids with one query.
+    Args:
+        rows (List[Any]): Receives the rows sent by the client.
+    Returns:
+        Tuple[List[PlantingType], List[Dict[str, Any]]]: Return the unsaved plantings and the errors of each
+        invalid row, identified by its position.
+    """
+    cleaned = [_clean_row(PlantingType, row, PLANTING_VALUE_FIELDS, ["farm"]) for row in rows]
+    farm_ids = {values["farm"] for values, _ in cleaned if "farm" in values}
+    farms = set(FarmProperty.objects.filter(id__in=farm_ids).values_list("id", flat=True))
+    plantings, errors, seen_ids = [], [], set()
+    for position, (values, row_errors) in enumerate(cleaned):
+        _check_duplicated_id(values, row_errors, seen_ids)
+        if "farm" in values and values["farm"] not in farms:
+            row_errors["farm"] = [f'Invalid pk "{values["farm"]}" - object does not exist.']
+        if row_errors:
+            errors.append({"row": position, "errors": row_errors})
+            continue
+        values.setdefault("id", uuid.uuid4())
+        values["farm_id"] = values.pop("farm")
+        plantings.append(PlantingType(**values))
+    return plantings, errors
+
+
+def _upsert(model: Type[Model], objs: List[Any], update_fields: List[str], batch_size: int) -> Dict[Any, Any]:
+    """Private function created to upsert the objects with bulk_create, by batches.
+    Args:
+        model (Type[Model]): Receives the model of the objects.
+        objs (List[Any]): Receives the validated objects.
+        update_fields (List[str]): Receives the fields updated when the id already exists.
+        batch_size (int): Receives the number of rows written by each INSERT.
+    Returns:
+        Dict[Any, Any]: Return the stored version of the objects which already existed, by id.
+    """
+    previous: Dict[Any, Any] = {}
+    for start in range(0, len(objs), batch_size):
+        previous.update(model._default_manager.in_bulk([obj.pk for obj in objs[start : start + batch_size]]))
+    model._default_manager.bulk_create(
+        objs, batch_size=batch_size, update_conflicts=True, unique_fields=["id"], update_fields=update_fields
+    )
+    return previous
+
+
+def _stamp_updated_at(model: Type[Model], objs: List[Any], batch_size: int) -> None:
+    """Private function created to set one updated_at on every upserted row, taken at the end of the transaction.
+    bulk_create stamps each batch when it is written, so on a long import the first rows would commit with an
+    updated_at already behind the SYNC_SETTLE_SECONDS window, and a delta sync cursor built meanwhile would skip
+    them. It must be the last write of the transaction.
+    Args:
+        model (Type[Model]): Receives the model of the objects.
+        objs (List[Any]): Receives the upserted objects.
+        batch_size (int): Receives the number of rows of each UPDATE.
+    """
+    stamped_at = timezone.now()
+    for start in range(0, len(objs), batch_size):
+        ids = [obj.pk for obj in objs[start : start + batch_size]]
+        model._default_manager.filter(pk__in=ids).update(updated_at=stamped_at)
+    for obj in objs:
+        obj.updated_at = stamped_at
+
+
+def write_customers(customers: List[Customer], batch_size: int) -> Dict[str, int]:
+    """Function responsible to upsert the validated customers with bulk_create, by batches, inside one transaction.
+    Args:
+        customers (List[Customer]): Receives the validated customers.
+        batch_size (int): Receives the number of rows written by each INSERT.
+    Returns:
+        Dict[str, int]: Return the number of created and updated customers.
+    """
+    with transaction.atomic():
+        previous = _upsert(Customer, customers, CUSTOMER_UPDATE_FIELDS, batch_size)
+        _stamp_updated_at(Customer, customers, batch_size)
+    return {"created": len(customers) - len(previous), "updated": len(previous)}
+
+
+def write_farms(farms: List[FarmProperty], batch_size: int) -> Dict[str, int]:
+    """Function responsible to upsert the validated farms with bulk_create, by batches, inside one transaction.
+    Since bulk_create skips the model signals, the state rollups and the stats cache are refreshed at the end.
+    Args:
+        farms (List[FarmProperty]): Receives the validated farms.
+        batch_size (int): Receives the number of rows written by each INSERT.
+    Returns:
+        Dict[str, int]: Return the number of created and updated farms.
+    """
+    with transaction.atomic():
+        previous = _upsert(FarmProperty, farms, FARM_UPDATE_FIELDS, batch_size)
+        refresh_state_rollups({farm.state_id for farm in [*farms, *previous.values()]})
+        _stamp_updated_at(FarmProperty, farms, batch_size)
+    invalidate_stats(FarmProperty)
+    return {"created": len(farms) - len(previous), "updated": len(previous)}
+
+
+def write_plantings(plantings: List[PlantingType], batch_size: int) -> Dict[str, int]:
+    """Function responsible to upsert the validated plantings with bulk_create, by batches, inside one
+    transaction. Since bulk_create skips the model signals, the plant name rollups and the stats cache are
+    refreshed at the end.
+    Args:
+        plantings (List[PlantingType]): Receives the validated plantings.
+        batch_size (int): Receives the number of rows written by each INSERT.
+    Returns:
+        Dict[str, int]: Return the number of created and updated plantings.
+    """
+    with transaction.atomic():
+        previous = _upsert(PlantingType, plantings, PLANTING_UPDATE_FIELDS, batch_size)
+        refresh_planting_rollups({planting.plant_name for planting in [*plantings, *previous.values()]})
+        _stamp_updated_at(PlantingType, plantings, batch_size)
+    invalidate_stats(PlantingType)
+    return {"created": len(plantings) - len(previous), "updated": len(previous)}
@@ -0,0 +1,162 @@
+import hashlib
+import uuid
+from functools import wraps
+from typing import Any, Awaitable, Callable, List, Tuple, Type
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+from django.db.models import Model
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from agrobusiness.metrics import get_metrics_store
+
+CACHE_HEADER = "X-Cache"
+VERSION_KEY = "stats:version:{label}"
+CACHE_METRIC = "agro_stats_cache_requests_total"
+
+
+def get_stats_cache() -> BaseCache:
+    """Function responsible to return the cache configured to store the dashboard stats.
+    Returns:
+        BaseCache: Return the cache instance related to the STATS_CACHE_ALIAS setting.
+    """
+    return caches[settings.STATS_CACHE_ALIAS]
+
+
+def _model_versions(models: List[Type[Model]]) -> List[str]:
+    """Private function created to read, in a single cache call, the current data version of each model.
+    Missing versions are created, so an evicted version never matches an entry computed before it.
+    Args:
+        models (List[Type[Model]]): Receives the models which the cached value depends on.
+    Returns:
+        List[str]: Return the versions, in the same order of the models.
+    """
+    cache = get_stats_cache()
+    keys = [VERSION_KEY.format(label=model._meta.label_lower) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def build_stats_key(name: str, models: List[Type[Model]], request: Request) -> str:
+    """Function responsible to build the cache key of a stats value, based on its dependencies and query params.
+    Args:
+        name (str): Receives the name of the stats value.
+        models (List[Type[Model]]): Receives the models which the stats value depends on.
+        request (Request): Receives the DRF request, whose query params take part on the key.
+    Returns:
+        str: Return the cache key.
+    """
+    params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    fingerprint = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+    return ":".join(["stats", name, *_model_versions(models), fingerprint])
+
+
+def _bump_version(model: Type[Model]) -> None:
+    """Private function created to replace the data version of a model, so the entries built on the previous
+    version are never read again.
+    Args:
+        model (Type[Model]): Receives the model whose data changed.
+    """
+    get_stats_cache().set(VERSION_KEY.format(label=model._meta.label_lower), uuid.uuid4().hex, None)
+
+
+def invalidate_stats(model: Type[Model]) -> None:
+    """Function responsible to invalidate every cached stats value which depends on the given model, once the
+    running transaction commits, or right away outside a transaction. A version replaced before the commit would
+    let a concurrent request cache the data it still reads from before the change under the new version.
+    Args:
+        model (Type[Model]): Receives the model whose data changed.
+    """
+    transaction.on_commit(lambda: _bump_version(model))
+
+
+def cached_stats(*models: Type[Model]) -> Callable[..., Any]:
+    """Decorator responsible to cache the response data of a stats action, until any of the models changes.
+    The response reports the cache usage on the X-Cache header.
+    Args:
+        models (Type[Model]): Receives the models which the stats action depends on.
+    Returns:
+        Callable: Return the decorator to be applied on the viewset action.
+    """
+
+    def decorator(func: Callable[..., Response]) -> Callable[..., Response]:
+        """Decorator function, wrapping the viewset action."""
+
+        @wraps(func)
+        def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Response:
+            """Wrapper function, returning the cached data when it exists."""
+            cache = get_stats_cache()
+            key = build_stats_key(func.__name__, list(models), request)
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data, status=status.HTTP_200_OK)
+                response[CACHE_HEADER] = "HIT"
+                get_metrics_store().inc(CACHE_METRIC, {"endpoint": func.__name__, "result": "hit"})
+                return response
+            response = func(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.STATS_CACHE_TIMEOUT)
+            response[CACHE_HEADER] = "MISS"
+            get_metrics_store().inc(CACHE_METRIC, {"endpoint": func.__name__, "result": "miss"})
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def cached_stats_data(
+    name: str, models: List[Type[Model]], request: Request, compute: Callable[[], Any]
+) -> Tuple[Any, str]:
+    """Function responsible to return the cached data of a stats value outside a viewset action, computing and
+    storing it on a miss. The key is the same as cached_stats, so the entries are shared with the actions.
+    Args:
+        name (str): Receives the name of the stats value, the name of the viewset action.
+        models (List[Type[Model]]): Receives the models which the stats value depends on.
+        request (Request): Receives the DRF request, whose query params take part on the key.
+        compute (Callable[[], Any]): Receives the function which computes the data.
+    Returns:
+        Tuple[Any, str]: Return the data and the X-Cache header value.
+    """
+    cache = get_stats_cache()
+    key = build_stats_key(name, models, request)
+    data = cache.get(key)
+    result = "hit"
+    if data is None:
+        data, result = compute(), "miss"
+        cache.set(key, data, settings.STATS_CACHE_TIMEOUT)
+    get_metrics_store().inc(CACHE_METRIC, {"endpoint": name, "result": result})
+    return data, result.upper()
+
+
+async def acached_stats_data(
+    name: str, models: List[Type[Model]], request: Request, compute: Callable[[], Awaitable[Any]]
+) -> Tuple[Any, str]:
+    """Function responsible to return the cached data of a stats value on an async view, computing and storing it
+    on a miss. The key is the same as cached_stats, so the sync and async endpoints share their entries.
+    Args:
+        name (str): Receives the name of the stats value, the name of the sync viewset action.
+        models (List[Type[Model]]): Receives the models which the stats value depends on.
+        request (Request): Receives the DRF request, whose query params take part on the key.
+        compute (Callable[[], Awaitable[Any]]): Receives the coroutine function which computes the data.
+    Returns:
+        Tuple[Any, str]: Return the data and the X-Cache header value.
+    """
+    cache = get_stats_cache()
+    key = await sync_to_async(build_stats_key)(name, models, request)
+    data = await cache.aget(key)
+    result = "hit"
+    if data is None:
+        data, result = await compute(), "miss"
+        await cache.aset(key, data, settings.STATS_CACHE_TIMEOUT)
+    get_metrics_store().inc(CACHE_METRIC, {"endpoint": name, "result": result})
+    return data, result.upper()
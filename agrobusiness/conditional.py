@@ -0,0 +1,195 @@
+import hashlib
+from functools import wraps
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.db.models import CharField, Count, DateTimeField, Max, Model, QuerySet, Value
+from django.db.models.functions import Cast
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from agrobusiness.expand import EXPAND_PARAM, _query_list
+
+Validators = Tuple[Optional[int], str]
+
+
+def _validator_values(queryset: QuerySet[Any], per_row: bool = False) -> QuerySet[Any]:
+    """Private function created to turn a queryset into one row with its label, row count and MAX(updated_at). The
+    models without updated_at, such as State, only give their row count.
+    Args:
+        queryset (QuerySet): Receives the queryset.
+        per_row (bool, optional): Receives if every row is kept apart, labeled by its primary key, so a row
+        replaced by another changes the values too. Defaults to False.
+    Returns:
+        QuerySet: Return the values queryset, ready to be combined with the others by UNION ALL.
+    """
+    model = queryset.model
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        last_modified = Max("updated_at")
+    else:
+        last_modified = Value(None, output_field=DateTimeField())
+    label = Cast("pk", CharField()) if per_row else Value(model._meta.label_lower, output_field=CharField())
+    return (
+        queryset.order_by()
+        .annotate(label=label)
+        .values("label")
+        .annotate(total=Count("pk"), last_modified=last_modified)
+    )
+
+
+def queryset_validators(
+    querysets: List[QuerySet[Any]], window: Optional[QuerySet[Any]] = None
+) -> Tuple[Optional[int], List[Any]]:
+    """Function responsible to read the MAX(updated_at) and the row count of every queryset, plus the primary key
+    and updated_at of every row of the window, in a single query.
+    Args:
+        querysets (List[QuerySet]): Receives the querysets which the response depends on.
+        window (QuerySet, optional): Receives the rows of a list page, kept apart. Defaults to None.
+    Returns:
+        Tuple[Optional[int], List[Any]]: Return the newest updated_at among them, as a timestamp, or None when there
+        is no row, and the aggregated values of every queryset.
+    """
+    values = [_validator_values(queryset) for queryset in querysets]
+    if window is not None:
+        values.append(_validator_values(window, per_row=True))
+    first, *others = values
+    rows = sorted((row["label"], row["total"], row["last_modified"]) for row in first.union(*others, all=True))
+    timestamps = [int(last_modified.timestamp()) for _, _, last_modified in rows if last_modified is not None]
+    return max(timestamps, default=None), rows
+
+
+def build_validators(
+    request: Request, querysets: List[QuerySet[Any]], window: Optional[QuerySet[Any]] = None
+) -> Validators:
+    """Function responsible to build the Last-Modified and ETag validators of a read request. The ETag covers the
+    aggregated values, the full path with its query params and the negotiated media type, so it changes when a row
+    is created, updated or deleted, without rendering or hashing the body.
+    Args:
+        request (Request): Receives the DRF request.
+        querysets (List[QuerySet]): Receives the querysets which the response depends on.
+        window (QuerySet, optional): Receives the rows of a list page. Defaults to None.
+    Returns:
+        Validators: Return the Last-Modified timestamp, or None when there is no row, and the quoted ETag.
+    """
+    last_modified, parts = queryset_validators(querysets, window)
+    fingerprint = repr((request.get_full_path(), getattr(request, "accepted_media_type", None), parts))
+    return last_modified, '"{}"'.format(hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+
+
+def conditional_response(
+    request: Request,
+    querysets: List[QuerySet[Any]],
+    respond: Callable[[], HttpResponseBase],
+    window: Optional[QuerySet[Any]] = None,
+    with_last_modified: bool = False,
+) -> HttpResponseBase:
+    """Function responsible to answer a read request with 304 when the client copy is still valid, and otherwise
+    to build the response and attach its validators. Last-Modified is only sent when asked, for a single object:
+    the MAX(updated_at) of a list or a stats does not move when a row is deleted, so they rely on the ETag.
+    Args:
+        request (Request): Receives the DRF request.
+        querysets (List[QuerySet]): Receives the querysets which the response depends on.
+        respond (Callable[[], HttpResponseBase]): Receives the function which builds the full response.
+        window (QuerySet, optional): Receives the rows of a list page. Defaults to None.
+        with_last_modified (bool, optional): Receives if Last-Modified is sent and If-Modified-Since is compared.
+        Defaults to False.
+    Returns:
+        HttpResponseBase: Return the 304 or 412 response, or the full response with the ETag header, and the
+        Last-Modified header when asked.
+    """
+    last_modified, etag = build_validators(request, querysets, window)
+    if not with_last_modified:
+        last_modified = None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = respond()
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def conditional(*models: Type[Model]) -> Callable[..., Any]:
+    """Decorator responsible to answer a stats action with 304 while none of the models changed. It should wrap
+    cached_stats, so a 304 skips the cache lookup too.
+    Args:
+        models (Type[Model]): Receives the models which the stats action depends on.
+    Returns:
+        Callable: Return the decorator to be applied on the viewset action.
+    """
+
+    def decorator(func: Callable[..., Response]) -> Callable[..., HttpResponseBase]:
+        """Decorator function, wrapping the viewset action."""
+
+        @wraps(func)
+        def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+            """Wrapper function, comparing the request validators before running the action."""
+            querysets = [model._default_manager.all() for model in models]
+            return conditional_response(request, querysets, lambda: func(self, request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalViewMixin:
+    """Viewset mixin class, answering the list and retrieve actions with an ETag computed from the rows rendered,
+    and with 304 when it matches the request. A list page is validated by the primary key and updated_at of its
+    own rows, read by the index range of the cursor instead of an aggregate over the filtered table, and the
+    retrieve sends Last-Modified too. The expanded relations add the validators of their whole model"""
+
+    def get_conditional_querysets(self, request: Request, **kwargs: Any) -> List[QuerySet[Any]]:
+        """Function responsible to return the querysets which the list or retrieve response depends on.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            List[QuerySet]: Return the filtered queryset of the viewset, narrowed to the object on retrieve, plus
+            the querysets of the expanded relations.
+        """
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field  # type: ignore[attr-defined]
+        if lookup_url_kwarg in kwargs:
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})  # type: ignore[attr-defined]
+        querysets = [queryset]
+        expandable_fields = getattr(self.get_serializer_class(), "expandable_fields", {})  # type: ignore
+        for name in sorted(_query_list(request, EXPAND_PARAM) & set(expandable_fields)):
+            model = expandable_fields[name].serializer.Meta.model
+            querysets.append(model._default_manager.all())
+        return querysets
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Function responsible to list the rows, or to answer 304 when the client copy is still valid.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            HttpResponseBase: Return the list response, or the 304 response.
+        """
+        list_rows = super().list  # type: ignore[misc]
+        queryset, *querysets = self.get_conditional_querysets(request, **kwargs)
+        paginator = self.paginator  # type: ignore[attr-defined]
+        if paginator is None or not hasattr(paginator, "page_window"):
+            return conditional_response(request, [queryset, *querysets], lambda: list_rows(request, *args, **kwargs))
+        window = paginator.page_window(queryset, request)
+        return conditional_response(request, querysets, lambda: list_rows(request, *args, **kwargs), window=window)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Function responsible to return the object, or to answer 304 when the client copy is still valid.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            HttpResponseBase: Return the detail response, or the 304 response.
+        """
+        retrieve = super().retrieve  # type: ignore[misc]
+        try:
+            querysets = self.get_conditional_querysets(request, **kwargs)
+        except (TypeError, ValueError, ValidationError):
+            # An invalid lookup value, answered with 404 by get_object
+            return retrieve(request, *args, **kwargs)
+        return conditional_response(
+            request, querysets, lambda: retrieve(request, *args, **kwargs), with_last_modified=True
+        )
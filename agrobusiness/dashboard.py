@@ -0,0 +1,221 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import Model
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from agrobusiness.aggregations import agricultural_land_stats, farm_area_totals, planting_type_stats
+from agrobusiness.cache import cached_stats_data
+from agrobusiness.filters import FarmPropertyFilter, PlantingTypeFilter, filter_rows, has_filters
+from agrobusiness.instrumentation import RequestMetrics, current_metrics
+from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+from agrobusiness.rollups import farm_rollup_totals, planting_rollup_stats, state_rollup_stats
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def state_farms_data(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Function responsible to format the state rollup rows as the pie chart of farms in each state.
+    Args:
+        rows (List[Dict[str, Any]]): Receives the rows of state_rollup_stats.
+    Returns:
+        List[Dict[str, Any]]: Return one chart row per state.
+    """
+    return [
+        {
+            "state": row["acronym"],
+            "farm_percentage": row["farm_percentage"],
+            "farms_total": row["farms_total"],
+            "area_total": row["area_total"],
+            "farming_area_total": row["farming_area_total"],
+            "plant_area_total": row["plant_area_total"],
+        }
+        for row in rows
+    ]
+
+
+def farm_areas_data(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Function responsible to format the area totals of the farms as the total areas response.
+    Args:
+        totals (Dict[str, Any]): Receives the totals of farm_area_totals or farm_rollup_totals.
+    Returns:
+        Dict[str, Any]: Return the total, farming and vegetation hectares.
+    """
+    return {
+        "farms_area_total": totals["area_total"],
+        "farming_area_total": totals["farming_area_total"],
+        "plant_area_total": totals["plant_area_total"],
+    }
+
+
+def state_farms_panel(request: Request) -> List[Dict[str, Any]]:
+    """Function responsible to compute the pie chart of farms in each state, from the rollup table.
+    Args:
+        request (Request): Receives the DRF request.
+    Returns:
+        List[Dict[str, Any]]: Return one row per state.
+    """
+    return state_farms_data(state_rollup_stats())
+
+
+def total_farms_panel(request: Request) -> Dict[str, Any]:
+    """Function responsible to compute the total number of registered properties, from the rollup table.
+    Args:
+        request (Request): Receives the DRF request.
+    Returns:
+        Dict[str, Any]: Return the farm count.
+    """
+    return {"farms_total": farm_rollup_totals()["farms_total"]}
+
+
+def total_areas_panel(request: Request) -> Dict[str, Any]:
+    """Function responsible to compute the total areas in hectares of the properties, from the rollup table when
+    the request has no farm filter.
+    Args:
+        request (Request): Receives the DRF request, with the farm filters.
+    Returns:
+        Dict[str, Any]: Return the total, farming and vegetation hectares.
+    """
+    if has_filters(FarmPropertyFilter, request):
+        totals = farm_area_totals(filter_rows(FarmPropertyFilter, request, FarmProperty.objects.all()))
+    else:
+        totals = farm_rollup_totals()
+    return farm_areas_data(totals)
+
+
+def agricultural_land_panel(request: Request) -> List[Dict[str, Any]]:
+    """Function responsible to compute the pie chart of agricultural land use, limited to the top farms when the
+    top query param is given.
+    Args:
+        request (Request): Receives the DRF request, with the farm filters.
+    Raises:
+        ValidationError: Raised when top or the filters are invalid.
+    Returns:
+        List[Dict[str, Any]]: Return one row per farm.
+    """
+    top = request.query_params.get("top")
+    if top is not None:
+        top = serializers.IntegerField(min_value=1).run_validation(top)
+    return agricultural_land_stats(filter_rows(FarmPropertyFilter, request, FarmProperty.objects.all()), top=top)
+
+
+def cultivation_by_name_panel(request: Request) -> List[Dict[str, Any]]:
+    """Function responsible to compute the pie chart of cultivation plant types by quantities, optionally with the
+    distinct farms and farming hectares of each plant type.
+    Args:
+        request (Request): Receives the DRF request, with the planting filters and the include query param.
+    Raises:
+        ValidationError: Raised when include or the filters are invalid.
+    Returns:
+        List[Dict[str, Any]]: Return one row per plant name.
+    """
+    include = [item for item in request.query_params.get("include", "").split(",") if item]
+    include = serializers.MultipleChoiceField(choices=["farms", "area"]).run_validation(include)
+    if include or has_filters(PlantingTypeFilter, request):
+        return planting_type_stats(
+            filter_rows(PlantingTypeFilter, request, PlantingType.objects.all()),
+            with_farms="farms" in include,
+            with_area="area" in include,
+        )
+    return planting_rollup_stats()
+
+
+class DashboardPanel(NamedTuple):
+    """Dashboard panel class, naming a stats value, the viewset action whose cache entries it shares and the models
+    it depends on"""
+
+    name: str
+    cache_name: str
+    models: List[Type[Model]]
+    compute: Callable[[Request], Any]
+
+
+DASHBOARD_PANELS = [
+    DashboardPanel("total_farms", "total_farms", [FarmProperty], total_farms_panel),
+    DashboardPanel("total_areas", "total_farm_areas", [FarmProperty, State, Customer], total_areas_panel),
+    DashboardPanel("state_farms", "farms_by_state", [State, FarmProperty], state_farms_panel),
+    DashboardPanel(
+        "agricultural_land", "farms_agricultural_land", [FarmProperty, State, Customer], agricultural_land_panel
+    ),
+    DashboardPanel(
+        "cultivation_by_name", "planting_type_by_name", [PlantingType, FarmProperty, State], cultivation_by_name_panel
+    ),
+]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Private function created to return the thread pool of the panels, started on its first use. Each thread
+    keeps its own database connection, reused by the next requests for CONN_MAX_AGE seconds (DB_CONN_MAX_AGE,
+    set on the WSGI deployment), and closed after each request when it is 0, the default.
+    Returns:
+        ThreadPoolExecutor: Return the thread pool, with DASHBOARD_WORKERS threads.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix="dashboard")
+    return _executor
+
+
+def run_panel(panel: DashboardPanel, request: Request, metrics: Optional[RequestMetrics] = None) -> Dict[str, Any]:
+    """Function responsible to compute one panel through the stats cache, timing it.
+    Args:
+        panel (DashboardPanel): Receives the panel.
+        request (Request): Receives the DRF request.
+        metrics (RequestMetrics, optional): Receives the metrics of the request, whose query recorder is installed
+            on the connections of the thread. Defaults to None.
+    Returns:
+        Dict[str, Any]: Return the panel data, its duration in milliseconds and its X-Cache value.
+    """
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        if metrics is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics.record_query))
+        data, cache = cached_stats_data(panel.cache_name, panel.models, request, lambda: panel.compute(request))
+    return {"data": data, "duration_ms": round((time.perf_counter() - started) * 1000, 2), "cache": cache}
+
+
+def _run_pooled_panel(panel: DashboardPanel, request: Request, metrics: Optional[RequestMetrics]) -> Dict[str, Any]:
+    """Private function created to compute a panel on a pool thread, which closes its connection when it is
+    broken or older than CONN_MAX_AGE, as django does at the end of each request.
+    Args:
+        panel (DashboardPanel): Receives the panel.
+        request (Request): Receives the DRF request.
+        metrics (RequestMetrics, optional): Receives the metrics of the request.
+    Returns:
+        Dict[str, Any]: Return the panel result of run_panel.
+    """
+    close_old_connections()
+    try:
+        return run_panel(panel, request, metrics)
+    finally:
+        close_old_connections()
+
+
+def compute_dashboard(request: Request, panels: Optional[List[DashboardPanel]] = None) -> Dict[str, Any]:
+    """Function responsible to compute every dashboard panel, concurrently on the panel thread pool when
+    DASHBOARD_WORKERS is above 1, each panel with its own database connection.
+    Args:
+        request (Request): Receives the DRF request, whose query params are given to every panel.
+        panels (List[DashboardPanel], optional): Receives the panels. Defaults to DASHBOARD_PANELS.
+    Raises:
+        ValidationError: Raised when the query params are invalid for any panel.
+    Returns:
+        Dict[str, Any]: Return the data of each panel, and the duration and cache usage of each panel.
+    """
+    panels = DASHBOARD_PANELS if panels is None else panels
+    metrics = current_metrics()
+    if settings.DASHBOARD_WORKERS > 1:
+        futures = [_get_executor().submit(_run_pooled_panel, panel, request, metrics) for panel in panels]
+        results = [future.result() for future in futures]
+    else:
+        results = [run_panel(panel, request) for panel in panels]
+    return {
+        "panels": {panel.name: result.pop("data") for panel, result in zip(panels, results)},
+        "timings": {panel.name: result for panel, result in zip(panels, results)},
+    }
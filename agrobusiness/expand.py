@@ -0,0 +1,140 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Type, Union
+
+from django.db.models import Prefetch, QuerySet
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+EXPAND_PARAM = "expand"
+FIELDS_PARAM = "fields"
+# Fields always loaded by .only(), since the cursor pagination reads them on every row
+REQUIRED_COLUMNS = ["id", "created_at"]
+
+
+class ExpandableField(NamedTuple):
+    """Expandable field class, describing the nested serializer of a field and the relation loaded for it. A many
+    field is loaded by prefetch_related, and a single one by select_related"""
+
+    serializer: Type[serializers.Serializer]
+    lookup: Union[str, Prefetch]
+    many: bool = False
+
+
+def _query_list(request: Request, param: str) -> Set[str]:
+    """Private function created to read a comma separated query param, which may also be repeated.
+    Args:
+        request (Request): Receives the DRF request.
+        param (str): Receives the query param name.
+    Returns:
+        Set[str]: Return the names sent, without the empty ones.
+    """
+    return {name.strip() for value in request.query_params.getlist(param) for name in value.split(",") if name.strip()}
+
+
+def requested_fields(
+    request: Optional[Request], serializer_class: Type["ExpandableFieldsMixin"]
+) -> Tuple[Set[str], Set[str]]:
+    """Function responsible to read and validate the expand and fields query params of a read request.
+    Args:
+        request (Request, optional): Receives the DRF request.
+        serializer_class (Type[ExpandableFieldsMixin]): Receives the serializer which renders the response.
+    Raises:
+        ValidationError: Raised when an unknown field is asked.
+    Returns:
+        Tuple[Set[str], Set[str]]: Return the fields to be expanded and the sparse fields, both empty when the
+        request does not ask them or is not a read request.
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return set(), set()
+    expand, fields = _query_list(request, EXPAND_PARAM), _query_list(request, FIELDS_PARAM)
+    errors = {}
+    unknown_expand = expand - set(serializer_class.expandable_fields)
+    if unknown_expand:
+        errors[EXPAND_PARAM] = [f"Unknown fields: {', '.join(sorted(unknown_expand))}."]
+    unknown_fields = fields - {*serializer_class.Meta.fields, *serializer_class.expandable_fields}  # type: ignore
+    if unknown_fields:
+        errors[FIELDS_PARAM] = [f"Unknown fields: {', '.join(sorted(unknown_fields))}."]
+    if errors:
+        raise ValidationError(errors)
+    return expand, fields
+
+
+def expand_parameters(serializer_class: Type["ExpandableFieldsMixin"]) -> List[OpenApiParameter]:
+    """Function responsible to describe the expand and fields query params of a serializer on the OpenAPI schema.
+    Args:
+        serializer_class (Type[ExpandableFieldsMixin]): Receives the serializer which renders the response.
+    Returns:
+        List[OpenApiParameter]: Return the query params.
+    """
+    expandable = ", ".join(serializer_class.expandable_fields)
+    return [
+        OpenApiParameter(name=EXPAND_PARAM, type=str, description=f"Comma separated nested fields: {expandable}."),
+        OpenApiParameter(name=FIELDS_PARAM, type=str, description="Comma separated fields to be returned."),
+    ]
+
+
+class ExpandableFieldsMixin:
+    """Serializer mixin class, rendering the fields listed on ?expand= with their nested serializer and only the
+    fields listed on ?fields=. The serializer declares expandable_fields, and related_fields for the relations
+    read by its plain representation, so the viewset loads exactly the relations and columns rendered"""
+
+    expandable_fields: Dict[str, ExpandableField] = {}
+    related_fields: Dict[str, str] = {}
+
+    def __init__(self, *args: Any, nested: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[call-arg]
+        if nested:
+            return
+        expand, fields = requested_fields(self.context.get("request"), type(self))  # type: ignore[attr-defined]
+        for name in expand:
+            expandable = self.expandable_fields[name]
+            options = {"nested": True} if issubclass(expandable.serializer, ExpandableFieldsMixin) else {}
+            self.fields[name] = expandable.serializer(  # type: ignore[attr-defined]
+                many=expandable.many, read_only=True, **options
+            )
+        if fields:
+            for name in set(self.fields) - fields:  # type: ignore[attr-defined]
+                self.fields.pop(name)  # type: ignore[attr-defined]
+
+    @classmethod
+    def setup_queryset(cls, queryset: QuerySet[Any], request: Request) -> QuerySet[Any]:
+        """Function responsible to load, on the queryset, only the relations and columns rendered for the request.
+        Args:
+            queryset (QuerySet): Receives the queryset of the viewset.
+            request (Request): Receives the DRF request.
+        Returns:
+            QuerySet: Return the queryset with its select_related, prefetch_related and only.
+        """
+        expand, fields = requested_fields(request, cls)
+        names = fields or {*cls.Meta.fields, *expand}  # type: ignore[attr-defined]
+        select_related, prefetch_related = set(), []
+        for name in names:
+            if name in expand and cls.expandable_fields[name].many:
+                prefetch_related.append(cls.expandable_fields[name].lookup)
+            elif name in expand:
+                select_related.add(cls.expandable_fields[name].lookup)
+            elif name in cls.related_fields:
+                select_related.add(cls.related_fields[name])
+        queryset = queryset.select_related(None).prefetch_related(*prefetch_related)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if fields:
+            concrete = {field.name for field in queryset.model._meta.concrete_fields}
+            queryset = queryset.only(*REQUIRED_COLUMNS, *(names & concrete))
+        return queryset
+
+
+class ExpandableViewMixin:
+    """Viewset mixin class, tuning the list and retrieve querysets for the ?expand= and ?fields= of the request,
+    through the setup_queryset of the serializer"""
+
+    def get_queryset(self) -> QuerySet[Any]:
+        """Function responsible to return the queryset of the viewset, tuned for the list and retrieve actions.
+        Returns:
+            QuerySet: Return the queryset.
+        """
+        queryset = super().get_queryset()  # type: ignore[misc]
+        if getattr(self, "action", None) not in ("list", "retrieve"):
+            return queryset
+        return self.get_serializer_class().setup_queryset(queryset, self.request)  # type: ignore[attr-defined]
@@ -0,0 +1,97 @@
+from typing import Any, List, Type
+
+from django.db.models import QuerySet
+from django_filters import rest_framework as filters
+from django_filters.utils import translate_validation
+from rest_framework.request import Request
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType
+from agrobusiness.search import CUSTOMER_SEARCH_FIELDS, FARM_SEARCH_FIELDS, search_queryset
+
+
+class SearchFilter(filters.CharFilter):
+    """Search filter class, matching every term of the value on any of the search fields, ignoring case and
+    accents, as the admin search does"""
+
+    def __init__(self, *args: Any, search_fields: List[str], **kwargs: Any) -> None:
+        kwargs.setdefault("help_text", "Busca por termos, sem diferenciar maiúsculas e acentos")
+        super().__init__(*args, **kwargs)
+        self.search_fields = search_fields
+
+    def filter(self, qs: QuerySet[Any], value: str) -> QuerySet[Any]:
+        """Function responsible to filter the rows which match the search.
+        Args:
+            qs (QuerySet): Receives the queryset to be filtered.
+            value (str): Receives the search text.
+        Returns:
+            QuerySet: Return the filtered queryset.
+        """
+        if not value:
+            return qs
+        return search_queryset(qs, self.search_fields, value)
+
+
+class CustomerFilter(filters.FilterSet):
+    """Customer FilterSet class"""
+
+    search = SearchFilter(search_fields=CUSTOMER_SEARCH_FIELDS)
+
+    class Meta:
+        model = Customer
+        fields = ["search"]
+
+
+class FarmPropertyFilter(filters.FilterSet):
+    """FarmProperty FilterSet class, shared by the list endpoint and the stats endpoints"""
+
+    state = filters.CharFilter(field_name="state__acronym", lookup_expr="iexact")
+    city = filters.CharFilter(field_name="city", lookup_expr="iexact")
+    created_at = filters.IsoDateTimeFromToRangeFilter(field_name="created_at")
+    search = SearchFilter(search_fields=FARM_SEARCH_FIELDS)
+
+    class Meta:
+        model = FarmProperty
+        fields = ["state", "customer", "city", "created_at", "search"]
+
+
+class PlantingTypeFilter(filters.FilterSet):
+    """PlantingType FilterSet class, shared by the list endpoint and the stats endpoints"""
+
+    state = filters.CharFilter(field_name="farm__state__acronym", lookup_expr="iexact")
+    customer = filters.UUIDFilter(field_name="farm__customer")
+
+    class Meta:
+        model = PlantingType
+        fields = ["state", "customer", "farm", "plant_name"]
+
+
+def has_filters(filterset_class: Type[filters.FilterSet], request: Request) -> bool:
+    """Function responsible to check if the request uses any filter of the FilterSet.
+    Args:
+        filterset_class (Type[FilterSet]): Receives the FilterSet class of the viewset.
+        request (Request): Receives the DRF request.
+    Returns:
+        bool: Return True when any filter has a value, or when the filters are invalid, so the caller falls back
+        to the filtered queryset and its validation.
+    """
+    filterset = filterset_class(request.query_params)
+    if not filterset.is_valid():
+        return True
+    return any(value not in (None, "", []) for value in filterset.form.cleaned_data.values())
+
+
+def filter_rows(filterset_class: Type[filters.FilterSet], request: Request, queryset: QuerySet[Any]) -> QuerySet[Any]:
+    """Function responsible to apply the FilterSet on a queryset outside a DRF view, as DjangoFilterBackend does.
+    Args:
+        filterset_class (Type[FilterSet]): Receives the FilterSet class.
+        request (Request): Receives the DRF request.
+        queryset (QuerySet): Receives the queryset to be filtered.
+    Raises:
+        ValidationError: Raised when the filters are invalid.
+    Returns:
+        QuerySet: Return the filtered queryset, not evaluated.
+    """
+    filterset = filterset_class(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    return filterset.qs
@@ -0,0 +1,289 @@
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from agrobusiness.metrics import get_metrics_store
+
+logger = logging.getLogger("agrobusiness.metrics")
+
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Request metrics class, holding the SQL, authentication, view and render timings of one request"""
+
+    __slots__ = (
+        "queries",
+        "sql_ms",
+        "auth_ms",
+        "view_ms",
+        "render_ms",
+        "total_ms",
+        "view",
+        "query_budget",
+        "_mark",
+        "_lock",
+    )
+
+    def __init__(self, query_budget: int) -> None:
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.auth_ms = 0.0
+        self.view_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+        self.view = ""
+        self.query_budget = query_budget
+        self._mark = 0.0
+        # The dashboard panels record their queries from several threads
+        self._lock = threading.Lock()
+
+    def record_query(
+        self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Dict[str, Any]
+    ) -> Any:
+        """Function responsible to run a query, as a database execute wrapper, counting it and its duration.
+        Args:
+            execute (Callable): Receives the next execute function of the wrapper chain.
+            sql (str): Receives the SQL statement.
+            params (Any): Receives the statement params.
+            many (bool): Receives if the statement is an executemany.
+            context (Dict[str, Any]): Receives the connection and cursor of the statement.
+        Returns:
+            Any: Return the result of the statement.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.queries += 1
+                self.sql_ms += (time.perf_counter() - started) * 1000
+
+    def start_render(self) -> None:
+        """Function responsible to mark the moment the response starts to be rendered."""
+        self._mark = time.perf_counter()
+
+    def finish_render(self, response: HttpResponse) -> None:
+        """Function responsible to store the render time, as a post render callback of the response.
+        Args:
+            response (HttpResponse): Receives the rendered response.
+        """
+        self.render_ms = (time.perf_counter() - self._mark) * 1000
+
+    @property
+    def over_budget(self) -> bool:
+        """Property responsible to tell if the request ran more queries than its budget.
+        Returns:
+            bool: Return True when the budget is set and exceeded.
+        """
+        return bool(self.query_budget) and self.queries > self.query_budget
+
+    def server_timing(self) -> str:
+        """Function responsible to build the Server-Timing header value.
+        Returns:
+            str: Return the metrics on the Server-Timing format.
+        """
+        return ", ".join(
+            [
+                f'db;dur={self.sql_ms:.2f};desc="{self.queries} queries"',
+                f"auth;dur={self.auth_ms:.2f}",
+                f'serialize;dur={self.view_ms:.2f};desc="view without SQL"',
+                f"render;dur={self.render_ms:.2f}",
+                f"total;dur={self.total_ms:.2f}",
+            ]
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Function responsible to return the metrics as a dict, for the structured log line.
+        Returns:
+            Dict[str, Any]: Return the metrics.
+        """
+        return {
+            "view": self.view,
+            "queries": self.queries,
+            "query_budget": self.query_budget,
+            "over_budget": self.over_budget,
+            "sql_ms": round(self.sql_ms, 2),
+            "auth_ms": round(self.auth_ms, 2),
+            "serialize_ms": round(self.view_ms, 2),
+            "render_ms": round(self.render_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+        }
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Function responsible to return the metrics of the request being handled.
+    Returns:
+        Optional[RequestMetrics]: Return the metrics, or None when the instrumentation is disabled.
+    """
+    return _current_metrics.get()
+
+
+class RequestMetricsMiddleware:
+    """Middleware class, recording the query count and the SQL, authentication, view and render timings of each
+    request. They are sent on the Server-Timing header and on one structured log line, and the requests above
+    the query budget are logged as warnings. When REQUEST_METRICS_ENABLED is off, the middleware is removed
+    from the chain on startup."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            # Keeps the chain async under ASGI, so the async views are not moved to a thread
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        """Function responsible to handle the request inside the database execute wrappers.
+        Args:
+            request (HttpRequest): Receives the django request.
+        Returns:
+            HttpResponse: Return the response with the Server-Timing header, or its coroutine on the async chain.
+        """
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics(settings.REQUEST_QUERY_BUDGET)
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with self.wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Function responsible to handle the request of the async chain inside the database execute wrappers.
+        Args:
+            request (HttpRequest): Receives the django request.
+        Returns:
+            HttpResponse: Return the response with the Server-Timing header.
+        """
+        metrics = RequestMetrics(settings.REQUEST_QUERY_BUDGET)
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        # The async ORM runs the queries on the thread of the request, whose connections are not the ones of the
+        # event loop, so the recorders are installed and removed there
+        stack = await sync_to_async(self.wrap_connections)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current_metrics.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    def wrap_connections(self, metrics: RequestMetrics) -> ExitStack:
+        """Function responsible to install the query recorder of the metrics on every database connection.
+        Args:
+            metrics (RequestMetrics): Receives the metrics of the request.
+        Returns:
+            ExitStack: Return the context which removes the recorders on exit.
+        """
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics.record_query))
+        return stack
+
+    def finish(
+        self, request: HttpRequest, response: HttpResponse, metrics: RequestMetrics, started: float
+    ) -> HttpResponse:
+        """Function responsible to send the metrics of a handled request on its header, log line and counters.
+        Args:
+            request (HttpRequest): Receives the django request.
+            response (HttpResponse): Receives the response.
+            metrics (RequestMetrics): Receives the metrics of the request.
+            started (float): Receives the perf_counter value of the request start.
+        Returns:
+            HttpResponse: Return the response with the Server-Timing header.
+        """
+        metrics.total_ms = (time.perf_counter() - started) * 1000
+        response["Server-Timing"] = metrics.server_timing()
+        line = json.dumps(
+            {"method": request.method, "path": request.path, "status": response.status_code, **metrics.as_dict()}
+        )
+        logger.log(logging.WARNING if metrics.over_budget else logging.INFO, line)
+        self.record(request, metrics)
+        return response
+
+    def record(self, request: HttpRequest, metrics: RequestMetrics) -> None:
+        """Function responsible to add the request to the latency histogram and the query counters of its view.
+        Args:
+            request (HttpRequest): Receives the django request.
+            metrics (RequestMetrics): Receives the metrics of the request.
+        """
+        store = get_metrics_store()
+        labels = {"view": metrics.view or "other", "method": request.method or ""}
+        store.observe("agro_request_duration_seconds", labels, metrics.total_ms / 1000)
+        store.inc("agro_db_queries_total", labels, metrics.queries)
+        store.inc("agro_db_query_seconds_total", labels, metrics.sql_ms / 1000)
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """Function responsible to time the render of the DRF responses, which are rendered after the view.
+        Args:
+            request (HttpRequest): Receives the django request.
+            response (HttpResponse): Receives the response not rendered yet.
+        Returns:
+            HttpResponse: Return the same response.
+        """
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.finish_render)
+        return response
+
+
+class InstrumentedViewMixin:
+    """DRF view mixin class, splitting the time of the authentication and permission checks from the time of the
+    view itself, whose time without SQL is reported as serialization. A view may set query_budget to replace
+    the REQUEST_QUERY_BUDGET setting."""
+
+    query_budget: Optional[int] = None
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """Function responsible to time the authentication, permission and throttle checks.
+        Args:
+            request (Request): Receives the DRF request.
+        """
+        metrics = _current_metrics.get()
+        if metrics is None:
+            super().initial(request, *args, **kwargs)  # type: ignore[misc]
+            return
+        metrics.view = f"{type(self).__name__}.{getattr(self, 'action', None) or request.method.lower()}"
+        if self.query_budget is not None:
+            metrics.query_budget = self.query_budget
+        started = time.perf_counter()
+        try:
+            super().initial(request, *args, **kwargs)  # type: ignore[misc]
+        finally:
+            metrics.auth_ms = (time.perf_counter() - started) * 1000
+        metrics.view_ms, metrics._mark = -metrics.sql_ms, time.perf_counter()
+
+    def finalize_response(self, request: Request, response: Response, *args: Any, **kwargs: Any) -> Response:
+        """Function responsible to store the view time, without the SQL time spent by the view.
+        Args:
+            request (Request): Receives the DRF request.
+            response (Response): Receives the response returned by the view.
+        Returns:
+            Response: Return the finalized response.
+        """
+        metrics = _current_metrics.get()
+        if metrics is not None and metrics._mark:
+            # The SQL of concurrent queries may add up to more than the view time
+            metrics.view_ms = max(metrics.view_ms + (time.perf_counter() - metrics._mark) * 1000 - metrics.sql_ms, 0)
+        return super().finalize_response(request, response, *args, **kwargs)  # type: ignore[misc]
@@ -0,0 +1,120 @@
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from agrobusiness.benchmarks import percentile
+
+# Path of each endpoint on the sync deployment and on the async views
+LOAD_TEST_ENDPOINTS = {
+    "customer-list": ("/api/customer", "/api/async/customer"),
+    "farm-list": ("/api/farm", "/api/async/farm"),
+    "planting-list": ("/api/planting", "/api/async/planting"),
+    "stats-state-farms": ("/api/states/stats/chart/state-farms", "/api/async/states/stats/chart/state-farms"),
+    "stats-total-farms": ("/api/farm/stats/total-farms", "/api/async/farm/stats/total-farms"),
+    "stats-total-areas": ("/api/farm/stats/total-areas", "/api/async/farm/stats/total-areas"),
+    "stats-agricultural-land": (
+        "/api/farm/stats/chart/agricultural-land",
+        "/api/async/farm/stats/chart/agricultural-land",
+    ),
+    "stats-cultivation-by-name": (
+        "/api/planting/stats/chart/cultivation-by-name",
+        "/api/async/planting/stats/chart/cultivation-by-name",
+    ),
+}
+
+
+def timed_get(url: str, headers: Dict[str, str], timeout: float) -> Tuple[float, int]:
+    """Function responsible to send one GET request and read its whole body.
+    Args:
+        url (str): Receives the url.
+        headers (Dict[str, str]): Receives the request headers.
+        timeout (float): Receives the timeout of the request, in seconds.
+    Returns:
+        Tuple[float, int]: Return the latency in milliseconds and the status, 0 when the server could not be reached.
+    """
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except OSError:
+        status = 0
+    return (time.perf_counter() - started) * 1000, status
+
+
+def load_endpoint(
+    url: str, headers: Dict[str, str], requests: int, concurrency: int, timeout: float = 30
+) -> Dict[str, Any]:
+    """Function responsible to send the requests of one endpoint from concurrent clients, each waiting for its
+    response before sending the next request.
+    Args:
+        url (str): Receives the endpoint url.
+        headers (Dict[str, str]): Receives the request headers.
+        requests (int): Receives the total number of requests.
+        concurrency (int): Receives the number of concurrent clients.
+        timeout (float, optional): Receives the timeout of each request, in seconds. Defaults to 30.
+    Returns:
+        Dict[str, Any]: Return the throughput, the latency percentiles and the number of failed requests.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(lambda _: timed_get(url, headers, timeout), range(requests)))
+        elapsed = time.perf_counter() - started
+    timings: List[float] = [timing for timing, _ in results]
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, status in results if status != 200),
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+    }
+
+
+def run_load_test(
+    sync_url: str,
+    async_url: str,
+    headers: Dict[str, str],
+    requests: int,
+    concurrency: int,
+    endpoints: Optional[List[str]] = None,
+    timeout: float = 30,
+) -> Dict[str, Any]:
+    """Function responsible to load the sync deployment and the async views with the same requests, endpoint by
+    endpoint, so both servers are measured under the same client concurrency.
+    Args:
+        sync_url (str): Receives the base url of the WSGI deployment, such as http://localhost:8000.
+        async_url (str): Receives the base url of the ASGI deployment, such as http://localhost:8001.
+        headers (Dict[str, str]): Receives the request headers, with the authorization.
+        requests (int): Receives the number of requests per endpoint and deployment.
+        concurrency (int): Receives the number of concurrent clients.
+        endpoints (List[str], optional): Receives the names of the endpoints to be loaded. Defaults to every one.
+        timeout (float, optional): Receives the timeout of each request, in seconds. Defaults to 30.
+    Returns:
+        Dict[str, Any]: Return the run settings and, by endpoint, the metrics of both deployments and the async
+        throughput relative to the sync one.
+    """
+    result: Dict[str, Any] = {
+        "meta": {
+            "sync_url": sync_url,
+            "async_url": async_url,
+            "requests": requests,
+            "concurrency": concurrency,
+        },
+        "endpoints": {},
+    }
+    for name in endpoints or list(LOAD_TEST_ENDPOINTS):
+        sync_path, async_path = LOAD_TEST_ENDPOINTS[name]
+        sync_metrics = load_endpoint(sync_url.rstrip("/") + sync_path, headers, requests, concurrency, timeout)
+        async_metrics = load_endpoint(async_url.rstrip("/") + async_path, headers, requests, concurrency, timeout)
+        result["endpoints"][name] = {
+            "sync": sync_metrics,
+            "async": async_metrics,
+            "throughput_ratio": round(async_metrics["throughput_rps"] / sync_metrics["throughput_rps"], 2),
+        }
+    return result
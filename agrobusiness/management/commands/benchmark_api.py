@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from agrobusiness.benchmarks import compare_read_paths, compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    """Command class to benchmark the list, detail and stats endpoints and compare the run against a baseline"""
+
+    help = (
+        "Time every list, detail and stats endpoint, recording the query count, p50/p95 latency and peak memory "
+        "on a JSON file, optionally compared against a baseline run."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Function responsible to register the command arguments.
+        Args:
+            parser (CommandParser): Receives the command argument parser.
+        """
+        parser.add_argument("--iterations", type=int, default=20, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=1, help="Requests sent before the timed ones.")
+        parser.add_argument("--cold-cache", action="store_true", help="Clear the stats cache before every request.")
+        parser.add_argument(
+            "--read-paths", action="store_true", help="Also compare the serializer and the fast list paths."
+        )
+        parser.add_argument("--username", default="admin", help="User whose token authenticates the requests.")
+        parser.add_argument(
+            "--output", type=Path, default=Path("benchmark-results.json"), help="File where the run is written."
+        )
+        parser.add_argument("--baseline", type=Path, help="Previous run to compare against.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2, help="Tolerated latency and memory growth, 0.2 meaning 20%%."
+        )
+        parser.add_argument(
+            "--fail-on-regression", action="store_true", help="Exit with an error when any metric regresses."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command.
+        Raises:
+            CommandError: Raised when the user or the baseline does not exist, or when a metric regresses and
+            --fail-on-regression is set.
+        """
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"User {options['username']} does not exist.")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        host = next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"), "localhost")
+        client = APIClient(HTTP_HOST=host)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        results = run_benchmarks(client, options["iterations"], options["warmup"], options["cold_cache"])
+        if options["read_paths"]:
+            results["read_paths"] = compare_read_paths(client, options["iterations"], options["warmup"])
+        options["output"].write_text(json.dumps(results, indent=2))
+        for name, metrics in results["endpoints"].items():
+            self.stdout.write(
+                f"{name}: status {metrics['status']}, p50 {metrics['p50_ms']}ms, p95 {metrics['p95_ms']}ms, "
+                f"{metrics['queries']} queries, {metrics['peak_memory_kb']}KB"
+            )
+        for name, timings in results.get("read_paths", {}).items():
+            self.stdout.write(
+                f"{name}: serializer {timings['serializer_p50_ms']}ms, fast {timings['fast_p50_ms']}ms, "
+                f"speedup {timings['speedup']}x"
+            )
+        self.stdout.write(f"Results written to {options['output']}.")
+        if not options["baseline"]:
+            return
+        if not options["baseline"].is_file():
+            raise CommandError(f"Baseline {options['baseline']} does not exist.")
+        regressions = compare_results(results, json.loads(options["baseline"].read_text()), options["threshold"])
+        for regression in regressions:
+            self.stderr.write(f"Regression {regression}")
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regressed metrics against {options['baseline']}.")
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regression against the baseline."))
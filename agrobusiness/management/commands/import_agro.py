@@ -0,0 +1,143 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from agrobusiness.bulk import (
+    validate_customer_rows,
+    validate_farm_rows,
+    validate_planting_rows,
+    write_customers,
+    write_farms,
+    write_plantings,
+)
+from agrobusiness.models import Customer
+
+DOCUMENT_CACHE_SIZE = 100000
+
+
+def read_rows(path: Path, file_format: str) -> Iterator[Dict[str, Any]]:
+    """Function responsible to stream the rows of a CSV or NDJSON file, one at a time.
+    Args:
+        path (Path): Receives the file path.
+        file_format (str): Receives the file format, csv or ndjson.
+    Raises:
+        CommandError: Raised when a NDJSON line is not a valid JSON.
+    Yields:
+        Iterator[Dict[str, Any]]: Return the rows of the file.
+    """
+    with path.open(encoding="utf-8", newline="") as stream:
+        if file_format == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise CommandError(f"NDJSON parse error on line {line_number} - {error}")
+
+
+class Command(BaseCommand):
+    """Command class to import large CSV/NDJSON files of customers, farms or plantings with constant memory"""
+
+    help = (
+        "Import customers, farms or plantings from a CSV or NDJSON file, validating and writing by batches. "
+        "Farm rows may reference the customer by id (customer) or by document (customer_document)."
+    )
+
+    loaders: Dict[str, Tuple[Callable[..., Any], Callable[..., Any]]] = {
+        "customer": (validate_customer_rows, write_customers),
+        "farm": (validate_farm_rows, write_farms),
+        "planting": (validate_planting_rows, write_plantings),
+    }
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Function responsible to register the command arguments.
+        Args:
+            parser (CommandParser): Receives the command argument parser.
+        """
+        parser.add_argument("model", choices=sorted(self.loaders), help="Model of the rows to be imported.")
+        parser.add_argument("path", type=Path, help="Path of the CSV or NDJSON file.")
+        parser.add_argument(
+            "--format", dest="file_format", choices=["csv", "ndjson"], help="File format, taken from the extension."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.BULK_BATCH_SIZE, help="Rows validated and written per batch."
+        )
+        parser.add_argument(
+            "--resume", action="store_true", help="Skip the rows already committed by a previous interrupted run."
+        )
+
+    def resolve_customer_documents(self, rows: List[Any]) -> None:
+        """Function responsible to replace the customer_document of the farm rows by the customer id, using an
+        in-memory map filled with one query per batch.
+        Args:
+            rows (List[Any]): Receives the farm rows of the batch, updated in place.
+        """
+        documents = {
+            row["customer_document"]
+            for row in rows
+            if isinstance(row, dict) and row.get("customer_document") and not row.get("customer")
+        }
+        missing = documents - self.customer_ids.keys()
+        if missing:
+            if len(self.customer_ids) > DOCUMENT_CACHE_SIZE:
+                self.customer_ids.clear()
+            self.customer_ids.update(
+                Customer.objects.filter(personal_document__in=missing).values_list("personal_document", "id")
+            )
+        for row in rows:
+            if isinstance(row, dict) and row.get("customer_document") and not row.get("customer"):
+                row["customer"] = self.customer_ids.get(row["customer_document"], "")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command.
+        Raises:
+            CommandError: Raised when the file does not exist or its format is unknown.
+        """
+        path: Path = options["path"]
+        if not path.is_file():
+            raise CommandError(f"File {path} does not exist.")
+        file_format = options["file_format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("csv", "ndjson"):
+            raise CommandError("Unknown file format, use --format csv or --format ndjson.")
+        validate_rows, write_rows = self.loaders[options["model"]]
+        batch_size = options["batch_size"]
+        checkpoint = path.with_name(f"{path.name}.checkpoint")
+        skipped = int(checkpoint.read_text()) if options["resume"] and checkpoint.exists() else 0
+        self.customer_ids: Dict[str, Any] = {}
+        totals = {"created": 0, "updated": 0, "errors": 0}
+        position = skipped
+        started = time.monotonic()
+        rows = islice(read_rows(path, file_format), skipped, None)
+        while batch := list(islice(rows, batch_size)):
+            if options["model"] == "farm":
+                self.resolve_customer_documents(batch)
+            objs, errors = validate_rows(batch)
+            for error in errors:
+                self.stderr.write(f"Row {position + error['row'] + 1}: {error['errors']}")
+            result = write_rows(objs, batch_size=batch_size) if objs else {"created": 0, "updated": 0}
+            position += len(batch)
+            checkpoint.write_text(str(position))
+            totals["created"] += result["created"]
+            totals["updated"] += result["updated"]
+            totals["errors"] += len(errors)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{position} rows processed.")
+        checkpoint.unlink(missing_ok=True)
+        elapsed = time.monotonic() - started
+        processed = position - skipped
+        rate = processed / elapsed if elapsed else processed
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{processed} rows processed in {elapsed:.2f}s ({rate:.0f} rows/s): {totals['created']} created, "
+                f"{totals['updated']} updated, {totals['errors']} invalid."
+            )
+        )
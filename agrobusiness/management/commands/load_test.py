@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from agrobusiness.loadtest import LOAD_TEST_ENDPOINTS, run_load_test
+
+
+class Command(BaseCommand):
+    """Command class to load the sync deployment and the async views with concurrent clients and compare them"""
+
+    help = (
+        "Send the same concurrent requests to the lists and stats of the WSGI deployment and to their async "
+        "versions on the ASGI deployment, recording the throughput and p50/p95/p99 latency of both on a JSON file."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Function responsible to register the command arguments.
+        Args:
+            parser (CommandParser): Receives the command argument parser.
+        """
+        parser.add_argument(
+            "--sync-url", default="http://localhost:8000", help="Base url of the WSGI deployment (gunicorn)."
+        )
+        parser.add_argument(
+            "--async-url", default="http://localhost:8001", help="Base url of the ASGI deployment (core.asgi)."
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and deployment.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients.")
+        parser.add_argument("--timeout", type=float, default=30, help="Timeout of each request, in seconds.")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=list(LOAD_TEST_ENDPOINTS),
+            help="Endpoint to be loaded, may be repeated. Defaults to every endpoint.",
+        )
+        parser.add_argument("--username", default="admin", help="User whose token authenticates the requests.")
+        parser.add_argument(
+            "--output", type=Path, default=Path("load-test-results.json"), help="File where the run is written."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command.
+        Raises:
+            CommandError: Raised when the user does not exist, or an url or the load settings are not valid.
+        """
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"User {options['username']} does not exist.")
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+        for option in ("sync_url", "async_url"):
+            if urlparse(options[option]).scheme not in ("http", "https"):
+                raise CommandError(f"--{option.replace('_', '-')} must be an http or https url.")
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        results = run_load_test(
+            options["sync_url"],
+            options["async_url"],
+            headers,
+            options["requests"],
+            options["concurrency"],
+            endpoints=options["endpoint"],
+            timeout=options["timeout"],
+        )
+        options["output"].write_text(json.dumps(results, indent=2))
+        for name, metrics in results["endpoints"].items():
+            for mode in ("sync", "async"):
+                self.stdout.write(
+                    f"{name} {mode}: {metrics[mode]['throughput_rps']} req/s, p50 {metrics[mode]['p50_ms']}ms, "
+                    f"p95 {metrics[mode]['p95_ms']}ms, {metrics[mode]['errors']} errors"
+                )
+            self.stdout.write(f"{name}: async throughput {metrics['throughput_ratio']}x the sync one")
+        self.stdout.write(f"Results written to {options['output']}.")
@@ -0,0 +1,17 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from agrobusiness.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    """Command class to delete the sync tombstones older than SYNC_TOMBSTONE_DAYS"""
+
+    help = "Delete the sync tombstones older than SYNC_TOMBSTONE_DAYS, whose sync cursors already answer 410."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command."""
+        deleted = prune_tombstones(settings.SYNC_TOMBSTONE_DAYS)
+        self.stdout.write(self.style.SUCCESS(f"{deleted} tombstones deleted."))
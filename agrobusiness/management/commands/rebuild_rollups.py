@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from agrobusiness.rollups import rebuild_rollups, verify_rollups
+
+
+class Command(BaseCommand):
+    """Command class to rebuild the stats rollup tables and verify them against the raw tables"""
+
+    help = "Rebuild the state and plant name rollups from the raw tables and verify them."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Function responsible to register the command arguments.
+        Args:
+            parser (CommandParser): Receives the command argument parser.
+        """
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Only compare the rollups against the raw tables, without rebuilding them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command.
+        Raises:
+            CommandError: Raised when the rollups diverge from the raw tables.
+        """
+        if not options["verify_only"]:
+            rebuild_rollups()
+            self.stdout.write("Rollups rebuilt.")
+        errors = verify_rollups()
+        for error in errors:
+            self.stderr.write(error)
+        if errors:
+            raise CommandError(f"{len(errors)} divergent rollup values found.")
+        self.stdout.write(self.style.SUCCESS("Rollups verified."))
@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from agrobusiness.synthetic import populate
+
+
+class Command(BaseCommand):
+    """Command class to fill the database with reproducible synthetic customers, farms and plantings"""
+
+    help = (
+        "Generate seeded synthetic customers, farms and plantings, with valid CPF/CNPJ documents spread over the "
+        "registered states, to benchmark the API."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Function responsible to register the command arguments.
+        Args:
+            parser (CommandParser): Receives the command argument parser.
+        """
+        parser.add_argument(
+            "--size", type=int, default=10000, help="Rows of each model, such as 10000, 100000 or 1000000."
+        )
+        parser.add_argument("--customers", type=int, help="Number of customers, overriding --size.")
+        parser.add_argument("--farms", type=int, help="Number of farms, overriding --size.")
+        parser.add_argument("--plantings", type=int, help="Number of plantings, overriding --size.")
+        parser.add_argument("--seed", type=int, default=42, help="Generator seed, the same seed builds the same rows.")
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.BULK_BATCH_SIZE, help="Rows written by each INSERT."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Function responsible to execute the command.
+        Raises:
+            CommandError: Raised when the data can not be generated.
+        """
+        size = options["size"]
+        counts = {
+            name: size if options[name] is None else options[name] for name in ["customers", "farms", "plantings"]
+        }
+        try:
+            written = populate(**counts, seed=options["seed"], batch_size=options["batch_size"])
+        except ValueError as error:
+            raise CommandError(str(error))
+        summary = ", ".join(f"{total} {name}" for name, total in written.items())
+        self.stdout.write(self.style.SUCCESS(f"Synthetic data generated: {summary}."))
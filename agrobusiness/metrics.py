@@ -0,0 +1,213 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+
+MODEL_ROWS_KEY = "metrics:model_rows"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_HELP = {
+    "agro_request_duration_seconds": ("histogram", "Request latency by viewset action."),
+    "agro_db_queries_total": ("counter", "Database queries run by viewset action."),
+    "agro_db_query_seconds_total": ("counter", "Time spent on database queries by viewset action."),
+    "agro_stats_cache_requests_total": ("counter", "Stats endpoint requests by cache result."),
+    "agro_model_rows": ("gauge", "Stored rows by model."),
+}
+
+
+def _label_key(labels: Dict[str, str]) -> str:
+    """Private function created to serialize the labels of a sample, so the same labels always give the same key.
+    Args:
+        labels (Dict[str, str]): Receives the sample labels.
+    Returns:
+        str: Return the labels as a JSON list of pairs.
+    """
+    return json.dumps(sorted(labels.items()))
+
+
+class MetricsStore:
+    """File-backed metrics store class. Each process keeps its counters and histograms in memory and writes them,
+    at most once per flush interval, to its own file of the metrics directory, so the processes never write to
+    the same file. The scrape merges the files of every process."""
+
+    def __init__(self, directory: str, flush_interval: float) -> None:
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.path = self.directory / f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self.counters: Dict[str, Dict[str, float]] = {}
+        self.histograms: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+        self.flushed_at = 0.0
+        self.dirty = False
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1) -> None:
+        """Function responsible to increase a counter.
+        Args:
+            name (str): Receives the metric name.
+            labels (Dict[str, str]): Receives the sample labels.
+            value (float, optional): Receives the increment. Defaults to 1.
+        """
+        key = _label_key(labels)
+        with self.lock:
+            samples = self.counters.setdefault(name, {})
+            samples[key] = samples.get(key, 0) + value
+            self.dirty = True
+        self.maybe_flush()
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Function responsible to add an observation to a histogram, with the LATENCY_BUCKETS.
+        Args:
+            name (str): Receives the metric name.
+            labels (Dict[str, str]): Receives the sample labels.
+            value (float): Receives the observed value, in seconds.
+        """
+        key = _label_key(labels)
+        with self.lock:
+            sample = self.histograms.setdefault(name, {}).setdefault(
+                key, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    sample["buckets"][position] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+            self.dirty = True
+        self.maybe_flush()
+
+    def maybe_flush(self) -> None:
+        """Function responsible to write the process file when the flush interval has passed."""
+        if time.monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Function responsible to write the process file, replacing it atomically, so a scrape never reads a
+        partial file."""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps({"counters": self.counters, "histograms": self.histograms}))
+            os.replace(temporary, self.path)
+            self.dirty = False
+            self.flushed_at = time.monotonic()
+
+    def collect(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, Dict[str, Any]]]]:
+        """Function responsible to merge the files written by every process, after flushing the current one.
+        Returns:
+            Tuple[Dict, Dict]: Return the merged counters and histograms, by metric name and label key.
+        """
+        self.flush()
+        counters: Dict[str, Dict[str, float]] = {}
+        histograms: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for path in self.directory.glob("metrics-*.json"):
+            try:
+                content = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, samples in content.get("counters", {}).items():
+                merged = counters.setdefault(name, {})
+                for key, value in samples.items():
+                    merged[key] = merged.get(key, 0) + value
+            for name, samples in content.get("histograms", {}).items():
+                merged_histograms = histograms.setdefault(name, {})
+                for key, sample in samples.items():
+                    total = merged_histograms.setdefault(
+                        key, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+                    )
+                    total["buckets"] = [left + right for left, right in zip(total["buckets"], sample["buckets"])]
+                    total["sum"] += sample["sum"]
+                    total["count"] += sample["count"]
+        return counters, histograms
+
+
+_store: Optional[MetricsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """Function responsible to return the metrics store of the process, created once, on the first use, with the
+    METRICS_DIR and METRICS_FLUSH_INTERVAL settings, and flushed when the process exits.
+    Returns:
+        MetricsStore: Return the store of the process.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetricsStore(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+            atexit.register(_store.flush)
+        return _store
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    """Private function created to format the labels of a sample on the Prometheus text format.
+    Args:
+        labels (Iterable[Tuple[str, str]]): Receives the label pairs.
+    Returns:
+        str: Return the formatted labels, empty when there is none.
+    """
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}" if escaped else ""
+
+
+def _header(name: str) -> List[str]:
+    """Private function created to build the HELP and TYPE lines of a metric.
+    Args:
+        name (str): Receives the metric name.
+    Returns:
+        List[str]: Return the two lines.
+    """
+    metric_type, description = METRIC_HELP.get(name, ("untyped", name))
+    return [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+
+
+def model_row_gauges() -> Dict[str, Dict[str, float]]:
+    """Function responsible to count the stored rows of each model, read by the scrape. The counts are kept on the
+    stats cache for METRICS_ROWS_CACHE_TTL seconds, so the scrapes of every worker inside that interval share them
+    instead of running one COUNT(*) per model each.
+    Returns:
+        Dict[str, Dict[str, float]]: Return the agro_model_rows gauge, by label key.
+    """
+    cache = caches[settings.STATS_CACHE_ALIAS]
+    rows = cache.get(MODEL_ROWS_KEY)
+    if rows is None:
+        models = [State, Customer, FarmProperty, PlantingType]
+        rows = {_label_key({"model": model._meta.model_name}): model.objects.count() for model in models}
+        cache.set(MODEL_ROWS_KEY, rows, settings.METRICS_ROWS_CACHE_TTL)
+    return {"agro_model_rows": rows}
+
+
+def render_metrics() -> str:
+    """Function responsible to render the metrics of every process, plus the row counts read by the scrape, on the
+    Prometheus text exposition format.
+    Returns:
+        str: Return the metrics text.
+    """
+    counters, histograms = get_metrics_store().collect()
+    gauges = model_row_gauges()
+    lines: List[str] = []
+    for name, samples in sorted({**counters, **gauges}.items()):
+        lines.extend(_header(name))
+        for key, value in sorted(samples.items()):
+            lines.append(f"{name}{_format_labels(json.loads(key))} {value}")
+    for name, histogram_samples in sorted(histograms.items()):
+        lines.extend(_header(name))
+        for key, sample in sorted(histogram_samples.items()):
+            labels = json.loads(key)
+            for bound, count in zip(LATENCY_BUCKETS, sample["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels([*labels, ('le', str(bound))])} {count}")
+            lines.append(f"{name}_bucket{_format_labels([*labels, ('le', '+Inf')])} {sample['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {sample['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,114 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:16
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_rollups(apps, schema_editor):
+    """Function responsible to fill the rollup tables with the data already registered."""
+    FarmProperty = apps.get_model("agrobusiness", "FarmProperty")
+    PlantingType = apps.get_model("agrobusiness", "PlantingType")
+    StateFarmStats = apps.get_model("agrobusiness", "StateFarmStats")
+    PlantingTypeStats = apps.get_model("agrobusiness", "PlantingTypeStats")
+    farm_rows = (
+        FarmProperty.objects.values("state")
+        .annotate(
+            farms_total=Count("id"),
+            area_total=Sum("area"),
+            farming_area_total=Sum("farming_area"),
+            plant_area_total=Sum("plant_area"),
+        )
+        .order_by()
+    )
+    StateFarmStats.objects.bulk_create(
+        [
+            StateFarmStats(
+                state_id=row["state"],
+                farms_total=row["farms_total"],
+                area_total=row["area_total"],
+                farming_area_total=row["farming_area_total"],
+                plant_area_total=row["plant_area_total"],
+            )
+            for row in farm_rows
+        ]
+    )
+    planting_rows = PlantingType.objects.values("plant_name").annotate(cultivation_total=Count("id")).order_by()
+    PlantingTypeStats.objects.bulk_create([PlantingTypeStats(**row) for row in planting_rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agrobusiness", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlantingTypeStats",
+            fields=[
+                (
+                    "plant_name",
+                    models.CharField(help_text="Tipo de cultivo", max_length=128, primary_key=True, serialize=False),
+                ),
+                ("cultivation_total", models.PositiveIntegerField(default=0, help_text="Quantidade de cultivos")),
+            ],
+            options={
+                "verbose_name": "Planting Type Stats",
+                "verbose_name_plural": "Planting Type Stats",
+                "db_table": "planting_type_stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="StateFarmStats",
+            fields=[
+                (
+                    "state",
+                    models.OneToOneField(
+                        help_text="Campo relacional do estado",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="farm_stats",
+                        serialize=False,
+                        to="agrobusiness.state",
+                    ),
+                ),
+                ("farms_total", models.PositiveIntegerField(default=0, help_text="Quantidade de fazendas do estado")),
+                (
+                    "area_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Área total em hectares das fazendas",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "farming_area_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Área agricultável em hectares",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "plant_area_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Área de vegetação em hectares",
+                        max_digits=14,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "State Farm Stats",
+                "verbose_name_plural": "State Farm Stats",
+                "db_table": "state_farm_stats",
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
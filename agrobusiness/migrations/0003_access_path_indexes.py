@@ -0,0 +1,50 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agrobusiness", "0002_stats_rollups"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="state",
+            name="acronym",
+            field=models.CharField(help_text="Sigla do estado", max_length=2, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(fields=["-created_at", "-id"], name="customer_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farmproperty",
+            index=models.Index(fields=["-created_at", "-id"], name="farm_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farmproperty",
+            index=models.Index(fields=["state", "created_at"], name="farm_state_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farmproperty",
+            index=models.Index(fields=["customer", "created_at"], name="farm_customer_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farmproperty",
+            index=models.Index(fields=["city"], name="farm_city_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="plantingtype",
+            index=models.Index(fields=["-created_at", "-id"], name="planting_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="plantingtype",
+            index=models.Index(fields=["farm", "plant_name"], name="planting_farm_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="plantingtype",
+            index=models.Index(fields=["plant_name"], name="planting_name_idx"),
+        ),
+    ]
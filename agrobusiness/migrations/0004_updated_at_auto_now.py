@@ -0,0 +1,28 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agrobusiness", "0003_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="farmproperty",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="plantingtype",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:50
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agrobusiness", "0004_updated_at_auto_now"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("model", models.CharField(help_text="Nome do modelo da linha removida", max_length=32)),
+                ("object_id", models.UUIDField(help_text="Id da linha removida")),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "Tombstones",
+                "db_table": "tombstone",
+                "ordering": ["deleted_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(fields=["updated_at", "id"], name="customer_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="farmproperty",
+            index=models.Index(fields=["updated_at", "id"], name="farm_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="plantingtype",
+            index=models.Index(fields=["updated_at", "id"], name="planting_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-18 16:02
+
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations
+
+# Trigram indexes of the searched columns, on the same expression of the search filter
+SEARCH_INDEXES = {
+    "customer_document_search_idx": ("customer", "personal_document"),
+    "customer_name_search_idx": ("customer", "name"),
+    "farm_name_search_idx": ("farm_property", "name"),
+    "farm_city_search_idx": ("farm_property", "city"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    """Function responsible to create the immutable unaccent function and the trigram indexes on Postgres. The
+    other databases search without indexes."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION agro_unaccent(text) RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    for name, (table, column) in SEARCH_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (agro_unaccent(lower("{column}")) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    """Function responsible to drop the trigram indexes and the unaccent function on Postgres."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    schema_editor.execute("DROP FUNCTION IF EXISTS agro_unaccent(text)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agrobusiness", "0005_sync_tombstones"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
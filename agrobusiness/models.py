@@ -1,16 +1,50 @@
 import uuid
 from decimal import Decimal
+from typing import Optional
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django_cpf_cnpj.fields import CNPJ, CPF
 
 
+def validate_personal_document(personal_document: str) -> None:
+    """Function responsible to validate the personal document of a customer, shared by the model and the bulk loader.
+    Args:
+        personal_document (str): Receives the CPF or CNPJ document.
+    Raises:
+        ValidationError: Raised when the document is neither a valid CPF nor a valid CNPJ.
+    """
+    if not CPF(personal_document).is_valid() and not CNPJ(personal_document).is_valid():
+        raise ValidationError("Tipo de documento CPF/CNPJ invalido!")
+
+
+def validate_farm_areas(area: Optional[Decimal], farming_area: Decimal, plant_area: Decimal) -> None:
+    """Function responsible to validate the area business rule of a farm, shared by the model and the bulk loader.
+    Args:
+        area (Decimal): Receives the total area of the farm.
+        farming_area (Decimal): Receives the farming area of the farm.
+        plant_area (Decimal): Receives the vegetation area of the farm.
+    Raises:
+        ValidationError: Raised when area is missing, when farming_area or plant_area is greater than area, or
+        when their sum is greater than area.
+    """
+    if not area:
+        raise ValidationError("Necessario cadastrar área da propriedade.")
+    elif farming_area > area:
+        raise ValidationError("Área agricultavél maior que a área da propriedade.")
+    elif plant_area > area:
+        raise ValidationError("Área da vegetação maior que a área da propriedade.")
+    elif plant_area and farming_area and (plant_area + farming_area) > area:
+        raise ValidationError(
+            "A área agrícultável e área de vegetação somadas, não deve ser maior que a área total da fazenda."
+        )
+
+
 class State(models.Model):
     """State Model class"""
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    acronym = models.CharField(max_length=2, null=False, blank=False, help_text="Sigla do estado")
+    acronym = models.CharField(max_length=2, unique=True, null=False, blank=False, help_text="Sigla do estado")
     name = models.CharField(max_length=64, null=False, blank=False, help_text="Nome do estado")
 
     class Meta:
@@ -36,13 +70,17 @@ class Customer(models.Model):
     )
     name = models.CharField(max_length=256, null=False, blank=False, help_text="Nome do produtor")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Customter"
         verbose_name_plural = "Customers"
         db_table = "customer"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="customer_created_idx"),
+            models.Index(fields=["updated_at", "id"], name="customer_updated_idx"),
+        ]
 
     def clean(self) -> None:
         """Data treatment function of the model class, created to validate contexts before the save method.
@@ -50,9 +88,7 @@ class Customer(models.Model):
             ValidationError: Validation related to the business rule of the model itself. In this case,
             validating the personal_document field.
         """
-        personal_document = getattr(self, "personal_document")
-        if not CPF(personal_document).is_valid() and not CNPJ(personal_document).is_valid():
-            raise ValidationError("Tipo de documento CPF/CNPJ invalido!")
+        validate_personal_document(getattr(self, "personal_document"))
         return super().clean()
 
     def __str__(self) -> str:
@@ -100,7 +136,7 @@ class FarmProperty(models.Model):
         max_digits=5, decimal_places=2, null=False, blank=False, help_text="Área de vegetação em hectares"
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def clean(self) -> None:
         """Data treatment function of the model class, created to validate contexts before the save method.
@@ -114,19 +150,7 @@ class FarmProperty(models.Model):
             ValidationError: Validation related to the business rule of the model itself. In this case. In this case,
             if the sum of farming_area and plant_area is greater than area.
         """
-        area = getattr(self, "area")
-        farming_area = getattr(self, "farming_area")
-        plant_area = getattr(self, "plant_area")
-        if not area:
-            raise ValidationError("Necessario cadastrar área da propriedade.")
-        elif farming_area > area:
-            raise ValidationError("Área agricultavél maior que a área da propriedade.")
-        elif plant_area > area:
-            raise ValidationError("Área da vegetação maior que a área da propriedade.")
-        elif plant_area and farming_area and (plant_area + farming_area) > area:
-            raise ValidationError(
-                "A área agrícultável e área de vegetação somadas, não deve ser maior que a área total da fazenda."
-            )
+        validate_farm_areas(getattr(self, "area"), getattr(self, "farming_area"), getattr(self, "plant_area"))
         return super().clean()
 
     class Meta:
@@ -134,6 +158,13 @@ class FarmProperty(models.Model):
         verbose_name_plural = "Farm Properties"
         db_table = "farm_property"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="farm_created_idx"),
+            models.Index(fields=["state", "created_at"], name="farm_state_created_idx"),
+            models.Index(fields=["customer", "created_at"], name="farm_customer_created_idx"),
+            models.Index(fields=["city"], name="farm_city_idx"),
+            models.Index(fields=["updated_at", "id"], name="farm_updated_idx"),
+        ]
 
     @property
     def agricultal_land(self) -> Decimal:
@@ -151,9 +182,11 @@ class FarmProperty(models.Model):
         return self.name
 
     def save(self, **kwargs) -> None:
-        """Save function overwritten, adding field validation before the data is recorded."""
+        """Save function overwritten, adding field validation before the data is recorded. The row and the state
+        rollups moved by its signals are written in one transaction."""
         self.clean()
-        return super().save(**kwargs)
+        with transaction.atomic():
+            return super().save(**kwargs)
 
 
 class PlantingType(models.Model):
@@ -170,13 +203,19 @@ class PlantingType(models.Model):
         help_text="Campo relacional de cultivo da fazenda",
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Planting Type"
         verbose_name_plural = "Planting Types"
         db_table = "planting_type"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="planting_created_idx"),
+            models.Index(fields=["farm", "plant_name"], name="planting_farm_name_idx"),
+            models.Index(fields=["plant_name"], name="planting_name_idx"),
+            models.Index(fields=["updated_at", "id"], name="planting_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         """Frivate function of the class, overridden, to create a readable representation of the class.
@@ -184,3 +223,86 @@ class PlantingType(models.Model):
             str: Return the readable representation refernce for the class.
         """
         return f"{self.farm.name}|{self.plant_name}"
+
+    def save(self, **kwargs) -> None:
+        """Save function overwritten, writing the row and the plant name rollups moved by its signals in one
+        transaction."""
+        with transaction.atomic():
+            return super().save(**kwargs)
+
+
+class StateFarmStats(models.Model):
+    """StateFarmStats Model class, the farm rollup of each state kept up to date by the FarmProperty signals"""
+
+    state = models.OneToOneField(
+        State,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="farm_stats",
+        help_text="Campo relacional do estado",
+    )
+    farms_total = models.PositiveIntegerField(default=0, help_text="Quantidade de fazendas do estado")
+    area_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Área total em hectares das fazendas"
+    )
+    farming_area_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Área agricultável em hectares"
+    )
+    plant_area_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), help_text="Área de vegetação em hectares"
+    )
+
+    class Meta:
+        verbose_name = "State Farm Stats"
+        verbose_name_plural = "State Farm Stats"
+        db_table = "state_farm_stats"
+
+    def __str__(self) -> str:
+        """Frivate function of the class, overridden, to create a readable representation of the class.
+        Returns:
+            str: Return the readable representation refernce for the class.
+        """
+        return f"{self.state_id}|{self.farms_total}"
+
+
+class PlantingTypeStats(models.Model):
+    """PlantingTypeStats Model class, the cultivation rollup of each plant name kept up to date by the
+    PlantingType signals"""
+
+    plant_name = models.CharField(max_length=128, primary_key=True, help_text="Tipo de cultivo")
+    cultivation_total = models.PositiveIntegerField(default=0, help_text="Quantidade de cultivos")
+
+    class Meta:
+        verbose_name = "Planting Type Stats"
+        verbose_name_plural = "Planting Type Stats"
+        db_table = "planting_type_stats"
+
+    def __str__(self) -> str:
+        """Frivate function of the class, overridden, to create a readable representation of the class.
+        Returns:
+            str: Return the readable representation refernce for the class.
+        """
+        return f"{self.plant_name}|{self.cultivation_total}"
+
+
+class Tombstone(models.Model):
+    """Tombstone Model class, recording each deleted customer, farm and planting for the delta sync"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.CharField(max_length=32, help_text="Nome do modelo da linha removida")
+    object_id = models.UUIDField(help_text="Id da linha removida")
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Tombstone"
+        verbose_name_plural = "Tombstones"
+        db_table = "tombstone"
+        ordering = ["deleted_at"]
+        indexes = [models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_idx")]
+
+    def __str__(self) -> str:
+        """Frivate function of the class, overridden, to create a readable representation of the class.
+        Returns:
+            str: Return the readable representation refernce for the class.
+        """
+        return f"{self.model}|{self.object_id}"
@@ -0,0 +1,230 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CreatedAtCursorPagination(BasePagination):
+    """Keyset pagination class, walking the rows by the (-created_at, -id) ordering. The cursor holds the
+    position of the last row sent, so every page is read with an index range instead of an OFFSET."""
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self) -> None:
+        self.page_size = settings.API_PAGE_SIZE
+        self.base_url: Optional[str] = None
+        self.first_row: Optional[Any] = None
+        self.last_row: Optional[Any] = None
+        self.has_next = False
+        self.has_previous = False
+
+    def get_page_size(self, request: Request) -> int:
+        """Function responsible to return the page size asked by the client, limited by the max_page_size.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            int: Return the page size.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, row: Any, reverse: bool) -> str:
+        """Function responsible to build the cursor url of a row position.
+        Args:
+            row (Any): Receives the row whose position is stored on the cursor, a model instance or a values() dict.
+            reverse (bool): Receives if the cursor walks to the previous rows.
+        Returns:
+            str: Return the url with the cursor query param.
+        """
+        created_at, pk = (row["created_at"], row["id"]) if isinstance(row, dict) else (row.created_at, row.pk)
+        position = {"created_at": created_at.isoformat(), "id": str(pk), "reverse": reverse}
+        cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request: Request) -> Optional[Tuple[datetime, str, bool]]:
+        """Function responsible to read the cursor query param.
+        Args:
+            request (Request): Receives the DRF request.
+        Raises:
+            NotFound: Raised when the cursor can not be decoded.
+        Returns:
+            Optional[Tuple[datetime, str, bool]]: Return the created_at, id and direction of the cursor, or None
+            when the first page is asked.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return datetime.fromisoformat(position["created_at"]), str(position["id"]), bool(position["reverse"])
+        except (binascii.Error, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _page_queryset(
+        self, queryset: QuerySet[Any], request: Request
+    ) -> Tuple[QuerySet[Any], int, Optional[Tuple[datetime, str, bool]]]:
+        """Private function created to build the query of the page asked by the cursor, without reading it.
+        Args:
+            queryset (QuerySet): Receives the queryset of the list endpoint.
+            request (Request): Receives the DRF request.
+        Returns:
+            Tuple[QuerySet, int, Optional[Tuple[datetime, str, bool]]]: Return the queryset sliced to one row more
+            than the page, the page size and the decoded cursor.
+        """
+        page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+        if cursor:
+            created_at, pk = cursor[0], cursor[1]
+            if reverse:
+                queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            else:
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+        return queryset.order_by(*ordering)[: page_size + 1], page_size, cursor
+
+    def page_window(self, queryset: QuerySet[Any], request: Request) -> QuerySet[Any]:
+        """Function responsible to return the rows of the page asked by the cursor, plus the row which tells if
+        there is a next page, as an unsliced queryset, so they can be aggregated.
+        Args:
+            queryset (QuerySet): Receives the queryset of the list endpoint.
+            request (Request): Receives the DRF request.
+        Returns:
+            QuerySet: Return the queryset bounded to the page rows, not evaluated.
+        """
+        page_queryset, _, _ = self._page_queryset(queryset, request)
+        return queryset.model._default_manager.filter(pk__in=page_queryset.values("pk"))
+
+    def _set_page(self, rows: List[Any], page_size: int, cursor: Optional[Tuple[datetime, str, bool]]) -> List[Any]:
+        """Private function created to keep the rows of the page and the position of its navigation links.
+        Args:
+            rows (List[Any]): Receives the rows read by the page query.
+            page_size (int): Receives the page size.
+            cursor (Optional[Tuple[datetime, str, bool]]): Receives the decoded cursor.
+        Returns:
+            List[Any]: Return the rows of the page, on the (-created_at, -id) ordering.
+        """
+        reverse = bool(cursor and cursor[2])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = cursor is not None, has_more
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def paginate_queryset(self, queryset: QuerySet[Any], request: Request, view: Any = None) -> List[Any]:
+        """Function responsible to return the rows of the page asked by the cursor.
+        Args:
+            queryset (QuerySet): Receives the queryset of the list endpoint.
+            request (Request): Receives the DRF request.
+            view (Any, optional): Receives the viewset instance.
+        Returns:
+            List[Any]: Return the rows of the page.
+        """
+        page_queryset, page_size, cursor = self._page_queryset(queryset, request)
+        return self._set_page(list(page_queryset), page_size, cursor)
+
+    async def apaginate_queryset(self, queryset: QuerySet[Any], request: Request) -> List[Any]:
+        """Function responsible to return, by the async ORM, the rows of the page asked by the cursor.
+        Args:
+            queryset (QuerySet): Receives the queryset of the list endpoint.
+            request (Request): Receives the DRF request.
+        Returns:
+            List[Any]: Return the rows of the page.
+        """
+        page_queryset, page_size, cursor = self._page_queryset(queryset, request)
+        return self._set_page([row async for row in page_queryset], page_size, cursor)
+
+    def get_next_link(self) -> Optional[str]:
+        """Function responsible to return the url of the next page.
+        Returns:
+            Optional[str]: Return the url, or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        if self.last_row is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.last_row, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """Function responsible to return the url of the previous page.
+        Returns:
+            Optional[str]: Return the url, or None on the first page.
+        """
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_row, reverse=True)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """Function responsible to wrap the page data with the navigation links.
+        Args:
+            data (Any): Receives the serialized rows of the page.
+        Returns:
+            Response: Return the paginated response.
+        """
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Function responsible to describe the paginated response on the OpenAPI schema.
+        Args:
+            schema (Dict[str, Any]): Receives the schema of the rows.
+        Returns:
+            Dict[str, Any]: Return the schema of the paginated response.
+        """
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: Any) -> List[Dict[str, Any]]:
+        """Function responsible to describe the pagination query params on the OpenAPI schema.
+        Args:
+            view (Any): Receives the viewset instance.
+        Returns:
+            List[Dict[str, Any]]: Return the query params.
+        """
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results to return per page, up to {self.max_page_size}.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,86 @@
+from typing import Any, List, Mapping, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils import json
+
+from agrobusiness.renderers import FastJSONRenderer, orjson
+
+# orjson only decodes UTF-8, the other charsets are left to the json module
+_UTF8_CHARSETS = {"utf-8", "utf8"}
+
+
+def loads(content: bytes, encoding: str) -> Any:
+    """Function responsible to decode a JSON document with orjson when it is installed and with the json module when
+    it is not. Both reject NaN and Infinity, as the strict DRF parser does.
+    Args:
+        content (bytes): Receives the encoded document.
+        encoding (str): Receives the document charset.
+    Raises:
+        ValueError: Raised when the document is not a valid JSON.
+    Returns:
+        Any: Return the decoded document.
+    """
+    if orjson is not None and encoding.lower() in _UTF8_CHARSETS:
+        return orjson.loads(content)
+    return json.loads(content.decode(encoding), parse_constant=json.strict_constant)
+
+
+class FastJSONParser(JSONParser):
+    """JSON parser class, decoding the request body with orjson when it is installed and with the DRF parser when
+    it is not"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+        self, stream: Any, media_type: Optional[str] = None, parser_context: Optional[Mapping[str, Any]] = None
+    ) -> Any:
+        """Function responsible to parse the request body.
+        Args:
+            stream (Any): Receives the request body stream.
+            media_type (str, optional): Receives the request media type.
+            parser_context (Mapping[str, Any], optional): Receives the parser context.
+        Raises:
+            ParseError: Raised when the body is not a valid JSON.
+        Returns:
+            Any: Return the parsed body.
+        """
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower() not in _UTF8_CHARSETS:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as error:
+            raise ParseError(f"JSON parse error - {error}")
+
+
+class NDJSONParser(BaseParser):
+    """Parser class for newline delimited JSON bodies, returning one item per non-empty line"""
+
+    media_type = "application/x-ndjson"
+
+    def parse(
+        self, stream: Any, media_type: Optional[str] = None, parser_context: Optional[Mapping[str, Any]] = None
+    ) -> List[Any]:
+        """Function responsible to parse the request body, line by line.
+        Args:
+            stream (Any): Receives the request body stream.
+            media_type (str, optional): Receives the request media type.
+            parser_context (Mapping[str, Any], optional): Receives the parser context.
+        Raises:
+            ParseError: Raised when a line is not a valid JSON.
+        Returns:
+            List[Any]: Return the parsed items.
+        """
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        items = []
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(loads(line, encoding))
+            except ValueError as error:
+                raise ParseError(f"NDJSON parse error on line {line_number} - {error}")
+        return items
@@ -0,0 +1,25 @@
+import hmac
+from typing import Any
+
+from django.conf import settings
+from rest_framework import permissions
+from rest_framework.request import Request
+
+
+class MetricsTokenPermission(permissions.BasePermission):
+    """Permission class for the metrics scrape, which checks the static METRICS_TOKEN bearer token, since a
+    scraper can not refresh a JWT. Without METRICS_TOKEN the metrics are only open with MODE_DEBUG, and refused
+    otherwise, so a deploy which forgot the token does not expose them"""
+
+    def has_permission(self, request: Request, view: Any) -> bool:
+        """Function responsible to compare the bearer token of the request with the METRICS_TOKEN setting.
+        Args:
+            request (Request): Receives the DRF request.
+            view (Any): Receives the view instance.
+        Returns:
+            bool: Return True when the token matches, or when no token is configured and DEBUG is on.
+        """
+        if not settings.METRICS_TOKEN:
+            return settings.DEBUG
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        return hmac.compare_digest(header.encode(), f"Bearer {settings.METRICS_TOKEN}".encode())
@@ -0,0 +1,160 @@
+import decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from agrobusiness.expand import EXPAND_PARAM, REQUIRED_COLUMNS
+
+Formatter = Optional[Callable[[Any], Any]]
+
+_mappers: Dict[Tuple[type, Tuple[str, ...]], Optional["RowMapper"]] = {}
+
+
+def _decimal_formatter(field: drf_fields.DecimalField) -> Callable[[Any], Any]:
+    """Private function created to build the formatter of a decimal column, with the precision of the serializer
+    field computed once instead of on every value.
+    Args:
+        field (DecimalField): Receives the serializer field.
+    Returns:
+        Callable: Return the formatter, giving the same string as the serializer field.
+    """
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or not coerce_to_string or field.localize:
+        return field.to_representation
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def formatter(value: Any) -> str:
+        """Formatter function, quantizing the decimal to the field places."""
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return "{:f}".format(value.quantize(exponent, rounding=rounding, context=context))
+
+    return formatter
+
+
+def _column(serializer: serializers.ModelSerializer, field: drf_fields.Field) -> Optional[Tuple[str, Formatter]]:
+    """Private function created to map a serializer field to the values() lookup and the formatter of its column.
+    Args:
+        serializer (ModelSerializer): Receives the serializer which owns the field.
+        field (Field): Receives the serializer field.
+    Returns:
+        Optional[Tuple[str, Formatter]]: Return the lookup and the formatter, or None when the field can not be read
+        from a plain column, such as nested serializers and method fields.
+    """
+    model = serializer.Meta.model
+    if not field.source or "." in field.source or field.source == "*":
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete:
+        return None
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+        return model_field.attname, str
+    if isinstance(field, relations.SlugRelatedField):
+        return f"{field.source}__{field.slug_field}", None
+    if isinstance(field, (relations.RelatedField, serializers.BaseSerializer, drf_fields.SerializerMethodField)):
+        return None
+    if isinstance(field, drf_fields.UUIDField) and field.uuid_format == "hex_verbose":
+        return field.source, str
+    if isinstance(field, drf_fields.DecimalField):
+        return field.source, _decimal_formatter(field)
+    if type(field) is drf_fields.CharField:
+        return field.source, None
+    return field.source, field.to_representation
+
+
+class RowMapper:
+    """Row mapper class, turning values() rows into the same dicts the serializer builds, through a list of
+    column formatters compiled once per serializer and field set"""
+
+    def __init__(self, columns: List[Tuple[str, str, Formatter]]) -> None:
+        self.names = [name for name, _, _ in columns]
+        self.lookups = [lookup for _, lookup, _ in columns]
+        self.formatters = [formatter for _, _, formatter in columns]
+        self.values_lookups = list(dict.fromkeys([*self.lookups, *REQUIRED_COLUMNS]))
+
+    @classmethod
+    def for_serializer(cls, serializer: serializers.ModelSerializer) -> Optional["RowMapper"]:
+        """Function responsible to return the mapper of a serializer instance, built on its first use.
+        Args:
+            serializer (ModelSerializer): Receives the serializer, with its fields already filtered.
+        Returns:
+            Optional[RowMapper]: Return the mapper, or None when any field can not be read from a plain column.
+        """
+        readable = [(name, field) for name, field in serializer.fields.items() if not field.write_only]
+        key = (type(serializer), tuple(name for name, _ in readable))
+        if key not in _mappers:
+            columns = []
+            for name, field in readable:
+                column = _column(serializer, field)
+                if column is None:
+                    _mappers[key] = None
+                    return None
+                columns.append((name, *column))
+            _mappers[key] = cls(columns)
+        return _mappers[key]
+
+    def map_rows(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Function responsible to build the output of the values() rows.
+        Args:
+            rows (Iterable[Dict[str, Any]]): Receives the rows, keyed by lookup.
+        Returns:
+            List[Dict[str, Any]]: Return the rows, keyed by serializer field name.
+        """
+        columns = list(zip(self.names, self.lookups, self.formatters))
+        return [
+            {
+                name: row[lookup] if formatter is None or row[lookup] is None else formatter(row[lookup])
+                for name, lookup, formatter in columns
+            }
+            for row in rows
+        ]
+
+
+class FastListMixin:
+    """Viewset mixin class, answering the list action from values() rows and a RowMapper instead of serializer
+    instances. The requests which expand nested fields, and the serializers with fields that are not plain
+    columns, keep the serializer path. FAST_READ_ENABLED turns it off"""
+
+    def get_row_mapper(self, request: Request) -> Optional[RowMapper]:
+        """Function responsible to return the mapper of the list request, when it can be used.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Optional[RowMapper]: Return the mapper, or None to use the serializer.
+        """
+        if not settings.FAST_READ_ENABLED or request.query_params.get(EXPAND_PARAM):
+            return None
+        serializer = self.get_serializer()  # type: ignore[attr-defined]
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+        return RowMapper.for_serializer(serializer)
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Function responsible to list the rows, through the mapper when it can be used.
+        Args:
+            request (Request): Receives the DRF request.
+        Returns:
+            Response: Return the paginated rows.
+        """
+        mapper = self.get_row_mapper(request)
+        if mapper is None:
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        queryset = queryset.values(*mapper.values_lookups)
+        page = self.paginate_queryset(queryset)  # type: ignore[attr-defined]
+        if page is not None:
+            return self.get_paginated_response(mapper.map_rows(page))  # type: ignore[attr-defined]
+        return Response(mapper.map_rows(queryset))
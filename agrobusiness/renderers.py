@@ -0,0 +1,53 @@
+import re
+from typing import Any, Mapping, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+# The line and paragraph separators are escaped as DRF does, so the output stays a strict JavaScript subset
+_ESCAPED_SEPARATORS = [("\u2028".encode(), b"\\u2028"), ("\u2029".encode(), b"\\u2029")]
+# A float below 1e-4 or from 1e16 on, which the DRF encoder writes with an exponent, such as 2.5e-05 and 1e+16,
+# while orjson writes 0.000025 and 1e16. A string holding the same text only sends the response to the DRF renderer
+_EXPONENT_FLOAT = re.compile(rb"[:,\[]-?(?:[0-9]+(?:\.[0-9]+)?e[-+]?[0-9]+|0\.0000[0-9]*)[,\]}]")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer class, encoding the response with orjson when it is installed and with the DRF renderer when it
+    is not. The values orjson does not encode the same way, such as Decimal, datetime and lazy strings, go through the
+    DRF encoder, and a response with a float the DRF encoder writes with an exponent is rendered again by DRF, so
+    both backends give the same bytes. The exception are the NaN and infinite floats, which orjson renders as null
+    where the DRF renderer raises ValueError: telling them apart would take a walk over every response"""
+
+    option = 0 if orjson is None else orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(
+        self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[Mapping[str, Any]] = None
+    ) -> bytes:
+        """Function responsible to render the response data as JSON.
+        Args:
+            data (Any): Receives the response data.
+            accepted_media_type (str, optional): Receives the negotiated media type.
+            renderer_context (Mapping[str, Any], optional): Receives the renderer context.
+        Returns:
+            bytes: Return the encoded response.
+        """
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=self.encoder_class().default, option=self.option)
+        except orjson.JSONEncodeError:
+            # Non string keys, integers above 64 bits and the other values orjson refuses are left to the DRF renderer
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT_FLOAT.search(content):
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in _ESCAPED_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
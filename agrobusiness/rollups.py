@@ -0,0 +1,255 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
+
+from agrobusiness.aggregations import AREA_OUTPUT, add_percentage, area_sum
+from agrobusiness.models import FarmProperty, PlantingType, PlantingTypeStats, State, StateFarmStats
+
+STATE_STATS_FIELDS = ["farms_total", "area_total", "farming_area_total", "plant_area_total"]
+
+
+def _rollup_value(field_name: str, output_field: Any) -> Coalesce:
+    """Private function created to read a rollup field through the state relation, returning zero instead of NULL.
+    Args:
+        field_name (str): Receives the name of the StateFarmStats field.
+        output_field (Any): Receives the output field of the expression.
+    Returns:
+        Coalesce: Return the expression, ready to be used on annotate.
+    """
+    default = Value(0) if isinstance(output_field, IntegerField) else Value(Decimal("0.00"))
+    return Coalesce(F(f"farm_stats__{field_name}"), default, output_field=output_field)
+
+
+def apply_farm_delta(state_id: Any, farms: int, area: Decimal, farming_area: Decimal, plant_area: Decimal) -> None:
+    """Function responsible to apply, with an atomic UPDATE, a delta on the farm rollup of a state.
+    Args:
+        state_id (Any): Receives the primary key of the state.
+        farms (int): Receives the delta of the farm count.
+        area (Decimal): Receives the delta of the total area.
+        farming_area (Decimal): Receives the delta of the farming area.
+        plant_area (Decimal): Receives the delta of the vegetation area.
+    """
+    StateFarmStats.objects.get_or_create(state_id=state_id)
+    StateFarmStats.objects.filter(state_id=state_id).update(
+        farms_total=F("farms_total") + farms,
+        area_total=F("area_total") + area,
+        farming_area_total=F("farming_area_total") + farming_area,
+        plant_area_total=F("plant_area_total") + plant_area,
+    )
+
+
+def apply_planting_delta(plant_name: str, cultivations: int) -> None:
+    """Function responsible to apply, with an atomic UPDATE, a delta on the cultivation rollup of a plant name.
+    Args:
+        plant_name (str): Receives the plant name.
+        cultivations (int): Receives the delta of the cultivation count.
+    """
+    PlantingTypeStats.objects.get_or_create(plant_name=plant_name)
+    PlantingTypeStats.objects.filter(plant_name=plant_name).update(
+        cultivation_total=F("cultivation_total") + cultivations
+    )
+
+
+def _state_rollup_queryset() -> QuerySet[Any]:
+    """Private function created to build the query of the farm statistics of each state, from the rollup table.
+    Returns:
+        QuerySet: Return the values queryset, one row per state.
+    """
+    return (
+        State.objects.annotate(
+            farms_total=_rollup_value("farms_total", IntegerField()),
+            area_total=_rollup_value("area_total", AREA_OUTPUT),
+            farming_area_total=_rollup_value("farming_area_total", AREA_OUTPUT),
+            plant_area_total=_rollup_value("plant_area_total", AREA_OUTPUT),
+        )
+        .values("acronym", *STATE_STATS_FIELDS)
+        .order_by("acronym")
+    )
+
+
+def _farm_rollup_aggregates() -> Dict[str, Coalesce]:
+    """Private function created to build the aggregates of the farm count and area totals of every state.
+    Returns:
+        Dict[str, Coalesce]: Return the aggregates, by name.
+    """
+    return {
+        "farms_total": Coalesce(Sum("farms_total"), 0),
+        "area_total": area_sum("area_total"),
+        "farming_area_total": area_sum("farming_area_total"),
+        "plant_area_total": area_sum("plant_area_total"),
+    }
+
+
+def _planting_rollup_queryset() -> QuerySet[Any]:
+    """Private function created to build the query of the cultivation statistics of each plant name, from the
+    rollup table.
+    Returns:
+        QuerySet: Return the values queryset, one row per plant name.
+    """
+    return (
+        PlantingTypeStats.objects.filter(cultivation_total__gt=0)
+        .values("plant_name", "cultivation_total")
+        .order_by("-cultivation_total", "plant_name")
+    )
+
+
+def state_rollup_stats() -> List[Dict[str, Any]]:
+    """Function responsible to read the farm statistics of each state from the rollup table, with one query
+    over the states.
+    Returns:
+        List[Dict[str, Any]]: Return one row per state, on the same format of aggregations.state_farm_stats.
+    """
+    return add_percentage(list(_state_rollup_queryset()), "farms_total", "farm_percentage")
+
+
+async def astate_rollup_stats() -> List[Dict[str, Any]]:
+    """Function responsible to read, by the async ORM, the same rows as state_rollup_stats.
+    Returns:
+        List[Dict[str, Any]]: Return one row per state, on the same format of aggregations.state_farm_stats.
+    """
+    rows = [row async for row in _state_rollup_queryset()]
+    return add_percentage(rows, "farms_total", "farm_percentage")
+
+
+def farm_rollup_totals() -> Dict[str, Any]:
+    """Function responsible to read the farm count and area totals from the rollup table.
+    Returns:
+        Dict[str, Any]: Return the farm count and the total, farming and vegetation hectares.
+    """
+    return StateFarmStats.objects.aggregate(**_farm_rollup_aggregates())
+
+
+async def afarm_rollup_totals() -> Dict[str, Any]:
+    """Function responsible to read, by the async ORM, the same totals as farm_rollup_totals.
+    Returns:
+        Dict[str, Any]: Return the farm count and the total, farming and vegetation hectares.
+    """
+    return await StateFarmStats.objects.aaggregate(**_farm_rollup_aggregates())
+
+
+def planting_rollup_stats() -> List[Dict[str, Any]]:
+    """Function responsible to read the cultivation statistics of each plant name from the rollup table.
+    Returns:
+        List[Dict[str, Any]]: Return one row per plant name, on the same format of
+        aggregations.planting_type_stats.
+    """
+    return add_percentage(list(_planting_rollup_queryset()), "cultivation_total", "cultivation_percentage")
+
+
+async def aplanting_rollup_stats() -> List[Dict[str, Any]]:
+    """Function responsible to read, by the async ORM, the same rows as planting_rollup_stats.
+    Returns:
+        List[Dict[str, Any]]: Return one row per plant name, on the same format of
+        aggregations.planting_type_stats.
+    """
+    rows = [row async for row in _planting_rollup_queryset()]
+    return add_percentage(rows, "cultivation_total", "cultivation_percentage")
+
+
+def _raw_state_stats(state_ids: Optional[Iterable[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+    """Private function created to compute the farm rollup of each state from the farm_property table.
+    Args:
+        state_ids (Iterable[Any], optional): Receives the primary keys of the states to be computed. Defaults to
+        every state.
+    Returns:
+        Dict[Any, Dict[str, Any]]: Return the rollup values, by state primary key.
+    """
+    queryset = FarmProperty.objects.all()
+    if state_ids is not None:
+        queryset = queryset.filter(state__in=state_ids)
+    rows = queryset.values("state").annotate(
+        farms_total=Count("id"),
+        area_total=area_sum("area"),
+        farming_area_total=area_sum("farming_area"),
+        plant_area_total=area_sum("plant_area"),
+    )
+    return {row.pop("state"): row for row in rows.order_by()}
+
+
+def _raw_planting_stats(plant_names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Private function created to compute the cultivation rollup of each plant name from the planting_type table.
+    Args:
+        plant_names (Iterable[str], optional): Receives the plant names to be computed. Defaults to every plant name.
+    Returns:
+        Dict[str, int]: Return the cultivation count, by plant name.
+    """
+    queryset = PlantingType.objects.all()
+    if plant_names is not None:
+        queryset = queryset.filter(plant_name__in=plant_names)
+    rows = queryset.values("plant_name").annotate(cultivation_total=Count("id")).order_by()
+    return {row["plant_name"]: row["cultivation_total"] for row in rows}
+
+
+@transaction.atomic
+def rebuild_rollups() -> None:
+    """Function responsible to rebuild every rollup table from the raw tables."""
+    StateFarmStats.objects.all().delete()
+    PlantingTypeStats.objects.all().delete()
+    StateFarmStats.objects.bulk_create(
+        [StateFarmStats(state_id=state_id, **values) for state_id, values in _raw_state_stats().items()]
+    )
+    PlantingTypeStats.objects.bulk_create(
+        [
+            PlantingTypeStats(plant_name=plant_name, cultivation_total=total)
+            for plant_name, total in _raw_planting_stats().items()
+        ]
+    )
+
+
+@transaction.atomic
+def refresh_state_rollups(state_ids: Iterable[Any]) -> None:
+    """Function responsible to recompute the farm rollup of the given states, used after writes which skip the
+    model signals, such as bulk_create.
+    Args:
+        state_ids (Iterable[Any]): Receives the primary keys of the states to be recomputed.
+    """
+    state_ids = set(state_ids)
+    values = _raw_state_stats(state_ids)
+    for state_id in state_ids:
+        defaults = values.get(state_id, {field_name: 0 for field_name in STATE_STATS_FIELDS})
+        StateFarmStats.objects.update_or_create(state_id=state_id, defaults=defaults)
+
+
+@transaction.atomic
+def refresh_planting_rollups(plant_names: Iterable[str]) -> None:
+    """Function responsible to recompute the cultivation rollup of the given plant names, used after writes which
+    skip the model signals, such as bulk_create.
+    Args:
+        plant_names (Iterable[str]): Receives the plant names to be recomputed.
+    """
+    plant_names = set(plant_names)
+    values = _raw_planting_stats(plant_names)
+    for plant_name in plant_names:
+        PlantingTypeStats.objects.update_or_create(
+            plant_name=plant_name, defaults={"cultivation_total": values.get(plant_name, 0)}
+        )
+
+
+def verify_rollups() -> List[str]:
+    """Function responsible to compare every rollup table against the raw tables.
+    Returns:
+        List[str]: Return the description of each divergent row, empty when the rollups are consistent.
+    """
+    errors = []
+    expected_states = _raw_state_stats()
+    stored_states = {row.pop("state"): row for row in StateFarmStats.objects.values("state", *STATE_STATS_FIELDS)}
+    for state_id in expected_states.keys() | stored_states.keys():
+        expected = expected_states.get(state_id, {})
+        stored = stored_states.get(state_id, {})
+        for field_name in STATE_STATS_FIELDS:
+            if expected.get(field_name, 0) != stored.get(field_name, 0):
+                errors.append(
+                    f"state {state_id}: {field_name} is {stored.get(field_name, 0)}, "
+                    f"expected {expected.get(field_name, 0)}"
+                )
+    expected_plantings = _raw_planting_stats()
+    stored_plantings = dict(PlantingTypeStats.objects.values_list("plant_name", "cultivation_total"))
+    for plant_name in expected_plantings.keys() | stored_plantings.keys():
+        expected_total = expected_plantings.get(plant_name, 0)
+        stored_total = stored_plantings.get(plant_name, 0)
+        if expected_total != stored_total:
+            errors.append(f"plant {plant_name}: cultivation_total is {stored_total}, expected {expected_total}")
+    return errors
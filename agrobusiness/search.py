@@ -0,0 +1,87 @@
+import unicodedata
+from typing import Any, List, Optional, Type
+
+from django.db.models import F, Func, Model, Q, QuerySet, TextField
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains
+from django.utils.text import smart_split, unescape_string_literal
+
+# Immutable SQL function stripping the accents, created by the 0006 migration on Postgres, so the trigram indexes
+# can be built on it, and registered as the strip_accents python function on each SQLite connection
+UNACCENT_FUNCTION = "agro_unaccent"
+CUSTOMER_SEARCH_FIELDS = ["personal_document", "name"]
+FARM_SEARCH_FIELDS = ["name", "city", "customer__name"]
+
+
+class Unaccent(Func):
+    """Unaccent expression class, stripping the accents of a text by the UNACCENT_FUNCTION of the database"""
+
+    function = UNACCENT_FUNCTION
+    output_field = TextField()
+
+
+def strip_accents(value: Optional[str]) -> Optional[str]:
+    """Function responsible to strip the accents of a text, as the unaccent extension of Postgres does for the
+    latin letters, such as Ceará to Ceara. It is the UNACCENT_FUNCTION of the SQLite connections.
+    Args:
+        value (str, optional): Receives the text.
+    Returns:
+        str, optional: Return the text without the combining marks, or None for a NULL value.
+    """
+    if value is None:
+        return None
+    return "".join(char for char in unicodedata.normalize("NFKD", value) if not unicodedata.combining(char))
+
+
+def search_terms(search: str) -> List[str]:
+    """Function responsible to split a search as the admin does, keeping quoted phrases together, and normalize
+    each term as the indexed expression.
+    Args:
+        search (str): Receives the search text.
+    Returns:
+        List[str]: Return the lowered terms without accents.
+    """
+    terms = []
+    for term in smart_split(search):
+        if term.startswith(('"', "'")) and term[0] == term[-1]:
+            term = unescape_string_literal(term)
+        if term:
+            terms.append(strip_accents(term.lower()))
+    return terms
+
+
+def _term_rows(model: Type[Model], field_name: str, term: str) -> QuerySet[Any]:
+    """Private function created to select the primary keys of the rows whose field matches a term, through the
+    trigram index of the field. A field of a related model is matched by a subquery on that model, so its index
+    is used instead of a scan of the join.
+    Args:
+        model (Type[Model]): Receives the searched model.
+        field_name (str): Receives the field, such as name or customer__name.
+        term (str): Receives the normalized term.
+    Returns:
+        QuerySet: Return the primary keys of the matching rows, not evaluated.
+    """
+    relation, _, related_field = field_name.partition("__")
+    if related_field:
+        related_model = model._meta.get_field(relation).related_model
+        condition = Q(**{f"{relation}__in": _term_rows(related_model, related_field, term)})
+    else:
+        condition = Q(Contains(Unaccent(Lower(F(field_name))), term))
+    return model._default_manager.filter(condition).values("pk").order_by()
+
+
+def search_queryset(queryset: QuerySet[Any], fields: List[str], search: str) -> QuerySet[Any]:
+    """Function responsible to filter the rows which match every term of the search on any of the fields, ignoring
+    case and accents, shared by the API filters and the admin. The fields of each term are matched by a UNION of
+    one select per field, instead of an OR, so each select runs on the index of its field.
+    Args:
+        queryset (QuerySet): Receives the queryset to be searched.
+        fields (List[str]): Receives the searched fields.
+        search (str): Receives the search text.
+    Returns:
+        QuerySet: Return the filtered queryset, not evaluated.
+    """
+    for term in search_terms(search):
+        selects = [_term_rows(queryset.model, field, term) for field in fields]
+        queryset = queryset.filter(pk__in=selects[0].union(*selects[1:], all=True) if len(selects) > 1 else selects[0])
+    return queryset
@@ -1,9 +1,11 @@
 from typing import Any, Dict
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from agrobusiness.expand import ExpandableField, ExpandableFieldsMixin
 from agrobusiness.models import Customer, FarmProperty, PlantingType, State
 
 
@@ -15,12 +17,38 @@ class StateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CultivatedFieldSerializer(serializers.ModelSerializer):
+    """PlantingType nested Serializer class, used by the expanded farms"""
+
+    class Meta:
+        model = PlantingType
+        fields = ["id", "plant_name", "created_at", "updated_at"]
+
+
+class CustomerFarmSerializer(serializers.ModelSerializer):
+    """FarmProperty nested Serializer class, used by the expanded customers"""
+
+    state = serializers.SlugRelatedField(read_only=True, slug_field="acronym")
+
+    class Meta:
+        model = FarmProperty
+        fields = ["id", "state", "name", "city", "area", "farming_area", "plant_area", "created_at", "updated_at"]
+
+
+class CustomerSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """Customer Serializer class"""
 
+    expandable_fields = {
+        "customer_farms": ExpandableField(
+            CustomerFarmSerializer,
+            Prefetch("customer_farms", queryset=FarmProperty.objects.select_related("state")),
+            True,
+        ),
+    }
+
     class Meta:
         model = Customer
-        fields = "__all__"
+        fields = ["id", "personal_document", "name", "created_at", "updated_at"]
 
     def _clean_fields(self, validated_data: Dict[Any, Any]) -> None:
         """Private function created to use field validation, based on the model's business rule.
@@ -57,11 +85,17 @@ class CustomerSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class FarmPropertySerializer(serializers.ModelSerializer):
+class FarmPropertySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """FarmProperty Serializer class"""
 
     state = serializers.SlugRelatedField(queryset=State.objects.all(), slug_field="acronym")
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
+    expandable_fields = {
+        "customer": ExpandableField(CustomerSerializer, "customer"),
+        "state": ExpandableField(StateSerializer, "state"),
+        "cultivated_fields": ExpandableField(CultivatedFieldSerializer, "cultivated_fields", True),
+    }
+    related_fields = {"state": "state"}
 
     class Meta:
         model = FarmProperty
@@ -0,0 +1,178 @@
+from typing import Any, Type
+
+from django.contrib.auth.models import Group, Permission, User
+from django.db.backends.signals import connection_created
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from agrobusiness.authentication import permission_cache, token_cache
+from agrobusiness.cache import invalidate_stats
+from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+from agrobusiness.rollups import apply_farm_delta, apply_planting_delta
+from agrobusiness.search import UNACCENT_FUNCTION, strip_accents
+from agrobusiness.sync import record_tombstone
+
+PREVIOUS_ATTR = "_rollup_previous"
+
+
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=FarmProperty)
+@receiver(post_save, sender=PlantingType)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=FarmProperty)
+@receiver(post_delete, sender=PlantingType)
+def invalidate_stats_cache(sender: Type[Model], **kwargs: Any) -> None:
+    """Signal receiver responsible to invalidate the cached stats which depend on the changed model.
+    Args:
+        sender (Type[Model]): Receives the model class which sent the signal.
+    """
+    invalidate_stats(sender)
+
+
+@receiver(pre_save, sender=FarmProperty)
+@receiver(pre_save, sender=PlantingType)
+def store_previous_values(sender: Type[Model], instance: Model, raw: bool, **kwargs: Any) -> None:
+    """Signal receiver responsible to keep the stored values of an updated row, so the rollups can be moved from
+    the previous values to the new ones. The row is locked until the save commits, so two concurrent updates of
+    the same row do not move the rollups from the same previous values.
+    Args:
+        sender (Type[Model]): Receives the model class which sent the signal.
+        instance (Model): Receives the instance being saved.
+        raw (bool): Receives if the instance is being saved by a fixture, which can also update existing rows.
+    """
+    previous = None
+    if raw or not instance._state.adding:
+        fields = ["plant_name"] if sender is PlantingType else ["state_id", "area", "farming_area", "plant_area"]
+        previous = sender.objects.select_for_update().filter(pk=instance.pk).values(*fields).first()
+    setattr(instance, PREVIOUS_ATTR, previous)
+
+
+@receiver(post_save, sender=FarmProperty)
+def update_farm_rollups(sender: Type[FarmProperty], instance: FarmProperty, **kwargs: Any) -> None:
+    """Signal receiver responsible to apply a saved farm on the state rollups, moving it out of its previous state
+    when it changed.
+    Args:
+        sender (Type[FarmProperty]): Receives the model class which sent the signal.
+        instance (FarmProperty): Receives the saved instance.
+    """
+    previous = getattr(instance, PREVIOUS_ATTR, None)
+    if previous and previous["state_id"] == instance.state_id:
+        apply_farm_delta(
+            instance.state_id,
+            0,
+            instance.area - previous["area"],
+            instance.farming_area - previous["farming_area"],
+            instance.plant_area - previous["plant_area"],
+        )
+        return
+    if previous:
+        apply_farm_delta(
+            previous["state_id"], -1, -previous["area"], -previous["farming_area"], -previous["plant_area"]
+        )
+    apply_farm_delta(instance.state_id, 1, instance.area, instance.farming_area, instance.plant_area)
+
+
+@receiver(post_delete, sender=FarmProperty)
+def remove_farm_rollups(sender: Type[FarmProperty], instance: FarmProperty, **kwargs: Any) -> None:
+    """Signal receiver responsible to remove a deleted farm from the state rollups.
+    Args:
+        sender (Type[FarmProperty]): Receives the model class which sent the signal.
+        instance (FarmProperty): Receives the deleted instance.
+    """
+    apply_farm_delta(instance.state_id, -1, -instance.area, -instance.farming_area, -instance.plant_area)
+
+
+@receiver(post_save, sender=PlantingType)
+def update_planting_rollups(sender: Type[PlantingType], instance: PlantingType, **kwargs: Any) -> None:
+    """Signal receiver responsible to apply a saved cultivation on the plant name rollups, moving it out of its
+    previous plant name when it changed.
+    Args:
+        sender (Type[PlantingType]): Receives the model class which sent the signal.
+        instance (PlantingType): Receives the saved instance.
+    """
+    previous = getattr(instance, PREVIOUS_ATTR, None)
+    if previous and previous["plant_name"] == instance.plant_name:
+        return
+    if previous:
+        apply_planting_delta(previous["plant_name"], -1)
+    apply_planting_delta(instance.plant_name, 1)
+
+
+@receiver(post_delete, sender=PlantingType)
+def remove_planting_rollups(sender: Type[PlantingType], instance: PlantingType, **kwargs: Any) -> None:
+    """Signal receiver responsible to remove a deleted cultivation from the plant name rollups.
+    Args:
+        sender (Type[PlantingType]): Receives the model class which sent the signal.
+        instance (PlantingType): Receives the deleted instance.
+    """
+    apply_planting_delta(instance.plant_name, -1)
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=FarmProperty)
+@receiver(post_delete, sender=PlantingType)
+def store_tombstone(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
+    """Signal receiver responsible to record the deleted row, so the delta sync sends its delete.
+    Args:
+        sender (Type[Model]): Receives the model class which sent the signal.
+        instance (Model): Receives the deleted instance.
+    """
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender: Type[User], instance: User, **kwargs: Any) -> None:
+    """Signal receiver responsible to drop the verified tokens of a changed or deleted user from the token cache
+    of the process, so a deactivated user or a changed password is checked again on the next request.
+    Args:
+        sender (Type[User]): Receives the model class which sent the signal.
+        instance (User): Receives the saved or deleted user.
+    """
+    token_cache.invalidate_user(instance.pk)
+    permission_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def clear_permission_cache(sender: Type[Model], **kwargs: Any) -> None:
+    """Signal receiver responsible to drop the cached permissions of every user when a group, a permission or the
+    permissions of a group change, since any user may depend on them.
+    Args:
+        sender (Type[Model]): Receives the model class which sent the signal.
+    """
+    permission_cache.clear()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_permissions(sender: Type[Model], instance: Model, reverse: bool, **kwargs: Any) -> None:
+    """Signal receiver responsible to drop the cached permissions of the users whose groups or permissions
+    changed, which are every user when the change is made from the group or permission side.
+    Args:
+        sender (Type[Model]): Receives the intermediate model which sent the signal.
+        instance (Model): Receives the user, or the group or permission on a reverse change.
+        reverse (bool): Receives if the change is made from the group or permission side.
+    """
+    if reverse:
+        permission_cache.clear()
+    else:
+        permission_cache.invalidate_user(instance.pk)
+
+
+@receiver(connection_created)
+def register_unaccent_function(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """Signal receiver responsible to register the unaccent function of the search on each new SQLite connection,
+    which has no unaccent extension. Postgres gets it from the 0006 migration.
+    Args:
+        sender (Any): Receives the database wrapper class which sent the signal.
+        connection (Any): Receives the database wrapper of the new connection.
+    """
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(UNACCENT_FUNCTION, 1, strip_accents, deterministic=True)
@@ -0,0 +1,248 @@
+import base64
+import binascii
+import heapq
+import json
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db.models import Model, Q, QuerySet
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, NotFound
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType, Tombstone
+from agrobusiness.readers import RowMapper
+from agrobusiness.serializers import CustomerSerializer, FarmPropertySerializer, PlantingTypeSerializer
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Position of a change on the sync order: its timestamp, the rank of its stream and its id
+Position = Tuple[datetime, int, str]
+
+
+class SyncModel(NamedTuple):
+    """Sync model class, naming a synced model and the serializer whose fields are sent on its upserts"""
+
+    name: str
+    model: Type[Model]
+    serializer: Type[serializers.ModelSerializer]
+
+
+SYNC_MODELS = [
+    SyncModel("customer", Customer, CustomerSerializer),
+    SyncModel("farm", FarmProperty, FarmPropertySerializer),
+    SyncModel("planting", PlantingType, PlantingTypeSerializer),
+]
+SYNC_NAMES = {sync_model.model: sync_model.name for sync_model in SYNC_MODELS}
+# Rank of the tombstone stream, which follows the model streams on the same timestamp
+DELETE_RANK = len(SYNC_MODELS)
+
+
+class SyncCursorExpired(APIException):
+    """Exception class, raised when the sync cursor is older than the kept tombstones, so the deletes after it
+    may be lost and the client must download the whole dataset again"""
+
+    status_code = status.HTTP_410_GONE
+    default_detail = "The sync cursor is older than the kept deletes, download the whole dataset again."
+    default_code = "sync_cursor_expired"
+
+
+def sync_horizon() -> datetime:
+    """Function responsible to return the time from which the changes are held back until a later sync, so a
+    transaction still open when the cursor moves on is not skipped.
+    Returns:
+        datetime: Return the current time minus SYNC_SETTLE_SECONDS.
+    """
+    return timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+
+def encode_cursor(position: Position, checked_at: datetime) -> str:
+    """Function responsible to encode the opaque cursor sent to the client.
+    Args:
+        position (Position): Receives the timestamp, stream rank and id of the last change sent.
+        checked_at (datetime): Receives the time up to which the client has seen every change, which tells if the
+            tombstones it still needs were kept.
+    Returns:
+        str: Return the cursor.
+    """
+    changed_at, rank, pk = position
+    data = {"changed_at": changed_at.isoformat(), "rank": rank, "id": pk, "checked_at": checked_at.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[Position], Optional[datetime]]:
+    """Function responsible to decode the since cursor sent by the client.
+    Args:
+        cursor (str, optional): Receives the cursor.
+    Raises:
+        NotFound: Raised when the cursor can not be decoded.
+        SyncCursorExpired: Raised when the tombstones the client needs may have been pruned.
+    Returns:
+        Tuple[Optional[Position], Optional[datetime]]: Return the position and the checked time, both None when
+        the whole dataset is asked.
+    """
+    if not cursor:
+        return None, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position = datetime.fromisoformat(data["changed_at"]), int(data["rank"]), str(data["id"])
+        checked_at = datetime.fromisoformat(data["checked_at"])
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise NotFound("Invalid cursor")
+    if checked_at < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+        raise SyncCursorExpired()
+    return position, checked_at
+
+
+def _after(queryset: QuerySet[Any], field: str, rank: int, position: Optional[Position]) -> QuerySet[Any]:
+    """Private function created to keep the rows of a stream after the position, by an index range on
+    (timestamp, id).
+    Args:
+        queryset (QuerySet): Receives the queryset of the stream.
+        field (str): Receives the timestamp field of the stream.
+        rank (int): Receives the rank of the stream.
+        position (Position, optional): Receives the position of the last change sent.
+    Returns:
+        QuerySet: Return the queryset filtered and ordered by (timestamp, id).
+    """
+    if position is not None:
+        changed_at, position_rank, pk = position
+        if rank > position_rank:
+            queryset = queryset.filter(**{f"{field}__gte": changed_at})
+        elif rank < position_rank:
+            queryset = queryset.filter(**{f"{field}__gt": changed_at})
+        else:
+            queryset = queryset.filter(Q(**{f"{field}__gt": changed_at}) | Q(**{field: changed_at, "id__gt": pk}))
+    return queryset.order_by(field, "id")
+
+
+def _rows(queryset: QuerySet[Any], limit: Optional[int]) -> Iterable[Dict[str, Any]]:
+    """Private function created to read a stream, up to the limit or by a database iterator.
+    Args:
+        queryset (QuerySet): Receives the values() queryset of the stream.
+        limit (int, optional): Receives the number of rows to be read, or None to read every row.
+    Returns:
+        Iterable[Dict[str, Any]]: Return the rows.
+    """
+    if limit is None:
+        return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    return list(queryset[:limit])
+
+
+def _upserts(
+    rank: int, sync_model: SyncModel, position: Optional[Position], horizon: datetime, limit: Optional[int]
+) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+    """Private function created to read the created and updated rows of a model, formatted by the row mapper of
+    its serializer.
+    Args:
+        rank (int): Receives the rank of the stream.
+        sync_model (SyncModel): Receives the synced model.
+        position (Position, optional): Receives the position of the last change sent.
+        horizon (datetime): Receives the time from which the changes are held back.
+        limit (int, optional): Receives the number of rows to be read, or None to read every row.
+    Yields:
+        Iterator[Tuple[Position, Dict[str, Any]]]: Return the position and the change of each row.
+    """
+    mapper: RowMapper = RowMapper.for_serializer(sync_model.serializer())  # type: ignore[assignment]
+    queryset = _after(sync_model.model._default_manager.filter(updated_at__lt=horizon), "updated_at", rank, position)
+    for row in _rows(queryset.values(*dict.fromkeys([*mapper.values_lookups, "updated_at"])), limit):
+        change = {"model": sync_model.name, "op": UPSERT, "id": str(row["id"]), "data": mapper.map_rows([row])[0]}
+        yield (row["updated_at"], rank, str(row["id"])), change
+
+
+def _deletes(
+    position: Optional[Position], horizon: datetime, limit: Optional[int]
+) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+    """Private function created to read the tombstones of the deleted rows.
+    Args:
+        position (Position, optional): Receives the position of the last change sent.
+        horizon (datetime): Receives the time from which the changes are held back.
+        limit (int, optional): Receives the number of rows to be read, or None to read every row.
+    Yields:
+        Iterator[Tuple[Position, Dict[str, Any]]]: Return the position and the change of each tombstone.
+    """
+    queryset = _after(Tombstone.objects.filter(deleted_at__lt=horizon), "deleted_at", DELETE_RANK, position)
+    for row in _rows(queryset.values("id", "model", "object_id", "deleted_at"), limit):
+        change = {"model": row["model"], "op": DELETE, "id": str(row["object_id"])}
+        yield (row["deleted_at"], DELETE_RANK, str(row["id"])), change
+
+
+def read_changes(
+    position: Optional[Position], horizon: datetime, limit: Optional[int] = None
+) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+    """Function responsible to read the creates, updates and deletes after the position, merged in the
+    (timestamp, stream, id) order. Each stream reads its rows by an index range, so the work done depends on the
+    number of changes and not on the number of rows.
+    Args:
+        position (Position, optional): Receives the position of the last change sent, or None for every row.
+        horizon (datetime): Receives the time from which the changes are held back, given by sync_horizon.
+        limit (int, optional): Receives the number of changes to be read, or None to stream every change by
+            database iterators. Defaults to None.
+    Yields:
+        Iterator[Tuple[Position, Dict[str, Any]]]: Return the position and the change, in the sync order.
+    """
+    streams = [_upserts(rank, sync_model, position, horizon, limit) for rank, sync_model in enumerate(SYNC_MODELS)]
+    streams.append(_deletes(position, horizon, limit))
+    changes = heapq.merge(*streams, key=lambda item: item[0])
+    date_field = serializers.DateTimeField()
+    for (changed_at, rank, pk), change in changes if limit is None else islice(changes, limit):
+        change["changed_at"] = date_field.to_representation(changed_at)
+        yield (changed_at, rank, pk), change
+
+
+def stream_changes(
+    position: Optional[Position], checked_at: Optional[datetime], horizon: datetime
+) -> Iterator[Dict[str, Any]]:
+    """Function responsible to stream every change after the position, each with the cursor which resumes after
+    it, followed by a last line with only the cursor of the next sync. That cursor is checked up to the horizon,
+    even without changes, so a client which syncs often by the stream never gets an expired cursor.
+    Args:
+        position (Position, optional): Receives the position of the last change sent, or None for every row.
+        checked_at (datetime, optional): Receives the time up to which the client has seen every change.
+        horizon (datetime): Receives the time from which the changes are held back.
+    Yields:
+        Iterator[Dict[str, Any]]: Return the changes with their cursor, and the cursor of the next sync.
+    """
+    checked_at = checked_at or horizon
+    for position, change in read_changes(position, horizon):
+        yield {**change, "cursor": encode_cursor(position, checked_at)}
+    yield {"cursor": encode_cursor(position, horizon) if position else None}
+
+
+def read_page(
+    position: Optional[Position], horizon: datetime, page_size: int
+) -> Tuple[List[Dict[str, Any]], Optional[Position], bool]:
+    """Function responsible to read one page of changes after the position.
+    Args:
+        position (Position, optional): Receives the position of the last change sent, or None for every row.
+        horizon (datetime): Receives the time from which the changes are held back.
+        page_size (int): Receives the number of changes of the page.
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[Position], bool]: Return the changes, the position to be sent on the
+        next sync, and if there are more changes after the page.
+    """
+    changes = list(read_changes(position, horizon, limit=page_size + 1))
+    page = changes[:page_size]
+    return [change for _, change in page], page[-1][0] if page else position, len(changes) > page_size
+
+
+def record_tombstone(instance: Model) -> None:
+    """Function responsible to record the delete of a synced row.
+    Args:
+        instance (Model): Receives the deleted instance.
+    """
+    Tombstone.objects.create(model=SYNC_NAMES[type(instance)], object_id=instance.pk)
+
+
+def prune_tombstones(days: int) -> int:
+    """Function responsible to delete the tombstones older than the retention, whose cursors are already expired.
+    Args:
+        days (int): Receives the retention, in days.
+    Returns:
+        int: Return the number of deleted tombstones.
+    """
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
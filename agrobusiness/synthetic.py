@@ -0,0 +1,210 @@
+import hashlib
+import random
+import uuid
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+from django.db import transaction
+from django.db.models import Model
+
+from agrobusiness.cache import invalidate_stats
+from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+from agrobusiness.rollups import rebuild_rollups
+
+PLANT_NAMES = [
+    "soja",
+    "milho",
+    "algodao",
+    "cafe",
+    "cana de acucar",
+    "feijao",
+    "arroz",
+    "trigo",
+    "mandioca",
+    "laranja",
+    "sorgo",
+    "banana",
+]
+CITIES = ["Sousa", "Patos", "Campina Grande", "Cajazeiras", "Pombal", "Guarabira", "Monteiro", "Catole do Rocha"]
+CNPJ_RATIO = 0.1
+
+
+def _check_digit(digits: List[int], weights: List[int]) -> int:
+    """Private function created to compute one check digit of a CPF or CNPJ document.
+    Args:
+        digits (List[int]): Receives the digits already known.
+        weights (List[int]): Receives the weight of each digit.
+    Returns:
+        int: Return the check digit.
+    """
+    remainder = sum(digit * weight for digit, weight in zip(digits, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def generate_cpf(rng: random.Random) -> str:
+    """Function responsible to generate a valid CPF document.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+    Returns:
+        str: Return the eleven digits of the CPF.
+    """
+    digits = [rng.randint(0, 9) for _ in range(9)]
+    digits.append(_check_digit(digits, list(range(10, 1, -1))))
+    digits.append(_check_digit(digits, list(range(11, 1, -1))))
+    return "".join(map(str, digits))
+
+
+def generate_cnpj(rng: random.Random) -> str:
+    """Function responsible to generate a valid CNPJ document.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+    Returns:
+        str: Return the fourteen digits of the CNPJ.
+    """
+    digits = [rng.randint(0, 9) for _ in range(8)] + [0, 0, 0, 1]
+    digits.append(_check_digit(digits, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    digits.append(_check_digit(digits, [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    return "".join(map(str, digits))
+
+
+def synthetic_id(seed: int, kind: str, index: int) -> uuid.UUID:
+    """Function responsible to derive the id of a synthetic row from its position, so the rows can reference each
+    other without keeping the ids in memory.
+    Args:
+        seed (int): Receives the generator seed.
+        kind (str): Receives the kind of the row, such as customer or farm.
+        index (int): Receives the position of the row.
+    Returns:
+        uuid.UUID: Return the row id.
+    """
+    return uuid.UUID(bytes=hashlib.md5(f"{seed}:{kind}:{index}".encode()).digest(), version=4)
+
+
+def _area(rng: random.Random, low: int, high: int) -> Decimal:
+    """Private function created to draw an area with two decimal places.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+        low (int): Receives the lowest area, in cents.
+        high (int): Receives the highest area, in cents.
+    Returns:
+        Decimal: Return the area.
+    """
+    return Decimal(rng.randint(low, high)) / 100
+
+
+def generate_customers(rng: random.Random, seed: int, total: int) -> Iterator[Customer]:
+    """Function responsible to yield the synthetic customers, with valid CPF and CNPJ documents.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+        seed (int): Receives the generator seed.
+        total (int): Receives the number of customers.
+    Yields:
+        Iterator[Customer]: Return the unsaved customers.
+    """
+    for index in range(total):
+        document = generate_cnpj(rng) if rng.random() < CNPJ_RATIO else generate_cpf(rng)
+        yield Customer(id=synthetic_id(seed, "customer", index), personal_document=document, name=f"Produtor {index}")
+
+
+def generate_farms(
+    rng: random.Random, seed: int, total: int, customers: int, state_ids: List[uuid.UUID]
+) -> Iterator[FarmProperty]:
+    """Function responsible to yield the synthetic farms, spread over the customers and the states, always
+    respecting the area rule.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+        seed (int): Receives the generator seed.
+        total (int): Receives the number of farms.
+        customers (int): Receives the number of synthetic customers.
+        state_ids (List[uuid.UUID]): Receives the ids of the states.
+    Yields:
+        Iterator[FarmProperty]: Return the unsaved farms.
+    """
+    for index in range(total):
+        area = _area(rng, 1000, 99999)
+        farming_area = _area(rng, 0, int(area * 50))
+        yield FarmProperty(
+            id=synthetic_id(seed, "farm", index),
+            customer_id=synthetic_id(seed, "customer", rng.randrange(customers)),
+            state_id=rng.choice(state_ids),
+            name=f"Fazenda {index}",
+            city=rng.choice(CITIES),
+            area=area,
+            farming_area=farming_area,
+            plant_area=_area(rng, 0, int((area - farming_area) * 100)),
+        )
+
+
+def generate_plantings(rng: random.Random, seed: int, total: int, farms: int) -> Iterator[PlantingType]:
+    """Function responsible to yield the synthetic plantings, spread over the farms.
+    Args:
+        rng (random.Random): Receives the seeded random generator.
+        seed (int): Receives the generator seed.
+        total (int): Receives the number of plantings.
+        farms (int): Receives the number of synthetic farms.
+    Yields:
+        Iterator[PlantingType]: Return the unsaved plantings.
+    """
+    for index in range(total):
+        yield PlantingType(
+            id=synthetic_id(seed, "planting", index),
+            farm_id=synthetic_id(seed, "farm", rng.randrange(farms)),
+            plant_name=rng.choice(PLANT_NAMES),
+        )
+
+
+def _write(objs: Iterator[Model], batch_size: int) -> int:
+    """Private function created to write the generated rows by batches, one transaction per batch, so the memory
+    used does not depend on the number of rows. Rows already written by a previous run with the same seed are
+    ignored.
+    Args:
+        objs (Iterator[Model]): Receives the generated rows.
+        batch_size (int): Receives the number of rows of each batch.
+    Returns:
+        int: Return the number of rows generated.
+    """
+    written, batch = 0, []
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            with transaction.atomic():
+                type(obj)._default_manager.bulk_create(batch, ignore_conflicts=True)
+            written, batch = written + len(batch), []
+    if batch:
+        with transaction.atomic():
+            type(batch[0])._default_manager.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    return written
+
+
+def populate(customers: int, farms: int, plantings: int, seed: int, batch_size: int) -> Dict[str, int]:
+    """Function responsible to fill the database with reproducible synthetic data, spread over every registered
+    state. The same seed always generates the same rows, and the rollups and the stats cache are refreshed at
+    the end, since bulk_create skips the model signals.
+    Args:
+        customers (int): Receives the number of customers.
+        farms (int): Receives the number of farms.
+        plantings (int): Receives the number of plantings.
+        seed (int): Receives the generator seed.
+        batch_size (int): Receives the number of rows written by each INSERT.
+    Raises:
+        ValueError: Raised when there are no states, or when farms are asked without customers or plantings
+        without farms.
+    Returns:
+        Dict[str, int]: Return the number of rows generated by model.
+    """
+    state_ids = list(State.objects.order_by("acronym").values_list("id", flat=True))
+    if not state_ids:
+        raise ValueError("No states found, load them first with loaddata state.json.")
+    if (farms and not customers) or (plantings and not farms):
+        raise ValueError("Farms need customers and plantings need farms.")
+    rng = random.Random(seed)
+    written = {
+        "customers": _write(generate_customers(rng, seed, customers), batch_size),
+        "farms": _write(generate_farms(rng, seed, farms, customers, state_ids), batch_size),
+        "plantings": _write(generate_plantings(rng, seed, plantings, farms), batch_size),
+    }
+    rebuild_rollups()
+    invalidate_stats(FarmProperty)
+    invalidate_stats(PlantingType)
+    return written
@@ -3,22 +3,64 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, Spec
 from rest_framework import routers
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from agrobusiness.views import CustomerViewset, FarmPropertyViewset, PlantingTypeViewset, StatesViewset
+from agrobusiness.async_views import (
+    AsyncAgriculturalLandView,
+    AsyncCultivationByNameView,
+    AsyncCustomerListView,
+    AsyncFarmPropertyListView,
+    AsyncPlantingTypeListView,
+    AsyncStateFarmsView,
+    AsyncTotalAreasView,
+    AsyncTotalFarmsView,
+)
+from agrobusiness.views import (
+    CustomerViewset,
+    DashboardView,
+    FarmPropertyViewset,
+    MetricsView,
+    PlantingTypeViewset,
+    StatesViewset,
+    SyncViewset,
+)
 
 router = routers.DefaultRouter(trailing_slash=False)
 router.register("states", StatesViewset)
 router.register("customer", CustomerViewset)
 router.register("farm", FarmPropertyViewset)
 router.register("planting", PlantingTypeViewset)
+router.register("sync", SyncViewset, basename="sync")
 
 urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # YOUR PATTERNS
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("dashboard", DashboardView.as_view(), name="dashboard"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     # Optional UI:
     path("schema/swagger-ui/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("schema/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
 ]
 
+# Async versions of the lists and stats, served without a thread per request under an ASGI server
+async_urlpatterns = [
+    path("async/customer", AsyncCustomerListView.as_view(), name="async-customer-list"),
+    path("async/farm", AsyncFarmPropertyListView.as_view(), name="async-farm-list"),
+    path("async/planting", AsyncPlantingTypeListView.as_view(), name="async-planting-list"),
+    path("async/states/stats/chart/state-farms", AsyncStateFarmsView.as_view(), name="async-state-farms"),
+    path("async/farm/stats/total-farms", AsyncTotalFarmsView.as_view(), name="async-total-farms"),
+    path("async/farm/stats/total-areas", AsyncTotalAreasView.as_view(), name="async-total-areas"),
+    path(
+        "async/farm/stats/chart/agricultural-land",
+        AsyncAgriculturalLandView.as_view(),
+        name="async-agricultural-land",
+    ),
+    path(
+        "async/planting/stats/chart/cultivation-by-name",
+        AsyncCultivationByNameView.as_view(),
+        name="async-cultivation-by-name",
+    ),
+]
+
+urlpatterns += async_urlpatterns
 urlpatterns += router.urls
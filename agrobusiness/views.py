@@ -1,8 +1,42 @@
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema, inline_serializer
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+    inline_serializer,
+)
 from rest_framework import mixins, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
+from agrobusiness.bulk import validate_farm_rows, write_farms
+from agrobusiness.cache import cached_stats
+from agrobusiness.conditional import ConditionalViewMixin, conditional
+from agrobusiness.dashboard import (
+    agricultural_land_panel,
+    compute_dashboard,
+    cultivation_by_name_panel,
+    state_farms_panel,
+    total_areas_panel,
+    total_farms_panel,
+)
+from agrobusiness.expand import ExpandableViewMixin, expand_parameters
+from agrobusiness.exports import EXPORT_CONTENT_TYPES, ExportMixin
+from agrobusiness.filters import CustomerFilter, FarmPropertyFilter, PlantingTypeFilter
+from agrobusiness.instrumentation import InstrumentedViewMixin
+from agrobusiness.metrics import render_metrics
+from agrobusiness.pagination import CreatedAtCursorPagination
+from agrobusiness.parsers import FastJSONParser, NDJSONParser
+from agrobusiness.permissions import MetricsTokenPermission
+from agrobusiness.readers import FastListMixin
+from agrobusiness.renderers import FastJSONRenderer
 from agrobusiness.serializers import (
     Customer,
     CustomerSerializer,
@@ -13,9 +47,10 @@ from agrobusiness.serializers import (
     State,
     StateSerializer,
 )
+from agrobusiness.sync import decode_cursor, encode_cursor, read_page, stream_changes, sync_horizon
 
 
-class StatesViewset(viewsets.GenericViewSet, mixins.ListModelMixin):
+class StatesViewset(InstrumentedViewMixin, viewsets.GenericViewSet, mixins.ListModelMixin):
     """State Viewset class"""
 
     serializer_class = StateSerializer
@@ -23,7 +58,7 @@ class StatesViewset(viewsets.GenericViewSet, mixins.ListModelMixin):
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(
-        description="Method to return values for the pie chart of farms in each state.",
+        description="Method to return values for the pie chart of farms in each state, with the state area totals.",
         responses={
             200: OpenApiResponse(
                 response=inline_serializer(
@@ -31,12 +66,25 @@ class StatesViewset(viewsets.GenericViewSet, mixins.ListModelMixin):
                     fields={
                         "state": serializers.CharField(),
                         "farm_percentage": serializers.DecimalField(max_digits=4, decimal_places=2),
+                        "farms_total": serializers.IntegerField(),
+                        "area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
+                        "farming_area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
+                        "plant_area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
                     },
                 ),
                 examples=[
                     OpenApiExample(
                         "Case success",
-                        value=[{"state": "string", "farm_percentage": 0.0}],
+                        value=[
+                            {
+                                "state": "string",
+                                "farm_percentage": 0.0,
+                                "farms_total": 0,
+                                "area_total": "0.00",
+                                "farming_area_total": "0.00",
+                                "plant_area_total": "0.00",
+                            }
+                        ],
                         status_codes=[200],
                         response_only=True,
                     )
@@ -45,6 +93,8 @@ class StatesViewset(viewsets.GenericViewSet, mixins.ListModelMixin):
         },
     )
     @action(detail=False, methods=["get"], url_path="stats/chart/state-farms")
+    @conditional(State, FarmProperty)
+    @cached_stats(State, FarmProperty)
     def farms_by_state(self, request, *args, **kwargs) -> Response:
         """Function responsible to return values for the pie chart of farms in each state.
         Args:
@@ -52,31 +102,117 @@ class StatesViewset(viewsets.GenericViewSet, mixins.ListModelMixin):
         Returns:
             Response: Returns the processed value to the graph.
         """
-        result = []
-        total_farms = FarmProperty.objects.all().count()
-        for state in self.queryset:
-            farm_by_state = state.state_farms.all().count()
-            percentage = 0
-            if farm_by_state and total_farms:
-                percentage = farm_by_state / total_farms
-            result.append({"state": state.acronym, "farm_percentage": percentage})
-        return Response(result, status=status.HTTP_200_OK)
-
-
-class CustomerViewset(viewsets.ModelViewSet):
+        return Response(state_farms_panel(request), status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=expand_parameters(CustomerSerializer)),
+    retrieve=extend_schema(parameters=expand_parameters(CustomerSerializer)),
+)
+class CustomerViewset(
+    InstrumentedViewMixin,
+    ConditionalViewMixin,
+    FastListMixin,
+    ExpandableViewMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     """Customer Viewset class"""
 
     serializer_class = CustomerSerializer
     queryset = Customer.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = CustomerFilter
+    export_fields = {
+        "id": "id",
+        "personal_document": "personal_document",
+        "name": "name",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
 
 
-class FarmPropertyViewset(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=expand_parameters(FarmPropertySerializer)),
+    retrieve=extend_schema(parameters=expand_parameters(FarmPropertySerializer)),
+)
+class FarmPropertyViewset(
+    InstrumentedViewMixin,
+    ConditionalViewMixin,
+    FastListMixin,
+    ExpandableViewMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     """FarmProperty Viewset class"""
 
     serializer_class = FarmPropertySerializer
-    queryset = FarmProperty.objects.all()
+    queryset = FarmProperty.objects.select_related("state")
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = FarmPropertyFilter
+    export_fields = {
+        "id": "id",
+        "customer": "customer_id",
+        "state": "state__acronym",
+        "name": "name",
+        "city": "city",
+        "area": "area",
+        "farming_area": "farming_area",
+        "plant_area": "plant_area",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+
+    @extend_schema(
+        description="Method to create or update many properties at once, from a JSON list or NDJSON body. A row "
+        "with an existing id updates the property. Nothing is written when any row is invalid.",
+        request=FarmPropertySerializer(many=True),
+        responses={
+            201: OpenApiResponse(
+                response=inline_serializer(
+                    name="FarmBulkResult",
+                    fields={"created": serializers.IntegerField(), "updated": serializers.IntegerField()},
+                ),
+            ),
+            400: OpenApiResponse(
+                response=inline_serializer(
+                    name="FarmBulkErrors",
+                    fields={
+                        "errors": serializers.ListField(child=serializers.DictField()),
+                    },
+                ),
+                examples=[
+                    OpenApiExample(
+                        "Case invalid row",
+                        value={"errors": [{"row": 0, "errors": {"state": ["This field is required."]}}]},
+                        status_codes=[400],
+                        response_only=True,
+                    )
+                ],
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[FastJSONParser, NDJSONParser])
+    def bulk(self, request, *args, **kwargs) -> Response:
+        """Function responsible to create or update many properties at once, validating every row in one pass.
+        Args:
+            request (django.HttpRequest): Receives django resquest instance
+        Raises:
+            ValidationError: Raised when the body is not a list or has more rows than BULK_MAX_ROWS.
+        Returns:
+            Response: Returns the number of created and updated properties, or the errors of each invalid row.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError("Expected a list of items.")
+        if len(request.data) > settings.BULK_MAX_ROWS:
+            raise ValidationError(f"Ensure this list has no more than {settings.BULK_MAX_ROWS} items.")
+        farms, errors = validate_farm_rows(request.data)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = write_farms(farms, batch_size=settings.BULK_BATCH_SIZE)
+        return Response(data, status=status.HTTP_201_CREATED)
 
     @extend_schema(
         description="Method that returns the total number of registered properties",
@@ -100,6 +236,8 @@ class FarmPropertyViewset(viewsets.ModelViewSet):
         },
     )
     @action(detail=False, methods=["get"], url_path="stats/total-farms")
+    @conditional(FarmProperty)
+    @cached_stats(FarmProperty)
     def total_farms(self, request, *args, **kwargs):
         """Function responsible to returns the total number of registered properties
         Args:
@@ -107,23 +245,24 @@ class FarmPropertyViewset(viewsets.ModelViewSet):
         Returns:
             Response: Returns the processed value
         """
-        data = {"farms_total": self.queryset.count()}
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(total_farms_panel(request), status=status.HTTP_200_OK)
 
     @extend_schema(
-        description="Method that returns the total area in hectares of the properties",
+        description="Method that returns the total, farming and vegetation areas in hectares of the properties",
         responses={
             200: OpenApiResponse(
                 response=inline_serializer(
                     name="TotalArea",
                     fields={
-                        "farms_area_total": serializers.IntegerField(),
+                        "farms_area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
+                        "farming_area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
+                        "plant_area_total": serializers.DecimalField(max_digits=12, decimal_places=2),
                     },
                 ),
                 examples=[
                     OpenApiExample(
                         "Case success",
-                        value={"farms_area_total": 0},
+                        value={"farms_area_total": "0.00", "farming_area_total": "0.00", "plant_area_total": "0.00"},
                         status_codes=[200],
                         response_only=True,
                     )
@@ -132,34 +271,43 @@ class FarmPropertyViewset(viewsets.ModelViewSet):
         },
     )
     @action(detail=False, methods=["get"], url_path="stats/total-areas")
+    @conditional(FarmProperty, State, Customer)
+    @cached_stats(FarmProperty, State, Customer)
     def total_farm_areas(self, request, *args, **kwargs) -> Response:
-        """Function responsible to returns the total area in hectares of the properties
+        """Function responsible to returns the total areas in hectares of the properties, accepting the same
+        filters as the list endpoint.
         Args:
             request (django.HttpRequest): Receives django resquest instance
         Returns:
             Response: Returns the processed value
         """
-        total = 0
-        for item in self.queryset:
-            total += item.area
-        data = {"farms_area_total": total}
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(total_areas_panel(request), status=status.HTTP_200_OK)
 
     @extend_schema(
         description="Method that returns pie chart values by agricultural land use.",
+        parameters=[
+            OpenApiParameter(
+                name="top",
+                type=int,
+                description="Number of farms to be returned, the remaining ones are grouped into an 'others' slice.",
+            )
+        ],
         responses={
             200: OpenApiResponse(
                 response=inline_serializer(
                     name="ChartAgriculturalLandFarm",
                     fields={
                         "farm_name": serializers.CharField(),
+                        "agricultural_land": serializers.DecimalField(max_digits=12, decimal_places=2),
                         "agricultural_land_percentage": serializers.DecimalField(max_digits=4, decimal_places=2),
                     },
                 ),
                 examples=[
                     OpenApiExample(
                         "Case success",
-                        value=[{"farm_name": "string", "agricultural_land_percentage": 0.0}],
+                        value=[
+                            {"farm_name": "string", "agricultural_land": "0.00", "agricultural_land_percentage": 0.0}
+                        ],
                         status_codes=[200],
                         response_only=True,
                     )
@@ -168,46 +316,62 @@ class FarmPropertyViewset(viewsets.ModelViewSet):
         },
     )
     @action(detail=False, methods=["get"], url_path="stats/chart/agricultural-land")
+    @conditional(FarmProperty, State, Customer)
+    @cached_stats(FarmProperty, State, Customer)
     def farms_agricultural_land(self, request, *args, **kwargs) -> Response:
-        """Function responsible to returns pie chart values by agricultural land use.
+        """Function responsible to returns pie chart values by agricultural land use, limited to the top farms
+        when the top query param is given.
         Args:
             request (django.HttpRequest): Receives django resquest instance
         Returns:
             Response: Returns the processed value to the graph.
         """
-        result = []
-        total_land_used = sum([farm.agricultal_land for farm in self.queryset])
-        for farm in self.queryset:
-            agricultural_land = farm.agricultal_land
-            percentage = 0
-            if agricultural_land and total_land_used:
-                percentage = agricultural_land / total_land_used
-            result.append({"farm_name": farm.name, "agricultural_land_percentage": percentage})
-        return Response(result, status=status.HTTP_200_OK)
-
-
-class PlantingTypeViewset(viewsets.ModelViewSet):
+        return Response(agricultural_land_panel(request), status=status.HTTP_200_OK)
+
+
+class PlantingTypeViewset(
+    InstrumentedViewMixin, ConditionalViewMixin, FastListMixin, ExportMixin, viewsets.ModelViewSet
+):
     """PlantingType Viewset class"""
 
     serializer_class = PlantingTypeSerializer
     queryset = PlantingType.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = PlantingTypeFilter
+    export_fields = {
+        "id": "id",
+        "plant_name": "plant_name",
+        "farm": "farm_id",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
 
     @extend_schema(
         description="Method to return values for the pie chart of cultivation plant types by quantities",
+        parameters=[
+            OpenApiParameter(
+                name="include",
+                type=str,
+                description="Comma separated extra values of each plant type: 'farms' and/or 'area'.",
+            )
+        ],
         responses={
             200: OpenApiResponse(
                 response=inline_serializer(
                     name="ChartCultivationName",
                     fields={
                         "plant_name": serializers.CharField(),
+                        "cultivation_total": serializers.IntegerField(),
                         "cultivation_percentage": serializers.DecimalField(max_digits=4, decimal_places=2),
+                        "farms_total": serializers.IntegerField(required=False),
+                        "farming_area_total": serializers.DecimalField(max_digits=12, decimal_places=2, required=False),
                     },
                 ),
                 examples=[
                     OpenApiExample(
                         "Case success",
-                        value=[{"plant_name": "string", "cultivation_percentage": 0.0}],
+                        value=[{"plant_name": "string", "cultivation_total": 0, "cultivation_percentage": 0.0}],
                         status_codes=[200],
                         response_only=True,
                     )
@@ -216,21 +380,178 @@ class PlantingTypeViewset(viewsets.ModelViewSet):
         },
     )
     @action(detail=False, methods=["get"], url_path="stats/chart/cultivation-by-name")
+    @conditional(PlantingType, FarmProperty, State)
+    @cached_stats(PlantingType, FarmProperty, State)
     def planting_type_by_name(self, request, *args, **kwargs) -> Response:
-        """Function responsible to return values for the pie chart of cultivation plant types by quantities
+        """Function responsible to return values for the pie chart of cultivation plant types by quantities,
+        optionally with the distinct farms and farming hectares of each plant type.
         Args:
             request (django.HttpRequest): Receives django resquest instance
         Returns:
             Response: Returns the processed value to the graph.
         """
-        result = []
-        reference_types = set([item.plant_name for item in self.queryset])
-        total_cultivation = self.queryset.count()
-        for tyoe_value in reference_types:
-            items = self.queryset.filter(plant_name=tyoe_value)
-            items_count = items.count()
-            percentage = 0
-            if items_count and total_cultivation:
-                percentage = items_count / total_cultivation
-            result.append({"plant_name": tyoe_value, "cultivation_percentage": percentage})
-        return Response(result, status=status.HTTP_200_OK)
+        return Response(cultivation_by_name_panel(request), status=status.HTTP_200_OK)
+
+
+class DashboardView(InstrumentedViewMixin, APIView):
+    """Dashboard View class, returning every stats panel of the dashboard page in one response"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description="Method to return the total farms, total areas, state farms, agricultural land and cultivation "
+        "by name panels at once, computed concurrently, with the duration and cache usage of each panel. It "
+        "accepts the query params of each stats endpoint, such as the farm filters, top and include.",
+        parameters=[
+            OpenApiParameter(name="state", type=str, description="State acronym of the farms."),
+            OpenApiParameter(name="top", type=int, description="Number of farms of the agricultural land panel."),
+            OpenApiParameter(name="include", type=str, description="Extra values of the cultivation panel."),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=inline_serializer(
+                    name="Dashboard",
+                    fields={
+                        "panels": serializers.DictField(),
+                        "timings": serializers.DictField(child=serializers.DictField()),
+                    },
+                ),
+                examples=[
+                    OpenApiExample(
+                        "Case success",
+                        value={
+                            "panels": {
+                                "total_farms": {"farms_total": 0},
+                                "total_areas": {
+                                    "farms_area_total": "0.00",
+                                    "farming_area_total": "0.00",
+                                    "plant_area_total": "0.00",
+                                },
+                                "state_farms": [],
+                                "agricultural_land": [],
+                                "cultivation_by_name": [],
+                            },
+                            "timings": {"total_farms": {"duration_ms": 0.5, "cache": "MISS"}},
+                        },
+                        status_codes=[200],
+                        response_only=True,
+                    )
+                ],
+            )
+        },
+    )
+    def get(self, request, *args, **kwargs) -> Response:
+        """Function responsible to return every stats panel of the dashboard page.
+        Args:
+            request (django.HttpRequest): Receives django resquest instance
+        Returns:
+            Response: Returns the data and the timings of each panel.
+        """
+        return Response(compute_dashboard(request), status=status.HTTP_200_OK)
+
+
+SYNC_PARAMETERS = [
+    OpenApiParameter(
+        name="since",
+        type=str,
+        description="Cursor returned by the previous sync. Without it, every row is returned as an upsert.",
+    )
+]
+
+
+class SyncViewset(InstrumentedViewMixin, viewsets.ViewSet):
+    """Sync Viewset class, returning the customers, farms and plantings created, updated or deleted after a cursor"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description="Method to return one page of the changes after the since cursor, in the order they happened. "
+        "Store the returned cursor and send it on the next sync, following the next link while it is not null.",
+        parameters=[
+            *SYNC_PARAMETERS,
+            OpenApiParameter(name="page_size", type=int, description="Number of changes per page, up to 500."),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=inline_serializer(
+                    name="SyncPage",
+                    fields={
+                        "cursor": serializers.CharField(allow_null=True),
+                        "next": serializers.URLField(allow_null=True),
+                        "results": serializers.ListField(child=serializers.DictField()),
+                    },
+                ),
+                examples=[
+                    OpenApiExample(
+                        "Case success",
+                        value={
+                            "cursor": "string",
+                            "next": None,
+                            "results": [
+                                {"model": "farm", "op": "upsert", "id": "uuid", "data": {}, "changed_at": "string"},
+                                {"model": "planting", "op": "delete", "id": "uuid", "changed_at": "string"},
+                            ],
+                        },
+                        status_codes=[200],
+                        response_only=True,
+                    )
+                ],
+            )
+        },
+    )
+    def list(self, request, *args, **kwargs) -> Response:
+        """Function responsible to return one page of the changes after the since cursor.
+        Args:
+            request (django.HttpRequest): Receives django resquest instance
+        Returns:
+            Response: Returns the changes, the cursor of the next sync and the link of the next page.
+        """
+        position, checked_at = decode_cursor(request.query_params.get("since"))
+        horizon = sync_horizon()
+        results, position, has_more = read_page(position, horizon, CreatedAtCursorPagination().get_page_size(request))
+        # The client has seen every change up to the horizon once it reads the last page
+        checked_at = (checked_at or horizon) if has_more else horizon
+        cursor = encode_cursor(position, checked_at) if position else None
+        next_url = replace_query_param(request.build_absolute_uri(), "since", cursor) if has_more else None
+        return Response({"cursor": cursor, "next": next_url, "results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Method to stream every change after the since cursor as NDJSON, one change per line. Each "
+        "line carries the cursor which resumes the sync after it. The last line has only the cursor of the next "
+        "sync.",
+        parameters=SYNC_PARAMETERS,
+        responses={200: OpenApiResponse(response=OpenApiTypes.STR)},
+    )
+    @action(detail=False, methods=["get"], url_path="stream")
+    def stream(self, request, *args, **kwargs) -> StreamingHttpResponse:
+        """Function responsible to stream every change after the since cursor, reading each table by a database
+        iterator.
+        Args:
+            request (django.HttpRequest): Receives django resquest instance
+        Returns:
+            StreamingHttpResponse: Returns the streamed changes.
+        """
+        position, checked_at = decode_cursor(request.query_params.get("since"))
+        renderer = FastJSONRenderer()
+        lines = (renderer.render(line) + b"\n" for line in stream_changes(position, checked_at, sync_horizon()))
+        return StreamingHttpResponse(lines, content_type=EXPORT_CONTENT_TYPES["ndjson"])
+
+
+class MetricsView(APIView):
+    """Metrics View class, exposing the metrics of every worker process on the Prometheus text format"""
+
+    authentication_classes = []
+    permission_classes = [MetricsTokenPermission]
+
+    @extend_schema(
+        description="Method to return the request, query, stats cache and row count metrics for Prometheus.",
+        responses={200: OpenApiResponse(response=OpenApiTypes.STR)},
+    )
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        """Function responsible to return the metrics merged from every worker process.
+        Args:
+            request (django.HttpRequest): Receives django resquest instance
+        Returns:
+            HttpResponse: Returns the metrics on the Prometheus text format.
+        """
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
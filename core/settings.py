@@ -11,9 +11,11 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -22,13 +24,34 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-# SECRET_KEY = "django-insecure-pmb)cng+^*%%fyb4puxn@w^%8vf(#=jfrg4xr!@t*21f5=$*=7"
-SECRET_KEY = get_random_secret_key()
-
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = bool(os.getenv("MODE_DEBUG"))
 
+# Keys of the JWT tokens, shared by every worker and node. The first key signs, and all of them verify, so a new
+# key is put in front of the previous ones on rotation. Read one key per line from JWT_SIGNING_KEYS_FILE, or
+# comma-separated from JWT_SIGNING_KEYS, defaulting to SECRET_KEY
+JWT_SIGNING_KEYS_FILE = os.getenv("JWT_SIGNING_KEYS_FILE")
+if JWT_SIGNING_KEYS_FILE:
+    JWT_SIGNING_KEYS = [key.strip() for key in Path(JWT_SIGNING_KEYS_FILE).read_text().splitlines() if key.strip()]
+else:
+    JWT_SIGNING_KEYS = [key.strip() for key in os.getenv("JWT_SIGNING_KEYS", "").split(",") if key.strip()]
+
+# SECURITY WARNING: keep the secret key used in production secret!
+# SECRET_KEY = "django-insecure-pmb)cng+^*%%fyb4puxn@w^%8vf(#=jfrg4xr!@t*21f5=$*=7"
+# A random key is only allowed on MODE_DEBUG, since each process would sign with its own key
+SECRET_KEY = os.getenv("SECRET_KEY") or next(iter(JWT_SIGNING_KEYS), "")
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured(
+            "Set SECRET_KEY, JWT_SIGNING_KEYS or JWT_SIGNING_KEYS_FILE, so every worker signs with the same key."
+        )
+    SECRET_KEY = get_random_secret_key()
+JWT_SIGNING_KEYS = JWT_SIGNING_KEYS or [SECRET_KEY]
+JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", 1024))
+JWT_TOKEN_CACHE_TTL = float(os.getenv("JWT_TOKEN_CACHE_TTL", 60))
+PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", 300))
+PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", 2048))
+
 # ALLOWED_HOSTS = []
 ALLOWED_HOSTS = os.environ["ALL_HOSTS"].split(",")
 INTERNAL_IPS = ["127.0.0.1"]
@@ -56,6 +79,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "agrobusiness.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -106,6 +130,33 @@ else:
         "PORT": int(os.environ["DB_PORT"]),
     }
 
+# Seconds a connection is kept open for the next requests of its thread, the request and the dashboard pool
+# threads, so each worker can hold up to 1 + DASHBOARD_WORKERS connections. 0 closes them after each request, and
+# must be kept under ASGI, where the connections of the sync_to_async threads are never closed at request end
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", 0))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = os.getenv("DB_CONN_HEALTH_CHECKS", "1") == "1"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+STATS_CACHE_ALIAS = "stats"
+STATS_CACHE_TIMEOUT = int(os.getenv("STATS_CACHE_TIMEOUT", 300))
+STATS_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+}
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    STATS_CACHE_ALIAS: {
+        "BACKEND": STATS_CACHE_BACKENDS[os.getenv("STATS_CACHE_BACKEND", "locmem")],
+        "LOCATION": os.getenv("STATS_CACHE_LOCATION", "agro-stats"),
+        "TIMEOUT": STATS_CACHE_TIMEOUT,
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -125,6 +176,11 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Authentication backends
+# https://docs.djangoproject.com/en/4.2/topics/auth/customizing/#specifying-authentication-backends
+
+AUTHENTICATION_BACKENDS = ["agrobusiness.authentication.CachedModelBackend"]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -194,6 +250,11 @@ LOGGING = {
             "level": LOG_LEVEL,
             "propagate": True,
         },
+        "agrobusiness": {
+            "handlers": ["console", "file"],
+            "level": LOG_LEVEL,
+            "propagate": True,
+        },
         "django.db.backends": {
             "handlers": ["file"],
             "level": "ERROR",
@@ -206,11 +267,13 @@ LOGGING = {
 # https://www.django-rest-framework.org/api-guide/settings/
 
 REST_FRAMEWORK = {
-    "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
+    "DEFAULT_RENDERER_CLASSES": ["agrobusiness.renderers.FastJSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": [
+        "agrobusiness.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
-    "DEFAULT_AUTHENTICATION_CLASSES": ["rest_framework_simplejwt.authentication.JWTAuthentication"],
+    "DEFAULT_AUTHENTICATION_CLASSES": ["agrobusiness.authentication.CachedJWTAuthentication"],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly",
@@ -218,8 +281,23 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 500))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", 10000))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+FAST_READ_ENABLED = os.getenv("FAST_READ", "1") == "1"
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", 5))
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", 30))
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", 5))
+REQUEST_METRICS_ENABLED = bool(os.getenv("REQUEST_METRICS"))
+REQUEST_QUERY_BUDGET = int(os.getenv("REQUEST_QUERY_BUDGET", 20))
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "agrobusiness-metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 1))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ROWS_CACHE_TTL = float(os.getenv("METRICS_ROWS_CACHE_TTL", 15))
 if DEBUG:  # To keep the Browsable API
     REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"].append("rest_framework.authentication.SessionAuthentication")
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("rest_framework.renderers.BrowsableAPIRenderer")
 
 # Django Rest Framework Spectacular
 # https://drf-spectacular.readthedocs.io/en/latest/settings.html
@@ -243,7 +321,7 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
-    "SIGNING_KEY": SECRET_KEY,
+    "SIGNING_KEY": JWT_SIGNING_KEYS[0],
     "VERIFYING_KEY": "",
     "AUDIENCE": None,
     "ISSUER": None,
@@ -1,11 +1,16 @@
 from decimal import Decimal
+from typing import Callable
 
 import pytest
 from django.contrib.auth.models import User
 from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import QuerySet
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken, Token
 
+from agrobusiness.authentication import token_cache
+from agrobusiness.cache import get_stats_cache
 from agrobusiness.models import Customer, FarmProperty, State
 
 
@@ -16,6 +21,23 @@ def django_db_setup(django_db_setup, django_db_blocker) -> None:
         call_command("loaddata", "test_data.json")
 
 
+@pytest.fixture(autouse=True)
+def clear_stats_cache() -> None:
+    """Fixture to provide an empty stats cache for each test, since the rollback of a test does not send signals."""
+    get_stats_cache().clear()
+    yield
+    get_stats_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> None:
+    """Fixture to provide an empty verified token cache for each test, since the user ids are reused after the
+    rollback of a test."""
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def api_client() -> APIClient:
     """Fixture to provide an API client
@@ -51,7 +73,7 @@ def create_state() -> State:
     Returns:
         User: Return a State instance
     """
-    state = State.objects.create(acronym="PB", name="Paraiba")
+    state, _ = State.objects.get_or_create(acronym="PB", defaults={"name": "Paraiba"})
     return state
 
 
@@ -74,6 +96,26 @@ def create_farm(create_state, create_customer) -> FarmProperty:
     return farm
 
 
+@pytest.fixture(scope="function")
+def assert_index_scan() -> Callable[[QuerySet], str]:
+    """Fixture to provide a checker which EXPLAINs a queryset, with sequential scans disabled, and fails when the
+    plan still falls back to one, meaning no index covers the query. It only runs on the Postgres test database.
+    Returns:
+        Callable: Return the checker, which returns the query plan
+    """
+    if connection.vendor != "postgresql":
+        pytest.skip("Query plans are only checked on Postgres")
+
+    def checker(queryset: QuerySet) -> str:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        assert "Seq Scan" not in plan, plan
+        return plan
+
+    return checker
+
+
 @pytest.fixture(scope="function")
 def create_token(create_user) -> Token:
     """Fixture to provide an Token, based on user instance
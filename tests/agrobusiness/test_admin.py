@@ -0,0 +1,19 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from agrobusiness.models import PlantingType
+
+
+@pytest.mark.django_db
+def test_planting_changelist_constant_queries(admin_client, create_farm) -> None:
+    """_Unit test for validate the planting changelist does not run one farm query per row"""
+    PlantingType.objects.create(plant_name="cultura inicial", farm=create_farm)
+    with CaptureQueriesContext(connection) as few_rows:
+        assert admin_client.get("/admin/agrobusiness/plantingtype/").status_code == 200
+    PlantingType.objects.bulk_create(
+        [PlantingType(plant_name=f"cultura {index}", farm=create_farm) for index in range(20)]
+    )
+    with CaptureQueriesContext(connection) as many_rows:
+        assert admin_client.get("/admin/agrobusiness/plantingtype/").status_code == 200
+    assert len(many_rows.captured_queries) == len(few_rows.captured_queries)
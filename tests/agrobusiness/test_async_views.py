@@ -0,0 +1,166 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient
+
+from agrobusiness.loadtest import LOAD_TEST_ENDPOINTS, load_endpoint
+from agrobusiness.models import PlantingType
+
+
+async def _async_get(url: str, headers: dict):
+    """Helper to await the GET request of the async test client
+    Returns:
+        HttpResponse: Return the response
+    """
+    return await AsyncClient().get(url, headers=headers)
+
+
+def async_get(url: str, headers: dict = None):
+    """Helper to send a GET request through the ASGI handler of the test client
+    Returns:
+        HttpResponse: Return the response
+    """
+    return async_to_sync(_async_get)(url, headers or {})
+
+
+@pytest.fixture(scope="function")
+def stub_server() -> str:
+    """Fixture to provide a local HTTP server which answers 200, or 500 on the /error path
+    Returns:
+        str: Return the base url of the server
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(500 if self.path == "/error" else 200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", list(LOAD_TEST_ENDPOINTS))
+@pytest.mark.parametrize("query", ["", "?state=sp&include=farms&top=2"])
+def test_async_views_parity(api_client, create_token, create_farm, name, query) -> None:
+    """_Unit test for validate the async views answer the same data as the viewsets, sharing the stats cache"""
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    sync_path, async_path = LOAD_TEST_ENDPOINTS[name]
+    if name.endswith("-list"):
+        query = "?state=sp" if name != "customer-list" else ""
+    expected = api_client.get(sync_path + query, headers=headers)
+    response = async_get(async_path + query, headers)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(response.content) == json.loads(expected.content)
+    if name.startswith("stats-"):
+        assert response["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_async_list_pages(create_token, create_farm) -> None:
+    """_Unit test for validate the async list walks every row by the cursor links"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    data = json.loads(async_get("/api/async/planting?page_size=2", headers).content)
+    ids = [row["id"] for row in data["results"]]
+    while data["next"]:
+        data = json.loads(async_get(data["next"], headers).content)
+        ids += [row["id"] for row in data["results"]]
+    assert ids == [str(pk) for pk in PlantingType.objects.order_by("-created_at", "-id").values_list("id", flat=True)]
+    assert len(set(ids)) == len(ids)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["/api/async/farm?state=pb", "/api/async/farm/stats/total-farms"])
+def test_async_not_modified(create_token, create_farm, django_capture_on_commit_callbacks, path) -> None:
+    """_Unit test for validate the async views answer 304 while the ETag matches, and a new ETag after a change"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = async_get(path, headers)
+    etag = response["ETag"]
+    response = async_get(path, {**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response.content == b""
+    with django_capture_on_commit_callbacks(execute=True):
+        create_farm.name = "Fazenda Renomeada"
+        create_farm.save()
+    response = async_get(path, {**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_async_view_errors(create_token, create_user) -> None:
+    """_Unit test for validate the async views answer 401 without a valid token and 400 for invalid params"""
+    response = async_get("/api/async/farm")
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+    assert async_get("/api/async/farm", {"Authorization": "Bearer invalid"}).status_code == 401
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    assert async_get("/api/async/farm?customer=invalid", headers).status_code == 400
+    assert async_get("/api/async/farm?expand=state", headers).status_code == 400
+    assert async_get("/api/async/farm/stats/chart/agricultural-land?top=0", headers).status_code == 400
+    create_user.is_active = False
+    create_user.save()
+    assert async_get("/api/async/farm", headers).status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_request_metrics(create_token, settings) -> None:
+    """_Unit test for validate the request metrics count the queries run by the async ORM"""
+    settings.REQUEST_METRICS_ENABLED = True
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = async_get("/api/async/farm", headers)
+    assert response.status_code == 200
+    assert 'desc="3 queries"' in response["Server-Timing"]
+
+
+def test_load_endpoint(stub_server) -> None:
+    """_Unit test for validate the load runner sends every request and counts the failed ones"""
+    metrics = load_endpoint(f"{stub_server}/ok", {}, requests=20, concurrency=4)
+    assert metrics["requests"] == 20
+    assert metrics["errors"] == 0
+    assert metrics["throughput_rps"] > 0
+    assert metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["p99_ms"]
+    assert load_endpoint(f"{stub_server}/error", {}, requests=3, concurrency=2)["errors"] == 3
+
+
+@pytest.mark.django_db
+def test_load_test_command(stub_server, tmp_path) -> None:
+    """_Unit test for validate the load test compares both deployments on every asked endpoint"""
+    output = tmp_path / "load.json"
+    call_command(
+        "load_test",
+        "--sync-url",
+        stub_server,
+        "--async-url",
+        stub_server,
+        "--requests",
+        "4",
+        "--concurrency",
+        "2",
+        "--endpoint",
+        "farm-list",
+        "--output",
+        str(output),
+    )
+    results = json.loads(output.read_text())
+    assert list(results["endpoints"]) == ["farm-list"]
+    assert results["endpoints"]["farm-list"]["sync"]["errors"] == 0
+    assert results["endpoints"]["farm-list"]["throughput_ratio"] > 0
+    with pytest.raises(CommandError):
+        call_command("load_test", "--sync-url", "file:///etc/passwd")
@@ -0,0 +1,225 @@
+import runpy
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from agrobusiness.authentication import CachedJWTAuthentication, PermissionCache, build_token_backend, token_cache
+from agrobusiness.models import Customer
+
+OLD_KEY = "old-signing-key-of-the-tests-0000000"
+NEW_KEY = "new-signing-key-of-the-tests-1111111"
+
+
+def authenticate(token: str):
+    """Helper to authenticate a request with the Bearer token
+    Returns:
+        Tuple: Return the user and the validated token
+    """
+    request = APIRequestFactory().get("/api/farm", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return CachedJWTAuthentication().authenticate(request)
+
+
+def test_token_backend_rotation() -> None:
+    """_Unit test for validate the tokens signed by a previous key stay valid while the key is kept for
+    verification, and new tokens are signed by the first key"""
+    previous, rotated = build_token_backend([OLD_KEY]), build_token_backend([NEW_KEY, OLD_KEY])
+    token = previous.encode({"user_id": 1})
+    assert rotated.decode(token) == {"user_id": 1}
+    with pytest.raises(TokenBackendError):
+        previous.decode(rotated.encode({"user_id": 2}))
+    with pytest.raises(TokenBackendError):
+        build_token_backend([NEW_KEY]).decode(token)
+
+
+@pytest.mark.django_db
+def test_rotated_key_requests(api_client, create_user, monkeypatch) -> None:
+    """_Unit test for validate a token signed before the rotation is accepted until its key is removed"""
+    monkeypatch.setattr(state, "token_backend", build_token_backend([OLD_KEY]))
+    token = str(RefreshToken.for_user(create_user).access_token)
+    monkeypatch.setattr(state, "token_backend", build_token_backend([NEW_KEY, OLD_KEY]))
+    assert api_client.get("/api/farm", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    token_cache.clear()
+    monkeypatch.setattr(state, "token_backend", build_token_backend([NEW_KEY]))
+    assert api_client.get("/api/farm", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_verified_token_cache(create_token, django_assert_num_queries, monkeypatch) -> None:
+    """_Unit test for validate a repeated token skips the signature check and the user query"""
+    token = str(create_token.access_token)
+    with django_assert_num_queries(1):
+        user, validated_token = authenticate(token)
+    monkeypatch.setattr(state.token_backend, "decode", lambda *args, **kwargs: pytest.fail("token decoded"))
+    with django_assert_num_queries(0):
+        cached_user, cached_token = authenticate(token)
+    assert cached_user.pk == user.pk and cached_user is not user
+    assert cached_token is validated_token
+
+
+@pytest.mark.django_db
+def test_verified_token_cache_checks_token(api_client, create_token) -> None:
+    """_Unit test for validate a token with the JTI of a cached one but another signature is not reused"""
+    token = str(create_token.access_token)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert api_client.get("/api/farm", headers=headers).status_code == 200
+    header, payload, signature = token.split(".")
+    forged = f"{header}.{payload}.{signature[::-1]}"
+    assert api_client.get("/api/farm", headers={"Authorization": f"Bearer {forged}"}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_verified_token_cache_invalidation(api_client, create_user, create_token) -> None:
+    """_Unit test for validate a deactivated user is rejected at once, even with a cached token"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    assert api_client.get("/api/farm", headers=headers).status_code == 200
+    create_user.is_active = False
+    create_user.save()
+    assert api_client.get("/api/farm", headers=headers).status_code == 401
+
+
+@pytest.mark.django_db
+def test_verified_token_cache_bounds(create_user, django_assert_num_queries, settings) -> None:
+    """_Unit test for validate the cache keeps JWT_TOKEN_CACHE_SIZE tokens for JWT_TOKEN_CACHE_TTL seconds"""
+    settings.JWT_TOKEN_CACHE_SIZE = 1
+    first, second = (str(RefreshToken.for_user(create_user).access_token) for _ in range(2))
+    authenticate(first)
+    authenticate(second)
+    with django_assert_num_queries(1):
+        authenticate(first)
+    settings.JWT_TOKEN_CACHE_TTL = 0
+    authenticate(second)
+    with django_assert_num_queries(1):
+        authenticate(second)
+
+
+@pytest.fixture(scope="function")
+def farm_group(create_user) -> Group:
+    """Fixture to provide a group of the test user, allowed to add farms
+    Returns:
+        Group: Return the group
+    """
+    group = Group.objects.create(name="farmers")
+    group.permissions.add(Permission.objects.get(codename="add_farmproperty"))
+    create_user.groups.add(group)
+    return group
+
+
+@pytest.mark.django_db
+def test_permission_cache(create_user, farm_group, django_assert_num_queries) -> None:
+    """_Unit test for validate the permissions of a user are resolved once for every instance of the user"""
+    with django_assert_num_queries(3):
+        assert User.objects.get(pk=create_user.pk).has_perm("agrobusiness.add_farmproperty")
+    user = User.objects.get(pk=create_user.pk)
+    with django_assert_num_queries(0):
+        assert user.has_perm("agrobusiness.add_farmproperty")
+        assert not user.has_perm("agrobusiness.add_customer")
+        assert user.has_module_perms("agrobusiness")
+
+
+@pytest.mark.django_db
+def test_permission_cache_invalidation(create_user, farm_group) -> None:
+    """_Unit test for validate the cached permissions follow the changes of the user, its groups and permissions"""
+    has_perm = lambda perm: User.objects.get(pk=create_user.pk).has_perm(perm)  # noqa: E731
+    assert not has_perm("agrobusiness.add_customer")
+    create_user.user_permissions.add(Permission.objects.get(codename="add_customer"))
+    assert has_perm("agrobusiness.add_customer")
+    farm_group.permissions.add(Permission.objects.get(codename="change_farmproperty"))
+    assert has_perm("agrobusiness.change_farmproperty")
+    farm_group.user_set.remove(create_user)
+    assert not has_perm("agrobusiness.add_farmproperty")
+    create_user.is_active = False
+    create_user.save()
+    assert not has_perm("agrobusiness.add_customer")
+
+
+@pytest.mark.django_db
+def test_permission_cache_ttl(create_user, farm_group, django_assert_num_queries, settings) -> None:
+    """_Unit test for validate the permissions are resolved on every instance without PERMISSION_CACHE_TTL"""
+    settings.PERMISSION_CACHE_TTL = 0
+    User.objects.get(pk=create_user.pk).has_perm("agrobusiness.add_farmproperty")
+    with django_assert_num_queries(3):
+        User.objects.get(pk=create_user.pk).has_perm("agrobusiness.add_farmproperty")
+
+
+def test_permission_cache_size(settings) -> None:
+    """_Unit test for validate the least recently used permissions are dropped above PERMISSION_CACHE_SIZE"""
+    settings.PERMISSION_CACHE_SIZE = 2
+    cache = PermissionCache()
+    cache.set(1, "user", {"a"})
+    cache.set(2, "user", {"b"})
+    assert cache.get(1, "user") == {"a"}
+    cache.set(3, "user", {"c"})
+    assert cache.get(2, "user") is None
+    assert cache.get(1, "user") == {"a"}
+    assert cache.get(3, "user") == {"c"}
+
+
+@pytest.mark.django_db
+def test_model_permission_steady_state(create_user, farm_group, django_assert_num_queries) -> None:
+    """_Unit test for validate a repeated request authenticates and checks its model permissions without queries"""
+    token = str(RefreshToken.for_user(create_user).access_token)
+    view = type("View", (), {"queryset": Customer.objects.all()})()
+
+    def check(method: str) -> bool:
+        request = Request(getattr(APIRequestFactory(), method)("/api/customer"))
+        request.user = authenticate(token)[0]
+        return DjangoModelPermissionsOrAnonReadOnly().has_permission(request, view)
+
+    assert not check("post")
+    with django_assert_num_queries(0):
+        assert check("get")
+        assert not check("post")
+
+
+SETTINGS_PATH = str(Path(__file__).resolve().parents[2] / "core" / "settings.py")
+
+
+@pytest.mark.parametrize(
+    "env, keys",
+    [
+        ({"SECRET_KEY": OLD_KEY}, [OLD_KEY]),
+        ({"JWT_SIGNING_KEYS": f"{NEW_KEY},{OLD_KEY}"}, [NEW_KEY, OLD_KEY]),
+        ({"SECRET_KEY": OLD_KEY, "JWT_SIGNING_KEYS": NEW_KEY}, [NEW_KEY]),
+        ({"MODE_DEBUG": "1"}, None),
+    ],
+)
+def test_signing_key_settings(monkeypatch, env, keys) -> None:
+    """_Unit test for validate the settings read the shared keys, and only generate a random one on MODE_DEBUG"""
+    for name in ("SECRET_KEY", "JWT_SIGNING_KEYS", "JWT_SIGNING_KEYS_FILE", "MODE_DEBUG"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    loaded = runpy.run_path(SETTINGS_PATH)
+    assert loaded["SIMPLE_JWT"]["SIGNING_KEY"] == loaded["JWT_SIGNING_KEYS"][0]
+    if keys is not None:
+        assert loaded["JWT_SIGNING_KEYS"] == keys
+    else:
+        assert loaded["JWT_SIGNING_KEYS"] == [loaded["SECRET_KEY"]]
+
+
+def test_signing_key_settings_file(monkeypatch, tmp_path) -> None:
+    """_Unit test for validate the keys are read one per line from JWT_SIGNING_KEYS_FILE"""
+    keys_file = tmp_path / "jwt-keys"
+    keys_file.write_text(f"{NEW_KEY}\n\n{OLD_KEY}\n")
+    for name in ("SECRET_KEY", "JWT_SIGNING_KEYS", "MODE_DEBUG"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("JWT_SIGNING_KEYS_FILE", str(keys_file))
+    loaded = runpy.run_path(SETTINGS_PATH)
+    assert loaded["JWT_SIGNING_KEYS"] == [NEW_KEY, OLD_KEY]
+    assert loaded["SECRET_KEY"] == NEW_KEY
+
+
+def test_signing_key_settings_required(monkeypatch) -> None:
+    """_Unit test for validate the settings refuse a random key outside MODE_DEBUG"""
+    for name in ("SECRET_KEY", "JWT_SIGNING_KEYS", "JWT_SIGNING_KEYS_FILE", "MODE_DEBUG"):
+        monkeypatch.delenv(name, raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        runpy.run_path(SETTINGS_PATH)
@@ -0,0 +1,74 @@
+import json
+import random
+
+import pytest
+from django.core.management import CommandError, call_command
+from django_cpf_cnpj.cnpj import CNPJ
+from django_cpf_cnpj.cpf import CPF
+
+from agrobusiness.benchmarks import BENCHMARK_ENDPOINTS, compare_results, percentile
+from agrobusiness.models import Customer, FarmProperty, PlantingType, validate_farm_areas
+from agrobusiness.rollups import verify_rollups
+from agrobusiness.synthetic import generate_cnpj, generate_cpf, populate, synthetic_id
+
+
+def test_synthetic_documents() -> None:
+    """_Unit test for validate the generated CPF and CNPJ documents pass the document validators"""
+    rng = random.Random(1)
+    assert all(CPF(generate_cpf(rng)).is_valid() for _ in range(200))
+    assert all(CNPJ(generate_cnpj(rng)).is_valid() for _ in range(200))
+
+
+def test_percentile() -> None:
+    """_Unit test for validate the nearest-rank percentile"""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 95) == 3
+
+
+@pytest.mark.django_db
+def test_populate_synthetic_data() -> None:
+    """_Unit test for validate the seeded generator builds valid rows, refreshes the rollups and is idempotent"""
+    before = Customer.objects.count()
+    call_command("seed_synthetic", "--customers", "20", "--farms", "30", "--plantings", "40", "--seed", "7")
+    assert Customer.objects.count() == before + 20
+    farms = FarmProperty.objects.filter(name__startswith="Fazenda ", customer__name__startswith="Produtor ")
+    assert farms.count() == 30
+    for farm in farms:
+        validate_farm_areas(farm.area, farm.farming_area, farm.plant_area)
+    assert PlantingType.objects.filter(id=synthetic_id(7, "planting", 39)).exists()
+    assert verify_rollups() == []
+    populate(20, 30, 40, seed=7, batch_size=50)
+    assert Customer.objects.count() == before + 20
+
+
+@pytest.mark.django_db
+def test_benchmark_api(tmp_path) -> None:
+    """_Unit test for validate the benchmark run records every endpoint and flags the regressions"""
+    output = tmp_path / "results.json"
+    call_command("benchmark_api", "--iterations", "2", "--output", str(output))
+    results = json.loads(output.read_text())
+    assert set(results["endpoints"]) == set(BENCHMARK_ENDPOINTS)
+    assert all(metrics["status"] == 200 for metrics in results["endpoints"].values())
+    baseline = json.loads(output.read_text())
+    baseline["endpoints"]["farm-list"]["queries"] -= 1
+    assert compare_results(results, baseline, threshold=0.2) == [
+        f"farm-list queries: {results['endpoints']['farm-list']['queries'] - 1} -> "
+        f"{results['endpoints']['farm-list']['queries']}"
+    ]
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+    with pytest.raises(CommandError):
+        call_command(
+            "benchmark_api",
+            "--iterations",
+            "1",
+            "--output",
+            str(output),
+            "--baseline",
+            str(baseline_path),
+            "--threshold",
+            "1000",
+            "--fail-on-regression",
+        )
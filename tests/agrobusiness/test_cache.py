@@ -0,0 +1,104 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from agrobusiness.models import FarmProperty, PlantingType
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/states/stats/chart/state-farms",
+        "/api/farm/stats/total-farms",
+        "/api/farm/stats/total-areas",
+        "/api/farm/stats/chart/agricultural-land",
+        "/api/planting/stats/chart/cultivation-by-name",
+    ],
+)
+def test_stats_cache_hit(api_client, django_db_setup, create_token, django_assert_num_queries, url) -> None:
+    """_Unit test for validate the stats endpoints are served from cache on the second request, which also reuses
+    the verified token"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get(url, headers=headers, format="json")
+    with django_assert_num_queries(1):
+        second = api_client.get(url, headers=headers, format="json")
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert first.data == second.data
+
+
+@pytest.mark.django_db
+def test_stats_cache_query_params(api_client, django_db_setup, create_token) -> None:
+    """_Unit test for validate the stats cache keeps one entry by query params"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    url = "/api/farm/stats/chart/agricultural-land"
+    api_client.get(url, headers=headers, format="json")
+    response = api_client.get(url, {"top": 1}, headers=headers)
+    assert response["X-Cache"] == "MISS"
+    assert len(response.data) == 2
+
+
+@pytest.mark.django_db
+def test_stats_cache_invalidated_on_save(
+    api_client, create_token, create_farm, django_capture_on_commit_callbacks
+) -> None:
+    """_Unit test for validate the farm stats cache is invalidated when a farm is saved or deleted"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    url = "/api/farm/stats/total-areas"
+    before = api_client.get(url, headers=headers, format="json")
+    with django_capture_on_commit_callbacks(execute=True):
+        FarmProperty.objects.create(
+            name="Fazenda Nova",
+            customer=create_farm.customer,
+            state=create_farm.state,
+            city="Campina Grande",
+            area=Decimal(5),
+            farming_area=Decimal(1),
+            plant_area=Decimal(1),
+        )
+    after_save = api_client.get(url, headers=headers, format="json")
+    assert after_save["X-Cache"] == "MISS"
+    assert after_save.data["farms_area_total"] == before.data["farms_area_total"] + Decimal(5)
+    with django_capture_on_commit_callbacks(execute=True):
+        create_farm.delete()
+    after_delete = api_client.get(url, headers=headers, format="json")
+    assert after_delete["X-Cache"] == "MISS"
+    assert after_delete.data["farms_area_total"] == before.data["farms_area_total"] + Decimal(5) - Decimal(10)
+
+
+@pytest.mark.django_db
+def test_stats_cache_invalidated_on_commit(
+    api_client, create_token, create_farm, django_capture_on_commit_callbacks
+) -> None:
+    """_Unit test for validate the farm stats cache is only invalidated when the transaction of the change commits,
+    so a request running before the commit can not cache the previous data under the new version"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    url = "/api/farm/stats/total-areas"
+    api_client.get(url, headers=headers, format="json")
+    with django_capture_on_commit_callbacks() as callbacks:
+        create_farm.area = Decimal(20)
+        create_farm.save()
+    assert api_client.get(url, headers=headers, format="json")["X-Cache"] == "HIT"
+    for callback in callbacks:
+        callback()
+    assert api_client.get(url, headers=headers, format="json")["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+def test_stats_cache_precise_invalidation(
+    api_client, create_token, create_farm, django_capture_on_commit_callbacks
+) -> None:
+    """_Unit test for validate a planting change does not invalidate the farm stats cache"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    farm_url = "/api/farm/stats/total-farms"
+    planting_url = "/api/planting/stats/chart/cultivation-by-name"
+    api_client.get(farm_url, headers=headers, format="json")
+    api_client.get(planting_url, headers=headers, format="json")
+    with django_capture_on_commit_callbacks(execute=True):
+        PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    assert api_client.get(farm_url, headers=headers, format="json")["X-Cache"] == "HIT"
+    assert api_client.get(planting_url, headers=headers, format="json")["X-Cache"] == "MISS"
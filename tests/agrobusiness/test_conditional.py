@@ -0,0 +1,111 @@
+import pytest
+
+from agrobusiness.models import FarmProperty
+
+
+@pytest.mark.django_db
+def test_updated_at_changes_on_update(create_farm) -> None:
+    """_Unit test for validate updated_at moves on every save, while created_at is kept"""
+    created_at, updated_at = create_farm.created_at, create_farm.updated_at
+    create_farm.name = "Fazenda Nova"
+    create_farm.save()
+    create_farm.refresh_from_db()
+    assert create_farm.created_at == created_at
+    assert create_farm.updated_at > updated_at
+
+
+@pytest.mark.django_db
+def test_list_not_modified(api_client, create_token, create_farm, django_assert_num_queries) -> None:
+    """_Unit test for validate the list answers 304 while its rows are the same, and a new ETag after an update or
+    a delete"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get("/api/farm", headers=headers)
+    assert first.status_code == 200
+    assert "Last-Modified" not in first
+    with django_assert_num_queries(1):
+        cached = api_client.get("/api/farm", headers={**headers, "If-None-Match": first["ETag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached["ETag"] == first["ETag"]
+    create_farm.name = "Fazenda Nova"
+    create_farm.save()
+    updated = api_client.get("/api/farm", headers={**headers, "If-None-Match": first["ETag"]})
+    assert updated.status_code == 200
+    assert updated["ETag"] != first["ETag"]
+    FarmProperty.objects.exclude(id=create_farm.id).delete()
+    deleted = api_client.get("/api/farm", headers={**headers, "If-None-Match": updated["ETag"]})
+    assert deleted.status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_etag_by_page_window(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate the list ETag only depends on the rows of the page, and changes when a row of the
+    page is deleted and replaced by the next one"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    url = "/api/farm?page_size=1"
+    first = api_client.get(url, headers=headers)
+    assert first.status_code == 200
+    _, following, *others = FarmProperty.objects.order_by("-created_at", "-id")
+    FarmProperty.objects.filter(id__in=[farm.id for farm in others]).update(name="Fazenda Fora da Pagina")
+    assert api_client.get(url, headers={**headers, "If-None-Match": first["ETag"]}).status_code == 304
+    following.delete()
+    deleted = api_client.get(url, headers={**headers, "If-None-Match": first["ETag"]})
+    assert deleted.status_code == 200
+    assert deleted["ETag"] != first["ETag"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/api/farm", "/api/farm/stats/total-areas"])
+def test_list_without_last_modified(api_client, create_token, create_farm, url) -> None:
+    """_Unit test for validate the list and stats do not send Last-Modified, so an If-Modified-Since does not hide
+    a delete"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert "Last-Modified" not in first
+    FarmProperty.objects.exclude(id=create_farm.id).delete()
+    since = {**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    assert api_client.get(url, headers=since).status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_etag_by_query_params(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate the ETag depends on the query params of the list"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get("/api/farm", headers=headers)
+    other = api_client.get("/api/farm?fields=id,name", headers={**headers, "If-None-Match": first["ETag"]})
+    assert other.status_code == 200
+    assert other["ETag"] != first["ETag"]
+
+
+@pytest.mark.django_db
+def test_detail_not_modified(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate the detail answers 304 on If-Modified-Since, and 404 for an invalid id"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get(f"/api/farm/{create_farm.id}", headers=headers)
+    assert first.status_code == 200
+    cached = api_client.get(
+        f"/api/farm/{create_farm.id}", headers={**headers, "If-Modified-Since": first["Last-Modified"]}
+    )
+    assert cached.status_code == 304
+    assert api_client.get("/api/farm/invalid", headers=headers).status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/states/stats/chart/state-farms",
+        "/api/farm/stats/total-areas",
+        "/api/planting/stats/chart/cultivation-by-name",
+    ],
+)
+def test_stats_not_modified(api_client, create_token, create_farm, url) -> None:
+    """_Unit test for validate the stats answer 304 until a farm changes"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert api_client.get(url, headers={**headers, "If-None-Match": first["ETag"]}).status_code == 304
+    create_farm.area = 20
+    create_farm.save()
+    assert api_client.get(url, headers={**headers, "If-None-Match": first["ETag"]}).status_code == 200
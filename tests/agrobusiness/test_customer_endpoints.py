@@ -67,3 +67,19 @@ def test_list_farm(api_client, django_db_setup, create_token) -> None:
     response = api_client.get(f"/api/customer", headers=headers, format="json")
     logger.info(f"Show data: {response.data}")
     assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_get_customer_expanded_farms(api_client, create_token, create_farm, django_assert_num_queries) -> None:
+    """_Unit test for validate the customer detail expands its farms, with their state, on one request"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with django_assert_num_queries(4):
+        response = api_client.get(
+            f"/api/customer/{create_farm.customer_id}?expand=customer_farms&fields=name,customer_farms",
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.data["name"] == create_farm.customer.name
+    assert [(farm["name"], farm["state"]) for farm in response.data["customer_farms"]] == [
+        (create_farm.name, create_farm.state.acronym)
+    ]
@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from agrobusiness import dashboard
+from agrobusiness.cache import get_stats_cache
+from agrobusiness.dashboard import DashboardPanel, compute_dashboard
+from agrobusiness.models import State
+
+PANEL_URLS = {
+    "total_farms": "/api/farm/stats/total-farms",
+    "total_areas": "/api/farm/stats/total-areas",
+    "state_farms": "/api/states/stats/chart/state-farms",
+    "agricultural_land": "/api/farm/stats/chart/agricultural-land",
+    "cultivation_by_name": "/api/planting/stats/chart/cultivation-by-name",
+}
+
+
+@pytest.fixture(scope="function")
+def dashboard_headers(create_token, settings) -> dict:
+    """Fixture to provide the auth headers of the dashboard requests, computing the panels on the request thread,
+    since the pool threads do not see the rows of the test transaction
+    Returns:
+        dict: Return the request headers
+    """
+    settings.DASHBOARD_WORKERS = 1
+    yield {"Authorization": f"Bearer {str(create_token.access_token)}"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?state=sp&top=1&include=farms,area"])
+def test_dashboard_panels(api_client, dashboard_headers, create_farm, query) -> None:
+    """_Unit test for validate the dashboard returns the same data as each stats endpoint, sharing their cache"""
+    response = api_client.get(f"/api/dashboard{query}", headers=dashboard_headers)
+    assert response.status_code == 200
+    data = json.loads(response.content)
+    assert set(data["panels"]) == set(PANEL_URLS) == set(data["timings"])
+    assert all(timing["cache"] == "MISS" and timing["duration_ms"] >= 0 for timing in data["timings"].values())
+    for name, url in PANEL_URLS.items():
+        panel = api_client.get(url + query, headers=dashboard_headers)
+        assert panel["X-Cache"] == "HIT"
+        assert json.loads(panel.content) == data["panels"][name]
+    cached = json.loads(api_client.get(f"/api/dashboard{query}", headers=dashboard_headers).content)
+    assert all(timing["cache"] == "HIT" for timing in cached["timings"].values())
+
+
+@pytest.mark.django_db
+def test_dashboard_errors(api_client, dashboard_headers) -> None:
+    """_Unit test for validate the dashboard requires a token and validates the params of every panel"""
+    assert api_client.get("/api/dashboard").status_code == 401
+    assert api_client.get("/api/dashboard?top=0", headers=dashboard_headers).status_code == 400
+    assert api_client.get("/api/dashboard?include=invalid", headers=dashboard_headers).status_code == 400
+
+
+def test_dashboard_panels_run_concurrently(settings) -> None:
+    """_Unit test for validate the panels run at the same time on the thread pool, keeping their order"""
+    settings.DASHBOARD_WORKERS = 5
+    # Every panel waits for the others, so the barrier breaks if they are not running at the same time
+    barrier = threading.Barrier(4, timeout=5)
+
+    def waiting_panel(value: int) -> DashboardPanel:
+        def compute(request) -> dict:
+            barrier.wait()
+            return {"value": value}
+
+        return DashboardPanel(f"panel_{value}", f"test_panel_{value}", [], compute)
+
+    request = Request(APIRequestFactory().get("/api/dashboard"))
+    data = compute_dashboard(request, [waiting_panel(value) for value in range(4)])
+    assert list(data["panels"].values()) == [{"value": value} for value in range(4)]
+    assert not barrier.broken
+
+
+@pytest.mark.django_db
+def test_dashboard_pool_connections(settings, monkeypatch) -> None:
+    """_Unit test for validate the pool threads read the database on their own connection, kept open for the next
+    requests by CONN_MAX_AGE, and return the same panels as the request thread. The test runs on its own pool, shut
+    down at the end, so the kept connections do not reach the tests without database access"""
+    monkeypatch.setattr(dashboard, "_executor", None)
+    # The pool threads build their connections from the same settings dict, as a WSGI deployment with DB_CONN_MAX_AGE
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 60)
+    assert connection.settings_dict["CONN_HEALTH_CHECKS"]
+
+    def connection_panel(request) -> dict:
+        return {"states": State.objects.count(), "close_at": connection.close_at}
+
+    request = Request(APIRequestFactory().get("/api/dashboard"))
+    settings.DASHBOARD_WORKERS = 1
+    sequential = compute_dashboard(request)["panels"]
+    get_stats_cache().clear()
+    settings.DASHBOARD_WORKERS = 3
+    panels = [
+        DashboardPanel(f"connection_{index}", f"test_connection_{index}", [], connection_panel) for index in range(3)
+    ]
+    started = time.monotonic()
+    try:
+        for panel in compute_dashboard(request, panels)["panels"].values():
+            assert panel["states"] > 0
+            assert panel["close_at"] > started
+        assert compute_dashboard(request)["panels"] == sequential
+    finally:
+        dashboard._get_executor().shutdown(wait=True)
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import logging
+
+import pytest
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, model",
+    [
+        ("/api/customer/export/csv", Customer),
+        ("/api/farm/export/csv", FarmProperty),
+        ("/api/planting/export/csv", PlantingType),
+    ],
+)
+def test_export_csv(api_client, django_db_setup, create_token, django_assert_num_queries, url, model) -> None:
+    """_Unit test for validate endpoint to export every row as a streamed CSV, with a single data query, and the
+    datetimes formatted as the list"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with django_assert_num_queries(2):
+        response = api_client.get(url, headers=headers)
+        content = b"".join(response.streaming_content).decode()
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == model.objects.count()
+    assert {row["id"] for row in rows} == {str(pk) for pk in model.objects.values_list("id", flat=True)}
+    listed = api_client.get(url.split("/export/")[0], headers=headers).json()["results"]
+    exported = {row["id"]: row["created_at"] for row in rows}
+    assert all(exported[item["id"]] == item["created_at"] for item in listed)
+
+
+@pytest.mark.django_db
+def test_export_ndjson_filtered(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate endpoint to export the filtered farms as a streamed NDJSON"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    params = {"customer": str(create_farm.customer.id)}
+    response = api_client.get("/api/farm/export/ndjson", params, headers=headers)
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    logger.info(f"Show data: {lines}")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    listed = api_client.get("/api/farm", params, headers=headers).json()["results"][0]
+    assert listed["created_at"].endswith("-03:00")
+    assert [json.loads(line) for line in lines] == [
+        {
+            "id": str(create_farm.id),
+            "customer": str(create_farm.customer.id),
+            "state": create_farm.state.acronym,
+            "name": create_farm.name,
+            "city": create_farm.city,
+            "area": "10.00",
+            "farming_area": "1.00",
+            "plant_area": "2.00",
+            "created_at": listed["created_at"],
+            "updated_at": listed["updated_at"],
+        }
+    ]
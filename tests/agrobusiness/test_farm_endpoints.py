@@ -1,9 +1,13 @@
+import json
 import logging
 from decimal import Decimal
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from agrobusiness.models import FarmProperty
+from agrobusiness.models import FarmProperty, PlantingType
+from agrobusiness.rollups import verify_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -182,3 +186,175 @@ def test_list_farm(api_client, django_db_setup, create_token) -> None:
     response = api_client.get(f"/api/farm", headers=headers, format="json")
     logger.info(f"Show data: {response.data}")
     assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_total_area_values(api_client, django_db_setup, create_token, django_assert_num_queries) -> None:
+    """_Unit test for validate endpoint for stats total area sums every area field in a single query"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    farms = FarmProperty.objects.all()
+    with django_assert_num_queries(3):
+        response = api_client.get("/api/farm/stats/total-areas", headers=headers, format="json")
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    assert response.data["farms_area_total"] == sum(farm.area for farm in farms)
+    assert response.data["farming_area_total"] == sum(farm.farming_area for farm in farms)
+    assert response.data["plant_area_total"] == sum(farm.plant_area for farm in farms)
+
+
+@pytest.mark.django_db
+def test_total_area_filtered(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate endpoint for stats total area accepts the list endpoint filters"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    params = {"customer": str(create_farm.customer.id), "city": create_farm.city}
+    response = api_client.get("/api/farm/stats/total-areas", params, headers=headers)
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    assert response.data["farms_area_total"] == create_farm.area
+    assert response.data["farming_area_total"] == create_farm.farming_area
+    assert response.data["plant_area_total"] == create_farm.plant_area
+
+
+@pytest.mark.django_db
+def test_chart_agricultural_land_top(api_client, django_db_setup, create_token, django_assert_num_queries) -> None:
+    """_Unit test for validate endpoint for chart agricultural_land folds the farms past top into others"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    farms = FarmProperty.objects.all()
+    with django_assert_num_queries(3):
+        response = api_client.get("/api/farm/stats/chart/agricultural-land", {"top": 2}, headers=headers)
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    assert len(response.data) == 3
+    assert response.data[-1]["farm_name"] == "others"
+    assert sum(item["agricultural_land"] for item in response.data) == sum(farm.agricultal_land for farm in farms)
+    assert sum(item["agricultural_land_percentage"] for item in response.data) == pytest.approx(1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("top", ["0", "abc"])
+def test_chart_agricultural_land_invalid_top(api_client, create_token, top) -> None:
+    """_Unit test for validate endpoint for chart agricultural_land rejects an invalid top"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/farm/stats/chart/agricultural-land", {"top": top}, headers=headers)
+    assert response.status_code == 400
+
+
+def build_bulk_rows(customer, state, total) -> list:
+    """_Helper to build valid rows for the bulk endpoint"""
+    return [
+        {
+            "name": f"Fazenda {index}",
+            "city": "Sousa",
+            "state": state.acronym,
+            "customer": str(customer.id),
+            "area": "10.00",
+            "farming_area": "4.00",
+            "plant_area": "3.50",
+        }
+        for index in range(total)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_create_farms(api_client, create_token, create_customer, create_state, django_assert_max_num_queries):
+    """_Unit test for validate endpoint to bulk create farms with a constant number of queries"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    rows = build_bulk_rows(create_customer, create_state, 50)
+    with django_assert_max_num_queries(15):
+        response = api_client.post("/api/farm/bulk", data=rows, headers=headers, format="json")
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 201
+    assert response.data == {"created": 50, "updated": 0}
+    assert FarmProperty.objects.filter(customer=create_customer, city="Sousa").count() == 50
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_farms_ndjson(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate endpoint to bulk update farms sent as NDJSON"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    rows = build_bulk_rows(create_farm.customer, create_farm.state, 2)
+    rows[0].update({"id": str(create_farm.id), "area": "20.00"})
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = api_client.post("/api/farm/bulk", data=body, headers=headers, content_type="application/x-ndjson")
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 201
+    assert response.data == {"created": 1, "updated": 1}
+    create_farm.refresh_from_db()
+    assert create_farm.area == Decimal(20)
+    assert create_farm.name == "Fazenda 0"
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_bulk_farms_row_errors(api_client, create_token, create_customer, create_state) -> None:
+    """_Unit test for validate endpoint to bulk create farms reports the errors by row and writes nothing"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    rows = build_bulk_rows(create_customer, create_state, 4)
+    rows[1]["farming_area"] = "11.00"
+    rows[2]["state"] = "ZZ"
+    rows[3]["area"] = "abc"
+    total = FarmProperty.objects.count()
+    response = api_client.post("/api/farm/bulk", data=rows, headers=headers, format="json")
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 400
+    assert [error["row"] for error in response.data["errors"]] == [1, 2, 3]
+    assert response.data["errors"][0]["errors"]["non_field_errors"] == [
+        "Área agricultavél maior que a área da propriedade."
+    ]
+    assert "state" in response.data["errors"][1]["errors"]
+    assert "area" in response.data["errors"][2]["errors"]
+    assert FarmProperty.objects.count() == total
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page_size", [2, 20])
+def test_list_farms_constant_queries(
+    api_client, create_token, create_customer, create_state, page_size, django_assert_num_queries
+) -> None:
+    """_Unit test for validate the farm list runs the same number of queries for any page size"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    api_client.post(
+        "/api/farm/bulk", data=build_bulk_rows(create_customer, create_state, 20), headers=headers, format="json"
+    )
+    with django_assert_num_queries(2):
+        response = api_client.get(f"/api/farm?page_size={page_size}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.data["results"]) == page_size
+
+
+@pytest.mark.django_db
+def test_list_farms_expanded(api_client, create_token, create_farm, django_assert_num_queries) -> None:
+    """_Unit test for validate the farm list expands the customer, state and cultivations with a constant number of
+    queries"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    with django_assert_num_queries(4):
+        response = api_client.get("/api/farm?expand=customer,state,cultivated_fields", headers=headers)
+    assert response.status_code == 200
+    farm = next(row for row in response.data["results"] if row["id"] == str(create_farm.id))
+    assert farm["customer"]["personal_document"] == create_farm.customer.personal_document
+    assert farm["state"]["acronym"] == create_farm.state.acronym
+    assert [field["plant_name"] for field in farm["cultivated_fields"]] == ["milho"]
+
+
+@pytest.mark.django_db
+def test_list_farms_sparse_fields(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate the farm list only reads and returns the fields asked"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get("/api/farm?fields=id,name", headers=headers)
+    assert response.status_code == 200
+    assert all(set(row) == {"id", "name"} for row in response.data["results"])
+    farm_query = next(query["sql"] for query in context.captured_queries if '"farm_property"' in query["sql"])
+    assert "plant_area" not in farm_query
+    assert '"state"' not in farm_query
+
+
+@pytest.mark.django_db
+def test_list_farms_unknown_expand(api_client, create_token) -> None:
+    """_Unit test for validate an unknown expanded or sparse field is refused"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/farm?expand=owner&fields=id,size", headers=headers)
+    assert response.status_code == 400
+    assert set(response.data) == {"expand", "fields"}
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType
+from agrobusiness.rollups import verify_rollups
+
+
+@pytest.mark.django_db
+def test_import_customers_csv(tmp_path, capsys) -> None:
+    """_Unit test for validate the import of a customer CSV, skipping and reporting the invalid rows"""
+    path = tmp_path / "customers.csv"
+    path.write_text(
+        "personal_document,name\n12345678909,Maria\n6152673100A,Invalido\n98765432100,Joao\n15076648000119,Empresa\n"
+    )
+    before = Customer.objects.count()
+    call_command("import_agro", "customer", str(path), "--batch-size", "2")
+    output = capsys.readouterr()
+    assert Customer.objects.count() == before + 3
+    assert "Row 2:" in output.err
+    assert "4 rows processed" in output.out
+    assert not (tmp_path / "customers.csv.checkpoint").exists()
+
+
+@pytest.mark.django_db
+def test_import_farms_ndjson(tmp_path, create_customer, create_state) -> None:
+    """_Unit test for validate the import of a farm NDJSON, resolving the customers by document"""
+    rows = [
+        {
+            "name": f"Fazenda Import {index}",
+            "city": "Sousa",
+            "state": create_state.acronym,
+            "customer_document": create_customer.personal_document,
+            "area": "10.00",
+            "farming_area": "4.00",
+            "plant_area": "3.50",
+        }
+        for index in range(5)
+    ]
+    path = tmp_path / "farms.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    call_command("import_agro", "farm", str(path), "--batch-size", "2")
+    assert FarmProperty.objects.filter(customer=create_customer, name__startswith="Fazenda Import").count() == 5
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_import_plantings_resume(tmp_path, create_farm) -> None:
+    """_Unit test for validate an import resumed from the checkpoint skips the rows already committed"""
+    path = tmp_path / "plantings.csv"
+    path.write_text("plant_name,farm\n" + "".join(f"cultura {index},{create_farm.id}\n" for index in range(4)))
+    (tmp_path / "plantings.csv.checkpoint").write_text("3")
+    call_command("import_agro", "planting", str(path), "--resume")
+    assert list(PlantingType.objects.filter(farm=create_farm).values_list("plant_name", flat=True)) == ["cultura 3"]
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_import_unknown_format(tmp_path) -> None:
+    """_Unit test for validate the command refuses a file without a known format"""
+    path = tmp_path / "customers.txt"
+    path.write_text("")
+    with pytest.raises(CommandError):
+        call_command("import_agro", "customer", str(path))
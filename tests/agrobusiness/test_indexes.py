@@ -0,0 +1,31 @@
+import logging
+
+import pytest
+
+from agrobusiness.models import Customer, FarmProperty, PlantingType, State
+from agrobusiness.search import CUSTOMER_SEARCH_FIELDS, FARM_SEARCH_FIELDS, search_queryset
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "build_queryset",
+    [
+        lambda farm: State.objects.filter(acronym=farm.state.acronym),
+        lambda farm: Customer.objects.order_by("-created_at", "-id")[:50],
+        lambda farm: FarmProperty.objects.order_by("-created_at", "-id")[:50],
+        lambda farm: FarmProperty.objects.filter(state=farm.state).order_by("-created_at")[:50],
+        lambda farm: FarmProperty.objects.filter(customer=farm.customer).order_by("-created_at")[:50],
+        lambda farm: FarmProperty.objects.filter(city=farm.city),
+        lambda farm: PlantingType.objects.order_by("-created_at", "-id")[:50],
+        lambda farm: PlantingType.objects.filter(farm=farm, plant_name="milho"),
+        lambda farm: PlantingType.objects.filter(plant_name="milho"),
+        lambda farm: search_queryset(Customer.objects.all(), CUSTOMER_SEARCH_FIELDS, "ceará"),
+        lambda farm: search_queryset(FarmProperty.objects.all(), FARM_SEARCH_FIELDS, "ceará"),
+    ],
+)
+def test_hot_queries_use_indexes(assert_index_scan, create_farm, build_queryset) -> None:
+    """_Unit test for validate the hot queries of the API and admin are covered by an index"""
+    plan = assert_index_scan(build_queryset(create_farm))
+    logger.info(f"Show plan: {plan}")
@@ -0,0 +1,56 @@
+import json
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from agrobusiness.views import FarmPropertyViewset
+
+
+@pytest.fixture(scope="function")
+def metrics_client(settings) -> APIClient:
+    """Fixture to provide an API client whose middleware chain is loaded with the request metrics enabled
+    Returns:
+        APIClient: Return a APIClient instance for testing
+    """
+    settings.REQUEST_METRICS_ENABLED = True
+    settings.REQUEST_QUERY_BUDGET = 20
+    yield APIClient()
+
+
+@pytest.mark.django_db
+def test_server_timing_header(metrics_client, create_token, caplog) -> None:
+    """_Unit test for validate the request metrics are sent on the Server-Timing header and on the log line"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with caplog.at_level(logging.INFO, logger="agrobusiness.metrics"):
+        response = metrics_client.get("/api/farm", headers=headers)
+    assert response.status_code == 200
+    timing = response["Server-Timing"]
+    for metric in ["db;dur=", "auth;dur=", "serialize;dur=", "render;dur=", "total;dur="]:
+        assert metric in timing
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["view"] == "FarmPropertyViewset.list"
+    assert line["status"] == 200
+    assert line["queries"] > 0
+    assert not line["over_budget"]
+
+
+@pytest.mark.django_db
+def test_query_budget_warning(metrics_client, create_token, caplog, monkeypatch) -> None:
+    """_Unit test for validate a request above the query budget of its view is logged as a warning"""
+    monkeypatch.setattr(FarmPropertyViewset, "query_budget", 1, raising=False)
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with caplog.at_level(logging.INFO, logger="agrobusiness.metrics"):
+        metrics_client.get("/api/farm", headers=headers)
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    assert json.loads(record.getMessage())["over_budget"]
+
+
+@pytest.mark.django_db
+def test_metrics_disabled(api_client, create_token) -> None:
+    """_Unit test for validate no header is sent when the request metrics are disabled"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/farm", headers=headers)
+    assert response.status_code == 200
+    assert "Server-Timing" not in response
@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.test import APIClient
+
+from agrobusiness import metrics
+from agrobusiness.metrics import MODEL_ROWS_KEY, MetricsStore, model_row_gauges
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path, monkeypatch) -> None:
+    """Fixture to provide a metrics store on an empty directory, fresh row counts and the request metrics enabled
+    for each test."""
+    settings.METRICS_DIR = str(tmp_path)
+    settings.REQUEST_METRICS_ENABLED = True
+    monkeypatch.setattr(metrics, "_store", MetricsStore(str(tmp_path), settings.METRICS_FLUSH_INTERVAL))
+    caches[settings.STATS_CACHE_ALIAS].delete(MODEL_ROWS_KEY)
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(create_token, settings) -> None:
+    """_Unit test for validate the metrics endpoint exposes the request, cache and row count metrics"""
+    settings.DEBUG = True
+    client = APIClient()
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    client.get("/api/farm/stats/total-farms", headers=headers)
+    client.get("/api/farm/stats/total-farms", headers=headers)
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    view = 'method="GET",view="FarmPropertyViewset.total_farms"'
+    assert f"agro_request_duration_seconds_count{{{view}}} 2" in body
+    assert f'agro_request_duration_seconds_bucket{{{view},le="+Inf"}} 2' in body
+    assert 'agro_stats_cache_requests_total{endpoint="total_farms",result="hit"} 1' in body
+    assert 'agro_stats_cache_requests_total{endpoint="total_farms",result="miss"} 1' in body
+    assert 'agro_model_rows{model="farmproperty"}' in body
+    assert "# TYPE agro_db_queries_total counter" in body
+
+
+def test_metrics_merge_processes(tmp_path) -> None:
+    """_Unit test for validate the files written by different processes are merged on the scrape"""
+    first, second = MetricsStore(str(tmp_path), 0), MetricsStore(str(tmp_path), 60)
+    first.inc("agro_db_queries_total", {"view": "a"}, 3)
+    first.observe("agro_request_duration_seconds", {"view": "a"}, 0.02)
+    second.inc("agro_db_queries_total", {"view": "a"}, 4)
+    second.observe("agro_request_duration_seconds", {"view": "a"}, 3)
+    second.flush()
+    counters, histograms = first.collect()
+    assert list(counters["agro_db_queries_total"].values()) == [7]
+    histogram = list(histograms["agro_request_duration_seconds"].values())[0]
+    assert histogram["count"] == 2
+    assert histogram["buckets"][2] == 1
+    assert histogram["buckets"][-1] == 2
+
+
+@pytest.mark.django_db
+def test_metrics_token(settings) -> None:
+    """_Unit test for validate the metrics endpoint asks for the METRICS_TOKEN when it is configured"""
+    settings.METRICS_TOKEN = "scrape-token"
+    client = APIClient()
+    assert client.get("/api/metrics").status_code == 403
+    assert client.get("/api/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("debug, status_code", [(False, 403), (True, 200)])
+def test_metrics_without_token(settings, debug, status_code) -> None:
+    """_Unit test for validate the metrics endpoint is refused without METRICS_TOKEN, unless DEBUG is on"""
+    settings.METRICS_TOKEN = ""
+    settings.DEBUG = debug
+    assert APIClient().get("/api/metrics").status_code == status_code
+
+
+@pytest.mark.django_db
+def test_metrics_model_rows_cached(create_farm, django_assert_num_queries) -> None:
+    """_Unit test for validate the row counts are read once and kept on the cache for the next scrapes"""
+    with django_assert_num_queries(4):
+        first = model_row_gauges()
+    with django_assert_num_queries(0):
+        assert model_row_gauges() == first
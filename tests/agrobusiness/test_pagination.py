@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from agrobusiness.models import Customer, FarmProperty
+from agrobusiness.pagination import CreatedAtCursorPagination
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.django_db
+def test_cursor_walks_every_farm(api_client, django_db_setup, create_token) -> None:
+    """_Unit test for validate the cursor pagination walks every farm once, on the (-created_at, -id) ordering"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    expected = [str(pk) for pk in FarmProperty.objects.order_by("-created_at", "-id").values_list("id", flat=True)]
+    received, pages = [], []
+    url = "/api/farm?page_size=3"
+    while url:
+        response = api_client.get(url, headers=headers, format="json")
+        assert response.status_code == 200
+        received += [item["id"] for item in response.data["results"]]
+        pages.append(response.data)
+        url = response.data["next"]
+    assert received == expected
+    assert pages[0]["previous"] is None
+    previous = api_client.get(pages[-1]["previous"], headers=headers, format="json")
+    assert previous.data["results"] == pages[-2]["results"]
+
+
+@pytest.mark.django_db
+def test_cursor_max_page_size(api_client, django_db_setup, create_token) -> None:
+    """_Unit test for validate the server enforces the max page size"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    Customer.objects.bulk_create(
+        [Customer(personal_document="61526731002", name=f"Customer {index}") for index in range(12)]
+    )
+    CreatedAtCursorPagination.max_page_size, max_page_size = 10, CreatedAtCursorPagination.max_page_size
+    try:
+        response = api_client.get("/api/customer", {"page_size": 1000}, headers=headers)
+    finally:
+        CreatedAtCursorPagination.max_page_size = max_page_size
+    assert len(response.data["results"]) == 10
+    assert response.data["next"] is not None
+
+
+@pytest.mark.django_db
+def test_cursor_constant_queries(api_client, django_db_setup, create_token, django_assert_num_queries) -> None:
+    """_Unit test for validate a deep page costs the same queries as the first one, which also loads the user of
+    the token"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    url = "/api/customer?page_size=1"
+    for page in range(3):
+        with django_assert_num_queries(2 if page else 3):
+            response = api_client.get(url, headers=headers, format="json")
+        url = response.data["next"]
+
+
+@pytest.mark.django_db
+def test_cursor_invalid(api_client, create_token) -> None:
+    """_Unit test for validate an invalid cursor is rejected"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/planting", {"cursor": "invalid"}, headers=headers)
+    assert response.status_code == 404
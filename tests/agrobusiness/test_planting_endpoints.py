@@ -75,3 +75,69 @@ def test_list_planting_type(api_client, django_db_setup, create_token) -> None:
     response = api_client.get(f"/api/planting", headers=headers, format="json")
     logger.info(f"Show data: {response.data}")
     assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_chart_cultivation_by_name_values(api_client, django_db_setup, create_token, django_assert_num_queries) -> None:
+    """_Unit test for validate endpoint for chart cultivation by name groups the counts in a single query"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    plantings = PlantingType.objects.all()
+    params = {"include": "farms,area"}
+    with django_assert_num_queries(3):
+        response = api_client.get("/api/planting/stats/chart/cultivation-by-name", params, headers=headers)
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    assert len(response.data) == len({item.plant_name for item in plantings})
+    assert sum(item["cultivation_total"] for item in response.data) == plantings.count()
+    assert sum(item["cultivation_percentage"] for item in response.data) == pytest.approx(1)
+    assert all("farms_total" in item and "farming_area_total" in item for item in response.data)
+
+
+@pytest.mark.django_db
+def test_chart_cultivation_by_name_filtered(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate endpoint for chart cultivation by name accepts the customer filter"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    params = {"customer": str(create_farm.customer.id), "include": "farms"}
+    response = api_client.get("/api/planting/stats/chart/cultivation-by-name", params, headers=headers)
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    assert response.data == [
+        {"plant_name": "milho", "cultivation_total": 2, "farms_total": 1, "cultivation_percentage": 1.0}
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page_size", [2, 20])
+def test_list_planting_constant_queries(
+    api_client, create_token, create_farm, page_size, django_assert_num_queries
+) -> None:
+    """_Unit test for validate the planting list runs the same number of queries for any page size"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    PlantingType.objects.bulk_create(
+        [PlantingType(plant_name=f"cultura {index}", farm=create_farm) for index in range(20)]
+    )
+    with django_assert_num_queries(3):
+        response = api_client.get(f"/api/planting?page_size={page_size}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.data["results"]) == page_size
+
+
+@pytest.mark.django_db
+def test_chart_cultivation_by_name_area_distinct_farms(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate endpoint for chart cultivation by name sums the farming area of each farm once, even
+    when the farm has duplicated cultivation rows"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    PlantingType.objects.create(plant_name="soja", farm=create_farm)
+    params = {"customer": str(create_farm.customer.id), "include": "farms,area"}
+    response = api_client.get("/api/planting/stats/chart/cultivation-by-name", params, headers=headers)
+    logger.info(f"Show data: {response.data}")
+    assert response.status_code == 200
+    by_name = {item["plant_name"]: item for item in response.data}
+    assert by_name["milho"]["cultivation_total"] == 2
+    assert by_name["milho"]["farms_total"] == 1
+    assert by_name["milho"]["farming_area_total"] == create_farm.farming_area
+    assert by_name["soja"]["farming_area_total"] == create_farm.farming_area
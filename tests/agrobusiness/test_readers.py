@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from agrobusiness.models import PlantingType
+from agrobusiness.readers import RowMapper
+from agrobusiness.serializers import CustomerSerializer, FarmPropertySerializer, PlantingTypeSerializer
+
+
+@pytest.mark.parametrize("serializer_class", [CustomerSerializer, FarmPropertySerializer, PlantingTypeSerializer])
+def test_row_mapper_serializers(serializer_class) -> None:
+    """_Unit test for validate every list serializer can be answered by a row mapper"""
+    assert RowMapper.for_serializer(serializer_class()) is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/customer?page_size=3",
+        "/api/farm?page_size=3",
+        "/api/farm?state=PB&fields=id,state,area",
+        "/api/planting?page_size=3",
+    ],
+)
+def test_fast_list_parity(api_client, django_db_setup, create_token, create_farm, settings, url) -> None:
+    """_Unit test for validate the fast list path renders the same bytes as the serializers, on the first and the
+    second page"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    pages = {}
+    for enabled in (False, True):
+        settings.FAST_READ_ENABLED = enabled
+        first = api_client.get(url, headers=headers)
+        assert first.status_code == 200
+        second = api_client.get(first.data["next"], headers=headers) if first.data["next"] else first
+        pages[enabled] = (first.content, second.content)
+    assert pages[True] == pages[False]
+
+
+@pytest.mark.django_db
+def test_benchmark_read_paths(tmp_path, create_farm) -> None:
+    """_Unit test for validate the benchmark compares the serializer and the fast list paths"""
+    output = tmp_path / "results.json"
+    call_command("benchmark_api", "--iterations", "2", "--read-paths", "--output", str(output))
+    read_paths = json.loads(output.read_text())["read_paths"]
+    assert set(read_paths) == {"customer-list", "farm-list", "planting-list"}
+    assert all(timings["speedup"] for timings in read_paths.values())
@@ -0,0 +1,81 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from agrobusiness import parsers, renderers
+from agrobusiness.parsers import FastJSONParser, NDJSONParser
+from agrobusiness.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    "id": uuid.UUID("5f0c8c5e-3c4a-4f6e-9a55-0f1a2b3c4d5e"),
+    "name": "Fazenda São João\u2028\u2029",
+    "area": Decimal("999.99"),
+    "area_total": Decimal("123456789.10"),
+    "created_at": datetime.datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    "updated_at": datetime.datetime(2024, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))),
+    "harvest": datetime.date(2024, 3, 1),
+    "label": gettext_lazy("Farm"),
+    "rows": [{"plant_name": "milho", "percentage": 12.5, "active": True, "notes": None}],
+}
+FLOATS = [2.5e-05, 1e-07, 1e16, -1.5e20, 0.0001, 0.0, [2.5e-05], {"share": 2.5e-05}, {"name": "taxa:1e5,"}]
+
+
+@pytest.mark.parametrize("backend", ["orjson", "fallback"])
+def test_renderer_parity(monkeypatch, backend) -> None:
+    """_Unit test for validate the renderer gives the same bytes as the DRF renderer, with and without orjson, the
+    floats with an exponent included. A NaN is rendered as null by orjson, where the DRF renderer raises"""
+    if backend == "fallback":
+        monkeypatch.setattr(renderers, "orjson", None)
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+    assert FastJSONRenderer().render({1: 2**70}) == JSONRenderer().render({1: 2**70})
+    for value in FLOATS:
+        assert FastJSONRenderer().render({"value": value}) == JSONRenderer().render({"value": value})
+    with pytest.raises(ValueError):
+        JSONRenderer().render({"value": float("nan")})
+    if backend == "fallback":
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render({"value": float("nan")})
+    else:
+        assert FastJSONRenderer().render({"value": float("nan")}) == b'{"value":null}'
+    indented = FastJSONRenderer().render(PAYLOAD, "application/json; indent=4")
+    assert indented == JSONRenderer().render(PAYLOAD, "application/json; indent=4")
+
+
+@pytest.mark.parametrize("backend", ["orjson", "fallback"])
+def test_parser(monkeypatch, backend) -> None:
+    """_Unit test for validate the parser decodes the same data as the DRF parser and rejects invalid bodies"""
+    if backend == "fallback":
+        monkeypatch.setattr(parsers, "orjson", None)
+    body = '{"name": "Fazenda São João", "area": 999.99, "customer": null}'.encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    for invalid in [b'{"area": NaN}', b"{"]:
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(invalid))
+    lines = io.BytesIO(b'{"name": "a"}\n\n{"name": "b"}\n')
+    assert NDJSONParser().parse(lines) == [{"name": "a"}, {"name": "b"}]
+
+
+@pytest.mark.django_db
+def test_decimal_areas_rendered_exactly(api_client, create_token, create_farm) -> None:
+    """_Unit test for validate the farm areas are rendered as exact decimal strings"""
+    create_farm.area = Decimal("999.99")
+    create_farm.save()
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get(f"/api/farm/{create_farm.id}", headers=headers)
+    assert response.status_code == 200
+    assert b'"area":"999.99"' in response.content
+    assert b'"farming_area":"1.00"' in response.content
+
+
+@pytest.mark.django_db
+def test_browsable_api_disabled(api_client, create_token) -> None:
+    """_Unit test for validate the browsable API is not negotiated when DEBUG is off"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}", "Accept": "text/html"}
+    assert api_client.get("/api/states", headers=headers).status_code == 406
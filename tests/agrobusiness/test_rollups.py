@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+
+from agrobusiness.aggregations import planting_type_stats, state_farm_stats
+from agrobusiness.models import FarmProperty, PlantingType, PlantingTypeStats, State, StateFarmStats
+from agrobusiness.rollups import planting_rollup_stats, state_rollup_stats, verify_rollups
+
+
+@pytest.mark.django_db
+def test_rollups_loaded_data(django_db_setup) -> None:
+    """_Unit test for validate the rollups match the raw tables after the fixtures are loaded"""
+    assert verify_rollups() == []
+    assert state_rollup_stats() == state_farm_stats()
+    assert planting_rollup_stats() == planting_type_stats()
+
+
+@pytest.mark.django_db
+def test_rollups_farm_changes(create_state, create_customer) -> None:
+    """_Unit test for validate the state rollups follow a farm create, update, state move and delete"""
+    before = StateFarmStats.objects.filter(state=create_state).first() or StateFarmStats(state=create_state)
+    farm = FarmProperty.objects.create(
+        name="Fazenda Rollup",
+        customer=create_customer,
+        state=create_state,
+        city="Patos",
+        area=Decimal(10),
+        farming_area=Decimal(1),
+        plant_area=Decimal(2),
+    )
+    farm_stats = StateFarmStats.objects.get(state=create_state)
+    assert farm_stats.farms_total == before.farms_total + 1
+    assert farm_stats.area_total == before.area_total + Decimal(10)
+    farm.area = Decimal(20)
+    farm.save()
+    assert StateFarmStats.objects.get(state=create_state).area_total == before.area_total + Decimal(20)
+    new_state = State.objects.create(acronym="XX", name="Estado Teste")
+    farm.state = new_state
+    farm.save()
+    assert StateFarmStats.objects.get(state=create_state).farms_total == before.farms_total
+    assert StateFarmStats.objects.get(state=new_state).farms_total == 1
+    assert verify_rollups() == []
+    farm.delete()
+    assert StateFarmStats.objects.get(state=new_state).farms_total == 0
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_rollups_planting_changes(create_farm) -> None:
+    """_Unit test for validate the plant name rollups follow a cultivation create, rename and delete"""
+    planting = PlantingType.objects.create(plant_name="sorgo teste", farm=create_farm)
+    assert PlantingTypeStats.objects.get(plant_name="sorgo teste").cultivation_total == 1
+    planting.plant_name = "trigo teste"
+    planting.save()
+    assert PlantingTypeStats.objects.get(plant_name="sorgo teste").cultivation_total == 0
+    assert PlantingTypeStats.objects.get(plant_name="trigo teste").cultivation_total == 1
+    create_farm.delete()
+    assert PlantingTypeStats.objects.get(plant_name="trigo teste").cultivation_total == 0
+    assert verify_rollups() == []
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_command(create_farm) -> None:
+    """_Unit test for validate the command finds divergent rollups and rebuilds them"""
+    expected = FarmProperty.objects.filter(state=create_farm.state).count()
+    StateFarmStats.objects.filter(state=create_farm.state).update(farms_total=expected + 5)
+    with pytest.raises(CommandError):
+        call_command("rebuild_rollups", "--verify-only")
+    call_command("rebuild_rollups")
+    assert StateFarmStats.objects.get(state=create_farm.state).farms_total == expected
+    call_command("rebuild_rollups", "--verify-only")
+
+
+@pytest.mark.django_db
+def test_rollups_save_atomic(create_farm, monkeypatch) -> None:
+    """_Unit test for validate a farm update is rolled back when its rollups can not be moved"""
+    area = create_farm.area
+
+    def fail_delta(*args) -> None:
+        raise RuntimeError("rollup failed")
+
+    monkeypatch.setattr("agrobusiness.signals.apply_farm_delta", fail_delta)
+    create_farm.area = area + Decimal(5)
+    with pytest.raises(RuntimeError):
+        create_farm.save()
+    assert FarmProperty.objects.get(id=create_farm.id).area == area
+    farm_stats = StateFarmStats.objects.get(state=create_farm.state)
+    assert (
+        farm_stats.area_total
+        == FarmProperty.objects.filter(state=create_farm.state).aggregate(total=Sum("area"))["total"]
+    )
@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+import pytest
+
+from agrobusiness.models import Customer, FarmProperty
+from agrobusiness.search import CUSTOMER_SEARCH_FIELDS, FARM_SEARCH_FIELDS, search_queryset
+
+
+@pytest.fixture(scope="function")
+def search_farm(create_state) -> FarmProperty:
+    """Fixture to provide a farm whose customer and city have accents
+    Returns:
+        FarmProperty: Return the farm
+    """
+    customer = Customer.objects.create(personal_document="61526731002", name="José Ceará")
+    return FarmProperty.objects.create(
+        name="Sítio Boa Esperança",
+        customer=customer,
+        state=create_state,
+        city="São João",
+        area=Decimal(10),
+        farming_area=Decimal(1),
+        plant_area=Decimal(2),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "search, found",
+    [
+        ("ceara", True),
+        ("CEARÁ", True),
+        ("jose ceara", True),
+        ('"jose ceara"', True),
+        ("267310", True),
+        ("jose maria", False),
+        ("", True),
+    ],
+)
+def test_search_customers(search_farm, search, found) -> None:
+    """_Unit test for validate the search ignores case and accents, and every term must match a field"""
+    customers = search_queryset(Customer.objects.all(), CUSTOMER_SEARCH_FIELDS, search)
+    assert customers.filter(pk=search_farm.customer_id).exists() == found
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "search, found", [("esperanca", True), ("sao joao", True), ("ceara sitio", True), ("x", False)]
+)
+def test_search_farms(search_farm, search, found) -> None:
+    """_Unit test for validate the farm search matches its name, city and customer name"""
+    farms = search_queryset(FarmProperty.objects.all(), FARM_SEARCH_FIELDS, search)
+    assert farms.filter(pk=search_farm.pk).exists() == found
+
+
+@pytest.mark.django_db
+def test_search_endpoints(api_client, create_token, search_farm) -> None:
+    """_Unit test for validate the lists accept the search param, along with the other filters"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/customer", {"search": "Ceara"}, headers=headers)
+    assert [row["id"] for row in response.data["results"]] == [str(search_farm.customer_id)]
+    response = api_client.get("/api/farm", {"search": "ceará", "state": "pb"}, headers=headers)
+    assert [row["id"] for row in response.data["results"]] == [str(search_farm.pk)]
+    response = api_client.get("/api/farm", {"search": "ceará", "state": "sp"}, headers=headers)
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_search_admin(admin_client, search_farm) -> None:
+    """_Unit test for validate the admin search uses the same accent-insensitive match"""
+    response = admin_client.get("/admin/agrobusiness/farmproperty/", {"q": "jose ceara"})
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == [search_farm]
+    response = admin_client.get("/admin/agrobusiness/customer/", {"q": "maria"})
+    assert list(response.context["cl"].result_list) == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/farm/stats/total-areas",
+        "/api/farm/stats/chart/agricultural-land",
+        "/api/async/farm/stats/total-areas",
+        "/api/async/farm/stats/chart/agricultural-land",
+    ],
+)
+def test_search_stats_customer_rename(
+    api_client, create_token, search_farm, url, django_capture_on_commit_callbacks
+) -> None:
+    """_Unit test for validate the farm stats searched by customer name follow a customer rename"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get(url, {"search": "ceara"}, headers=headers)
+    customer = search_farm.customer
+    customer.name = "Maria Silva"
+    with django_capture_on_commit_callbacks(execute=True):
+        customer.save()
+    second = api_client.get(url, {"search": "ceara"}, headers=headers)
+    assert second["X-Cache"] == "MISS"
+    assert second.content != first.content
+    if "ETag" in first:
+        renamed = api_client.get(url, {"search": "ceara"}, headers={**headers, "If-None-Match": first["ETag"]})
+        assert renamed.status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_dashboard_customer_rename(
+    api_client, create_token, search_farm, settings, django_capture_on_commit_callbacks
+) -> None:
+    """_Unit test for validate the dashboard panels searched by customer name follow a customer rename"""
+    settings.DASHBOARD_WORKERS = 1
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    first = api_client.get("/api/dashboard", {"search": "ceara"}, headers=headers).json()
+    search_farm.customer.name = "Maria Silva"
+    with django_capture_on_commit_callbacks(execute=True):
+        search_farm.customer.save()
+    second = api_client.get("/api/dashboard", {"search": "ceara"}, headers=headers).json()
+    for name in ("total_areas", "agricultural_land"):
+        assert second["timings"][name]["cache"] == "MISS"
+        assert second["panels"][name] != first["panels"][name]
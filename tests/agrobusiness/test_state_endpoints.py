@@ -2,7 +2,7 @@ import logging
 
 import pytest
 
-from agrobusiness.models import State
+from agrobusiness.models import FarmProperty, State
 
 logger = logging.getLogger(__name__)
 
@@ -23,3 +23,26 @@ def test_list_state(api_client, django_db_setup, create_token) -> None:
     response = api_client.get(f"/api/states", headers=headers, format="json")
     logger.info(f"Show data: {response.data}")
     assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_chart_farm_by_state_queries(api_client, django_db_setup, create_token, django_assert_num_queries) -> None:
+    """_Unit test for validate endpoint for chart farm by state runs a single grouped query, besides the auth user
+    and the validators"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    with django_assert_num_queries(3):
+        response = api_client.get("/api/states/stats/chart/state-farms", headers=headers, format="json")
+    assert response.status_code == 200
+    assert len(response.data) == State.objects.count()
+
+
+@pytest.mark.django_db
+def test_chart_farm_by_state_totals(api_client, django_db_setup, create_token) -> None:
+    """_Unit test for validate endpoint for chart farm by state returns the counts and area totals by state"""
+    headers = {"Authorization": f"Bearer {str(create_token.access_token)}"}
+    response = api_client.get("/api/states/stats/chart/state-farms", headers=headers, format="json")
+    logger.info(f"Show data: {response.data}")
+    farms = FarmProperty.objects.all()
+    assert sum(item["farms_total"] for item in response.data) == farms.count()
+    assert sum(item["area_total"] for item in response.data) == sum(farm.area for farm in farms)
+    assert sum(item["farm_percentage"] for item in response.data) == pytest.approx(1)
@@ -0,0 +1,163 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from agrobusiness.bulk import write_farms
+from agrobusiness.models import Customer, FarmProperty, PlantingType, Tombstone
+from agrobusiness.sync import decode_cursor, encode_cursor
+
+
+@pytest.fixture(scope="function")
+def sync_headers(create_token, settings) -> dict:
+    """Fixture to provide the auth headers of the sync requests, without holding back the latest changes
+    Returns:
+        dict: Return the request headers
+    """
+    settings.SYNC_SETTLE_SECONDS = 0
+    yield {"Authorization": f"Bearer {str(create_token.access_token)}"}
+
+
+def sync_all(api_client, headers: dict, since: str = "", page_size: int = 500) -> tuple:
+    """Helper to follow the sync pages until the last one
+    Returns:
+        tuple: Return every change and the cursor of the next sync
+    """
+    response = api_client.get("/api/sync", {"since": since, "page_size": page_size}, headers=headers)
+    changes = response.data["results"]
+    while response.data["next"]:
+        response = api_client.get(response.data["next"], headers=headers)
+        changes += response.data["results"]
+    return changes, response.data["cursor"]
+
+
+@pytest.mark.django_db
+def test_sync_changes(api_client, sync_headers, create_farm) -> None:
+    """_Unit test for validate the sync returns every row first, and then only the updated and deleted ones"""
+    changes, cursor = sync_all(api_client, sync_headers)
+    upserts = {(change["model"], change["id"]) for change in changes if change["op"] == "upsert"}
+    assert len(upserts) == Customer.objects.count() + FarmProperty.objects.count() + PlantingType.objects.count()
+    farm = next(change for change in changes if change["id"] == str(create_farm.id))
+    assert farm["data"] == json.loads(api_client.get(f"/api/farm/{create_farm.id}", headers=sync_headers).content)
+    changes, next_cursor = sync_all(api_client, sync_headers, cursor)
+    assert not changes
+    assert decode_cursor(next_cursor)[0] == decode_cursor(cursor)[0]
+
+    create_farm.name = "Fazenda Nova"
+    create_farm.save()
+    planting = PlantingType.objects.create(plant_name="milho", farm=create_farm)
+    changes, cursor = sync_all(api_client, sync_headers, cursor)
+    assert [(change["model"], change["id"]) for change in changes] == [
+        ("farm", str(create_farm.id)),
+        ("planting", str(planting.id)),
+    ]
+    assert changes[0]["data"]["name"] == "Fazenda Nova"
+
+    create_farm.customer.delete()
+    changes, _ = sync_all(api_client, sync_headers, cursor)
+    assert {(change["model"], change["op"], change["id"]) for change in changes} == {
+        ("customer", "delete", str(create_farm.customer_id)),
+        ("farm", "delete", str(create_farm.id)),
+        ("planting", "delete", str(planting.id)),
+    }
+
+
+@pytest.mark.django_db
+def test_sync_pages_and_stream(api_client, sync_headers, create_farm, django_assert_num_queries) -> None:
+    """_Unit test for validate the small pages, the stream and one page return the same changes, reading each
+    table once per page"""
+    for index in range(5):
+        PlantingType.objects.create(plant_name=f"cultura {index}", farm=create_farm)
+    PlantingType.objects.filter(plant_name="cultura 0").delete()
+    pages, cursor = sync_all(api_client, sync_headers, page_size=2)
+    changes, page_cursor = sync_all(api_client, sync_headers)
+    assert changes == pages
+    assert decode_cursor(page_cursor)[0] == decode_cursor(cursor)[0]
+    response = api_client.get("/api/sync/stream", headers=sync_headers)
+    lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    final = lines.pop()
+    assert list(final) == ["cursor"]
+    assert decode_cursor(final["cursor"])[0] == decode_cursor([line.pop("cursor") for line in lines][-1])[0]
+    assert decode_cursor(final["cursor"])[0] == decode_cursor(cursor)[0]
+    assert lines == pages
+    with django_assert_num_queries(4):
+        api_client.get("/api/sync", {"since": cursor, "page_size": 2}, headers=sync_headers)
+
+
+def read_stream(api_client, headers: dict, since: str = "") -> list:
+    """Helper to read every line of the sync stream
+    Returns:
+        list: Return the decoded lines
+    """
+    response = api_client.get("/api/sync/stream", {"since": since}, headers=headers)
+    return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+
+@pytest.mark.django_db
+def test_sync_stream_advances_cursor(api_client, sync_headers, create_farm, settings) -> None:
+    """_Unit test for validate a resumed stream ends with a cursor checked up to now, even without changes, so a
+    daily stream sync never expires"""
+    cursor = read_stream(api_client, sync_headers)[-1]["cursor"]
+    position, checked_at = decode_cursor(cursor)
+    old_checked_at = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS - 1)
+    lines = read_stream(api_client, sync_headers, encode_cursor(position, old_checked_at))
+    assert len(lines) == 1
+    next_position, next_checked_at = decode_cursor(lines[0]["cursor"])
+    assert next_position == position
+    assert next_checked_at >= checked_at > old_checked_at
+    create_farm.save()
+    lines = read_stream(api_client, sync_headers, encode_cursor(position, old_checked_at))
+    assert [line["id"] for line in lines[:-1]] == [str(create_farm.id)]
+    assert decode_cursor(lines[0]["cursor"])[1] == old_checked_at
+    assert decode_cursor(lines[-1]["cursor"])[1] >= checked_at
+
+
+@pytest.mark.django_db
+def test_sync_settle_window(api_client, sync_headers, create_farm, settings) -> None:
+    """_Unit test for validate the changes of the settle window are held back until a later sync"""
+    _, cursor = sync_all(api_client, sync_headers)
+    create_farm.save()
+    settings.SYNC_SETTLE_SECONDS = 60
+    assert sync_all(api_client, sync_headers, cursor)[0] == []
+
+
+@pytest.mark.django_db
+def test_sync_bulk_stamped_at_commit(create_customer, create_state) -> None:
+    """_Unit test for validate a bulk write stamps every row with one updated_at taken after its last batch, so the
+    rows of a long import are not left behind the settle window when they commit"""
+    farms = [
+        FarmProperty(
+            name=f"Fazenda Lote {index}",
+            city="Sousa",
+            state=create_state,
+            customer=create_customer,
+            area=10,
+            farming_area=1,
+            plant_area=1,
+        )
+        for index in range(3)
+    ]
+    write_farms(farms, batch_size=1)
+    rows = FarmProperty.objects.filter(name__startswith="Fazenda Lote").values("created_at", "updated_at")
+    assert len({row["updated_at"] for row in rows}) == 1
+    assert all(row["updated_at"] >= max(item["created_at"] for item in rows) for row in rows)
+
+
+@pytest.mark.django_db
+def test_sync_invalid_cursor(api_client, sync_headers, settings) -> None:
+    """_Unit test for validate an invalid cursor answers 404 and an expired one answers 410"""
+    assert api_client.get("/api/sync", {"since": "invalid"}, headers=sync_headers).status_code == 404
+    checked_at = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS + 1)
+    expired = encode_cursor((checked_at, 0, "id"), checked_at)
+    assert api_client.get("/api/sync", {"since": expired}, headers=sync_headers).status_code == 410
+
+
+@pytest.mark.django_db
+def test_prune_tombstones(create_farm, settings) -> None:
+    """_Unit test for validate the tombstones older than the retention are deleted"""
+    create_farm.delete()
+    Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS + 1))
+    call_command("prune_tombstones")
+    assert not Tombstone.objects.exists()